@@ -0,0 +1,74 @@
+# path: benchmarks/bench_archive.py
+"""
+Geçmiş analizi: depo taraması ile sütunlu arşivin karşılaştırılması.
+
+    python -m benchmarks.bench_archive --sizes 10000 50000 --format parquet arrow
+
+Her boyut için geçici bir depo doldurulur ve arşive yazılır. Aynı soru
+(bir yılda makine / duruş türü başına toplam duruş) iki yoldan
+yanıtlanır: depodan `iter_studies` ile her kaydın JSON'unu çözerek ve
+arşivden `stop_totals` ile yalnız üç sütunu, yalnız o ayların klasörlerini
+okuyarak. Diskteki boyutlar da raporlanır.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.synthetic import make_store_data
+from modules.archive import export_archive, stop_totals
+from modules.data_manager import etud_info_from_record
+from modules.storage import db_path, iter_studies, save_data
+
+_START, _END = "2024-01-01", "2024-12-31"
+
+
+def _dir_size(root):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+
+
+def _store_totals(store):
+    totals = defaultdict(float)
+    for _key, record in iter_studies(store, start_date=_START, end_date=_END):
+        etud_info, stops = etud_info_from_record(record)
+        for s in stops:
+            totals[etud_info[1], s["Duruş Türü"]] += float(s["Süre (sn)"] or 0)
+    return totals
+
+
+def bench(n, formats):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "veri_kaydi.db")
+        save_data(make_store_data(n), store)
+        store_mib = os.path.getsize(db_path(store)) / 2**20
+
+        t0 = time.perf_counter()
+        expected = _store_totals(store)
+        store_sec = time.perf_counter() - t0
+        print(f"etüt={n:>7}  depo       {store_mib:7.1f} MiB  sorgu={store_sec * 1000:8.1f} ms")
+
+        for fmt in formats:
+            out = os.path.join(tmp, f"arsiv_{fmt}")
+            stats = export_archive(out, store, fmt)
+            t0 = time.perf_counter()
+            df = stop_totals(out, start_date=_START, end_date=_END)
+            sec = time.perf_counter() - t0
+            got = {(m, t): v for m, t, v in zip(df["makine"], df["Duruş Türü"], df["Toplam Süre (sn)"])}
+            same = got.keys() == expected.keys() and all(abs(got[k] - expected[k]) < 1e-6 for k in got)
+            print(f"{'':13}arşiv/{fmt:<7}{_dir_size(out) / 2**20:7.1f} MiB  sorgu={sec * 1000:8.1f} ms  "
+                  f"yazım={stats['seconds']:6.2f} s  aynı sonuç={same}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--format", nargs="+", default=["parquet", "arrow"], choices=["parquet", "arrow"])
+    args = parser.parse_args(argv)
+    for n in args.sizes:
+        bench(n, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# path: benchmarks/bench_autosave.py
+"""
+Otomatik kayıt: sık düzenlemede yazma büyütmesi.
+
+    python -m benchmarks.bench_autosave --edits 2000 --stops 500 --delay 3 --edit-gap 0.5
+
+Mevcut `--stops` duruşlu bir etüt üzerinde `--edits` düzenleme (duruş
+ekleme / silme / başlık alanı) `--edit-gap` saniye arayla simüle edilir
+(saat sanaldır, beklenmez). Her düzenlemeden sonra çalışmadaki gibi
+`observe` + vakti geldiyse `flush` çağrılır. Depoya yazılan satır / bayt,
+her düzenlemede tam durumu yazmayla karşılaştırılır (SQLite sayfa / WAL
+ek yükü dahil değil); sonunda taslağın geri yüklenen hali oturumla
+karşılaştırılır.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from contextlib import closing
+
+from benchmarks.synthetic import make_error_data
+from modules.autosave import HEADER_FIELDS, Autosaver
+from modules.stop_log import StopLog
+from modules.storage import _connect, _dumps
+
+
+def _last_row_bytes(store, draft):
+    with closing(_connect(store)) as conn:
+        return conn.execute(
+            "SELECT LENGTH(CAST(payload AS BLOB)) FROM draft_ops WHERE taslak = ? ORDER BY seq DESC LIMIT 1", (draft,)
+        ).fetchone()[0]
+
+
+def bench(n_edits, n_stops, delay, edit_gap, seed=0):
+    rnd = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "veri_kaydi.db")
+        log = StopLog.from_records(make_error_data(n_stops, seed))
+        header = {k: None for k in HEADER_FIELDS}
+        saver = Autosaver(delay=delay)
+        now = 1_000.0
+        saver.observe(header, log, now)
+        full_bytes = written = 0
+        started = time.perf_counter()
+        for i in range(n_edits):
+            now += edit_gap
+            roll = rnd.random()
+            if roll < 0.6:
+                log.append(make_error_data(1, seed + i)[0])
+            elif roll < 0.8 and len(log):
+                log.delete(rnd.choice(log.ids()))
+            else:
+                header = dict(header, etud_final=i)
+            full_bytes += len(_dumps({"header": header, "add": list(log.items())}).encode("utf-8"))
+            saver.observe(header, log, now)
+            if saver.due(now) and saver.flush(header, log, store):
+                written += _last_row_bytes(store, saver.draft)
+        if saver.flush(header, log, store):
+            written += _last_row_bytes(store, saver.draft)
+        sec = time.perf_counter() - started
+
+        with closing(_connect(store)) as conn:
+            (rows,) = conn.execute("SELECT COUNT(*) FROM draft_ops WHERE taslak = ?", (saver.draft,)).fetchone()
+        restored, hdr, rlog = Autosaver.restore(saver.draft, store)
+        ok = rlog.to_records() == log.to_records() and rlog.ids() == log.ids() and hdr["etud_final"] == header["etud_final"]
+
+    print(f"düzenleme={n_edits}  yazım={saver.writes} ({saver.writes / n_edits:.1%})  "
+          f"kalan satır={rows}  yazılan={written / 1024:.0f} KiB  "
+          f"her düzenlemede tam durum={full_bytes / 1024:.0f} KiB  süre={sec:.2f} s  geri yükleme tutarlı={ok}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edits", type=int, default=2_000)
+    parser.add_argument("--stops", type=int, default=500, help="başlangıçtaki duruş sayısı")
+    parser.add_argument("--delay", type=float, default=3.0, help="debounce süresi (sn)")
+    parser.add_argument("--edit-gap", type=float, default=0.5, help="düzenlemeler arası sanal süre (sn)")
+    args = parser.parse_args(argv)
+    bench(args.edits, args.stops, args.delay, args.edit_gap)
+
+
+if __name__ == "__main__":
+    main()
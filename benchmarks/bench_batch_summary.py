@@ -0,0 +1,70 @@
+# path: benchmarks/bench_batch_summary.py
+"""
+calculate_summary (tek tek) ile calculate_summaries (toplu) karşılaştırması.
+
+    python -m benchmarks.bench_batch_summary --sizes 10000 100000
+
+Tekli döngü çok yavaş olduğu için her boyutta en fazla --loop-limit etüt
+tek tek hesaplanır, etüt başı süre ölçülüp tüm boyuta ölçeklenir. Aynı
+örneklem üzerinde iki yolun sonuçlarının birebir eşit olduğu da kontrol edilir.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_sessions
+from modules.batch_summary import calculate_summaries, to_batch_frames
+from modules.summary import calculate_summary
+
+KPI_COLUMNS = [
+    "Etüt Süresi (dk)", "Toplam Planlı Süre (sn)", "Toplam Plansız Süre (sn)",
+    "Toplam Duruş Süresi (sn)", "Kapasite Kullanımı (%)", "Gerçekleşen Üretim (adet)",
+    "Planlanan Üretim (adet)", "Gerçekleşme Oranı (%)",
+]
+
+
+def run_single(sessions):
+    rows = []
+    for etud_info, stops in sessions:
+        start, end, initial, final, unit, brk = (etud_info[4], etud_info[5], etud_info[6],
+                                                  etud_info[7], etud_info[8], etud_info[9])
+        df = calculate_summary(stops, start, end, max(0, final - initial), unit, brk)
+        rows.append(df.iloc[0][KPI_COLUMNS].to_numpy(dtype=float))
+    return np.vstack(rows)
+
+
+def bench(n, loop_limit):
+    sessions = make_sessions(n)
+    # geçerli etütler (süre > 0) üretildiği için tekli yol st.stop'a düşmez
+    t0 = time.perf_counter()
+    studies, stops = to_batch_frames(sessions)
+    batch = calculate_summaries(studies, stops)
+    t_batch = time.perf_counter() - t0
+
+    sample = sessions[:loop_limit]
+    t0 = time.perf_counter()
+    single = run_single(sample)
+    t_single_sample = time.perf_counter() - t0
+    t_single = t_single_sample / len(sample) * n
+
+    expected = batch[KPI_COLUMNS].to_numpy(dtype=float)[:len(sample)]
+    mismatches = int((expected != single).any(axis=1).sum())
+
+    print(f"n={n:>7}  toplu: {t_batch:8.3f} s   tekli (tahmini): {t_single:9.2f} s   "
+          f"hızlanma: {t_single / t_batch:7.1f}x   örneklem={len(sample)} uyuşmayan={mismatches}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--loop-limit", type=int, default=2_000)
+    args = parser.parse_args(argv)
+    bad = sum(bench(n, min(n, args.loop_limit)) for n in args.sizes)
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
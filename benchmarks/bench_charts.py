@@ -0,0 +1,75 @@
+# path: benchmarks/bench_charts.py
+"""
+Özet grafikleri: çok sayıda rerun boyunca süre ve sunucu belleği.
+
+    python -m benchmarks.bench_charts --reruns 600 --sessions 40 --stops 300
+
+`--sessions` farklı duruş listesi sırayla yeniden çizilir (her rerun bir
+oturumun sayfa yenilemesi). Eski yol her çalışmada üç ayrı gruplama yapıp
+pyplot figürü açar ve kapatmaz; yeni yol `modules.charts` (tek gruplama,
+pyplot'suz figür, LRU'lu PNG) kullanır. Rerun başına süre ve çalışma
+boyunca tracemalloc'un gördüğü canlı bellek (çeyrek noktalarında)
+raporlanır; yeni yolda bellek sabit kalmalıdır.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from io import BytesIO
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from benchmarks.synthetic import make_error_data
+from modules.charts import chart_series, pie_from_series, pie_png
+from modules.stop_log import StopLog
+
+
+def _old_render(log):
+    import matplotlib.pyplot as plt
+    df = log.to_frame()
+    pie = df.groupby("Duruş Türü", observed=True)["Süre (sn)"].sum()
+    for kind in ("Planlı", "Plansız"):
+        (df[df["Duruş Türü"] == kind].groupby("Açıklama", observed=True)["Süre (sn)"].sum() / 60).round(2)
+    fig, ax = plt.subplots()
+    ax.pie(pie, labels=pie.index, autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+    fig.savefig(BytesIO(), format="png", bbox_inches="tight")
+
+
+def _new_render(log):
+    pie, _planned, _unplanned = chart_series(log.to_frame())
+    pie_from_series(pie)
+
+
+def run(name, render, logs, reruns):
+    render(logs[0])   # içe aktarmalar / yazı tipi önbelleği ölçüme girmesin
+    tracemalloc.start()
+    marks = []
+    started = time.perf_counter()
+    for i in range(reruns):
+        render(logs[i % len(logs)])
+        if (i + 1) % max(reruns // 4, 1) == 0:
+            marks.append(tracemalloc.get_traced_memory()[0])
+    sec = time.perf_counter() - started
+    tracemalloc.stop()
+    curve = " ".join(f"{m / 2**20:6.1f}" for m in marks)
+    print(f"{name:<5} rerun={reruns}  {sec / reruns * 1000:7.2f} ms/rerun  canlı bellek (MiB, çeyrekler)={curve}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=600)
+    parser.add_argument("--sessions", type=int, default=40, help="farklı duruş listesi sayısı")
+    parser.add_argument("--stops", type=int, default=300, help="oturum başına duruş")
+    args = parser.parse_args(argv)
+    logs = [StopLog.from_records(make_error_data(args.stops, seed)) for seed in range(args.sessions)]
+    run("yeni", _new_render, logs, args.reruns)
+    print(f"      PNG önbelleği: {pie_png.cache_info()}")
+    run("eski", _old_render, logs, args.reruns)
+    import matplotlib.pyplot as plt
+    print(f"      eski yolun açık bıraktığı pyplot figürü: {len(plt.get_fignums())}")
+
+
+if __name__ == "__main__":
+    main()
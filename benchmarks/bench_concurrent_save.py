@@ -0,0 +1,81 @@
+# path: benchmarks/bench_concurrent_save.py
+"""
+Eşzamanlı oturumların etüt kaydı: ad alanları ve iyimser sürüm kontrolü.
+
+    python -m benchmarks.bench_concurrent_save --sessions 32 --saves 50
+
+Her iş parçacığı bir operatör oturumudur ve kendi ad alanına `--saves` kez
+etüt kaydeder (okunan sürümle, `expected_version`). Ayrıca tüm oturumlar
+ortak bir sayaç kaydını oku-artır-yaz döngüsüyle günceller; çakışmada
+yeniden okuyup dener. Sonunda kayıp güncelleme olmadığı doğrulanır.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import OPERATORS, make_sessions
+from modules.data_manager import study_record
+from modules.storage import ConcurrentUpdateError, read_study, save_study, study_key
+
+
+def bench(n_sessions, n_saves):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "veri_kaydi.db")
+        save_study("sayac", {"n": 0}, store)
+        conflicts = [0] * n_sessions
+        counts = [0] * n_sessions
+        latencies = [[] for _ in range(n_sessions)]
+
+        def increment(k):
+            while True:
+                counter, version = read_study("sayac", store)
+                try:
+                    save_study("sayac", {"n": counter["n"] + 1}, store, expected_version=version)
+                    counts[k] += 1
+                    return
+                except ConcurrentUpdateError:
+                    conflicts[k] += 1
+
+        def session(k):
+            rnd = random.Random(k)
+            namespace = f"{OPERATORS[k % len(OPERATORS)].casefold()}-{k}"
+            for etud_info, stops in make_sessions(n_saves, seed=k):
+                record = study_record(etud_info, stops)
+                key = study_key(record["tarih"], record["makine"])
+                t0 = time.perf_counter()
+                _, version = read_study(key, store, namespace)
+                save_study(key, record, store, namespace, expected_version=version)
+                latencies[k].append(time.perf_counter() - t0)
+                if rnd.random() < 0.5:
+                    increment(k)
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=session, args=(k,)) for k in range(n_sessions)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        total_sec = time.perf_counter() - started
+        counter, _ = read_study("sayac", store)
+
+    lat = sorted(x for per in latencies for x in per)
+    n = len(lat)
+    print(f"oturum={n_sessions:>3}  kayıt={n:>6}  {n / total_sec:8.0f} kayıt/sn  "
+          f"p50={lat[n // 2] * 1000:6.2f} ms  p99={lat[int(n * 0.99)] * 1000:6.2f} ms  "
+          f"sayaç çakışması={sum(conflicts)}  kayıp güncelleme yok={counter['n'] == sum(counts)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--saves", type=int, default=50, help="oturum başına etüt kaydı")
+    args = parser.parse_args(argv)
+    bench(args.sessions, args.saves)
+
+
+if __name__ == "__main__":
+    main()
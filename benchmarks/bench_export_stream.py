@@ -0,0 +1,52 @@
+# path: benchmarks/bench_export_stream.py
+"""
+Depodan akış halinde çok etütlü Excel export ölçümü.
+
+    python -m benchmarks.bench_export_stream --sizes 1000 10000 50000
+
+Her boyut için geçici bir depo doldurulur, `export_studies_to_excel` ile
+yazılır; satır/sn ve tracemalloc tepe belleği raporlanır. Tepe bellek
+boyuttan bağımsız (düz) kalmalıdır.
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import make_sessions
+from modules.data_manager import export_studies_to_excel, study_record
+from modules.storage import save_data, study_key
+
+
+def bench(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "veri_kaydi.db")
+        data = {}
+        for i, (etud_info, stops) in enumerate(make_sessions(n)):
+            data[study_key(etud_info[2], f"{etud_info[1]}#{i}")] = study_record(etud_info, stops)
+        save_data(data, store)
+        del data
+
+        out = os.path.join(tmp, "rapor.xlsx")
+        stats = export_studies_to_excel(out, store)
+
+        tracemalloc.start()
+        export_studies_to_excel(out, store)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"etüt={n:>7}  satır={stats['rows']:>8}  süre={stats['seconds']:7.2f} s  "
+          f"{stats['rows_per_sec']:>9.0f} satır/sn  tepe bellek={peak / 2**20:6.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args(argv)
+    for n in args.sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
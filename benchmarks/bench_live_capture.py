@@ -0,0 +1,76 @@
+# path: benchmarks/bench_live_capture.py
+"""
+Canlı kayıt olay günlüğü: yoğun hatta art arda olay ölçümü.
+
+    python -m benchmarks.bench_live_capture --events 100000 --threads 4
+
+Birkaç iş parçacığı aynı `EventLog`'a başla/bitir olayları yazarken bir
+arka plan iş parçacığı tamponu partiler halinde depoya boşaltır. Sonunda
+depodaki olay sayısı ve sıra numaralarının kesintisiz/sıralı olduğu
+doğrulanır; olay/sn ve olay başına gecikme raporlanır.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from modules.live_capture import START, STOP, EventLog
+from modules.storage import load_events
+
+
+def bench(n_events, n_threads, batch_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "veri_kaydi.db")
+        log = EventLog(batch_size=batch_size, max_age=0.05)
+        done = threading.Event()
+
+        def flusher():
+            while not done.is_set():
+                if log.due():
+                    log.flush(store)
+                else:
+                    time.sleep(0.005)
+            log.flush(store)
+
+        def producer(k):
+            tur = "Planlı" if k % 2 else "Plansız"
+            for i in range(n_events // n_threads):
+                log.record(START if i % 2 == 0 else STOP, tur, f"iş parçacığı {k}")
+
+        bg = threading.Thread(target=flusher)
+        bg.start()
+        started = time.perf_counter()
+        workers = [threading.Thread(target=producer, args=(k,)) for k in range(n_threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        record_sec = time.perf_counter() - started
+        done.set()
+        bg.join()
+        total_sec = time.perf_counter() - started
+
+        events = load_events(log.session, store)
+        seqs = [e[0] for e in events]
+        ts = [e[1] for e in events]
+        ok = seqs == list(range(1, len(seqs) + 1)) and all(a <= b for a, b in zip(ts, ts[1:]))
+
+    n = len(events)
+    print(f"olay={n:>8}  iş parçacığı={n_threads}  kayıt: {n / record_sec:>10.0f} olay/sn "
+          f"({record_sec / max(n, 1) * 1e6:.2f} µs/olay)  depoya dahil: {total_sec:6.2f} s  "
+          f"sıra/adet tutarlı={ok}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    bench(args.events, args.threads, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# path: benchmarks/bench_live_oee.py
+"""
+Canlı OEE: olay başına artımlı güncelleme ile her olayda baştan özet.
+
+    python -m benchmarks.bench_live_oee --stops 1000
+
+Tek günlük bir etüt penceresinde türü başına çakışmasız, türler arası
+çakışan saatli duruşlar (Planlı / Plansız / Mola) üretilir. Her olaydan
+sonra panonun göreceği değer iki yoldan hesaplanır: `LineState` ile
+(olay + anlık değer, O(1)) ve o ana kadar kapanmış duruşlardan
+`compute_summary` ile (O(n)). Son durumda iki özetin aynı olduğu
+kontrol edilir.
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from modules.live_oee import START, STOP, LineState
+from modules.summary_core import compute_summary
+
+KINDS = ("Planlı", "Plansız", "Mola")
+
+
+def make_stops(n, start, end, seed=0):
+    """[(tür, başlangıç, bitiş)]; aynı türün duruşları çakışmaz."""
+    rng = random.Random(seed)
+    length = (end - start).total_seconds()
+    per_kind = max(n // len(KINDS), 1)
+    step = length / per_kind
+    stops = []
+    for kind in KINDS:
+        for i in range(per_kind):
+            a = start + datetime.timedelta(seconds=i * step + rng.uniform(0, step / 2))
+            b = a + datetime.timedelta(seconds=rng.uniform(1, step / 2))
+            stops.append((kind, a.replace(microsecond=0), b.replace(microsecond=0)))
+    return stops
+
+
+def _reference(closed, start, end, produced, unit_time):
+    items = [{"Duruş Türü": k, "Süre (sn)": 0, "Açıklama": "", "Başlangıç": f"{a:%H:%M:%S}", "Bitiş": f"{b:%H:%M:%S}"}
+             for k, a, b in closed if k != "Mola"]
+    breaks = tuple((f"{a:%H:%M:%S}", f"{b:%H:%M:%S}") for k, a, b in closed if k == "Mola")
+    return compute_summary(items, start.time(), end.time(), produced, unit_time, 0, breaks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stops", type=int, default=1000)
+    parser.add_argument("--unit-time", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    start = datetime.datetime(2025, 8, 1, 6, 0)
+    end = datetime.datetime(2025, 8, 1, 22, 0)
+    stops = make_stops(args.stops, start, end)
+    events = sorted([(a, START, k, i) for i, (k, a, _b) in enumerate(stops)]
+                    + [(b, STOP, k, i) for i, (k, _a, b) in enumerate(stops)],
+                    key=lambda e: (e[0], e[1] == START))
+    produced = 1000
+
+    line = LineState()
+    line.configure(start=start.timestamp(), end=end.timestamp(), unit_time=args.unit_time)
+    line.set_count(produced=produced)
+    started = time.perf_counter()
+    for ts, action, kind, _i in events:
+        line.event(ts.timestamp(), action, kind)
+        snap = line.snapshot(ts.timestamp())
+    t_live = time.perf_counter() - started
+
+    closed = []
+    started = time.perf_counter()
+    for ts, action, _kind, i in events:
+        if action == STOP:
+            closed.append(stops[i])
+        ref = _reference(closed, start, end, produced, args.unit_time)
+    t_full = time.perf_counter() - started
+
+    final = line.snapshot(end.timestamp())
+    diff = {k: (final.get(k), v) for k, v in ref.items() if final.get(k) != v}
+    assert not diff, f"artımlı ve tam özet farklı: {diff}"
+
+    n = len(events)
+    print(f"duruş={len(stops)}  olay={n}")
+    print(f"  artımlı (olay + anlık)   {t_live * 1000:9.1f} ms  ({t_live / n * 1e6:7.1f} µs/olay)")
+    print(f"  baştan compute_summary   {t_full * 1000:9.1f} ms  ({t_full / n * 1e6:7.1f} µs/olay, {t_full / t_live:5.0f}x)")
+    print(f"  son OEE={final['OEE (%)']} %  (özet eşit)")
+
+
+if __name__ == "__main__":
+    main()
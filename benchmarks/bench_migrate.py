@@ -0,0 +1,62 @@
+# path: benchmarks/bench_migrate.py
+"""
+Eski JSON dosyalarının akış halinde kanonik biçime taşınması.
+
+    python -m benchmarks.bench_migrate --sizes 1000 10000 50000
+
+Her boyut için tamamı eski şemada ("hatalar" / "Hata Türü") bir
+veri_kaydi.json yazılır ve `migrate_file` ile boş bir depoya aktarılır;
+kayıt/sn ve tracemalloc tepe belleği, dosyayı `json.load` ile bütünüyle
+okumanın tepe belleğiyle karşılaştırılır. Akış okumasının tepe belleği
+boyuttan bağımsız (düz) kalmalıdır.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_store_data
+from modules.migrate import compact_store, migrate_file
+
+
+def bench(n, batch_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "eski.json")
+        with open(src, "w", encoding="utf-8") as f:
+            json.dump(make_store_data(n, legacy_share=1.0), f, ensure_ascii=False, indent=4)
+        size = os.path.getsize(src)
+
+        tracemalloc.start()
+        with open(src, encoding="utf-8") as f:
+            json.load(f)
+        _, load_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        store = os.path.join(tmp, "veri_kaydi.db")
+        tracemalloc.start()
+        started = time.perf_counter()
+        stats = migrate_file(src, store, batch_size)
+        sec = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        before, after = compact_store(store)
+
+    print(f"kayıt={n:>7}  dosya={size / 2**20:6.1f} MiB  süre={sec:6.2f} s  {stats['read'] / sec:>7.0f} kayıt/sn  "
+          f"tepe bellek={peak / 2**20:5.1f} MiB (json.load {load_peak / 2**20:6.1f} MiB)  "
+          f"depo={before / 2**20:5.1f} -> {after / 2**20:5.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--batch", type=int, default=500, help="transaction başına kayıt")
+    args = parser.parse_args(argv)
+    for n in args.sizes:
+        bench(n, args.batch)
+
+
+if __name__ == "__main__":
+    main()
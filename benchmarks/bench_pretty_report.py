@@ -0,0 +1,64 @@
+# path: benchmarks/bench_pretty_report.py
+"""
+Tek sayfa rapor (export_pretty_report) üretim ölçümü.
+
+    python -m benchmarks.bench_pretty_report --rows 10 1000 50000
+
+Her boyut için rapor bellekte üretilir; süre ve tracemalloc tepe belleği
+raporlanır.
+"""
+
+import argparse
+import datetime
+import random
+import time
+import tracemalloc
+from io import BytesIO
+
+from modules.data_manager import _build_pretty_workbook
+from modules.summary_core import compute_summary, summary_frame
+
+
+def make_report_input(n_rows, seed=0):
+    rnd = random.Random(seed)
+    etud_info = ("op", "Dizgi - 7", datetime.date(2025, 8, 1), "1. Vardiya",
+                 datetime.time(8, 0), datetime.time(16, 0), 0, 180, 2.0, 30.0)
+    stops = [
+        {"Duruş Türü": rnd.choice(["Planlı", "Plansız"]),
+         "Süre (sn)": rnd.randint(1, 600),
+         "Açıklama": rnd.choice(["sensör", "ayar", "malzeme bekleme", "arıza", "temizlik"])}
+        for _ in range(n_rows)
+    ]
+    summary_df = summary_frame(compute_summary(stops, etud_info[4], etud_info[5], 180, 2.0, 30.0))
+    return etud_info, stops, summary_df
+
+
+def render(etud_info, stops, summary_df):
+    buf = BytesIO()
+    _build_pretty_workbook(etud_info, stops, summary_df).save(buf)
+    return buf.getvalue()
+
+
+def bench(n_rows):
+    args = make_report_input(n_rows)
+    t0 = time.perf_counter()
+    render(*args)
+    seconds = time.perf_counter() - t0
+
+    tracemalloc.start()
+    render(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"duruş={n_rows:>7}  süre={seconds:8.3f} s  tepe bellek={peak / 2**20:7.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1_000, 50_000])
+    args = parser.parse_args(argv)
+    for n in args.rows:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# path: benchmarks/bench_startup.py
+"""
+Soğuk başlangıç: uygulama modüllerinin içe aktarma süresi ve ilk çalışma.
+
+    python -m benchmarks.bench_startup --repeat 5
+
+Her ölçüm temiz bir alt süreçte yapılır (modül önbelleği boş):
+- `import streamlit` (taban)
+- uygulamanın ilk sayfada yüklediği modüller
+- Streamlit AppTest ile ilk çalışma (etüt formu, henüz veri yok)
+
+Ayrıca ilk sayfadan sonra pandas / numpy / matplotlib / PIL / openpyxl'in
+yüklenip yüklenmediği raporlanır; ağır kütüphaneler ancak özet, grafik ya
+da rapor gerektiğinde yüklenmelidir.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "numpy", "matplotlib", "PIL.Image", "openpyxl")
+
+_PROBES = {
+    "streamlit": "import streamlit",
+    "uygulama modülleri": (
+        "import streamlit\n"
+        "import modules.perf, modules.layout_v2, modules.errors, modules.summary\n"
+        "import modules.intervals, modules.stop_log, modules.storage, modules.data_manager"
+    ),
+    "ilk çalışma (AppTest)": (
+        "from streamlit.testing.v1 import AppTest\n"
+        "at = AppTest.from_file('time_study_app_v2.py', default_timeout=60).run()\n"
+        "assert not at.exception, at.exception"
+    ),
+}
+
+_TEMPLATE = """
+import json, sys, time
+t0 = time.perf_counter()
+{body}
+sec = time.perf_counter() - t0
+print(json.dumps({{"sec": sec, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(body):
+    code = _TEMPLATE.format(body=body, heavy=HEAVY)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="her ölçüm için alt süreç sayısı (en iyisi alınır)")
+    args = parser.parse_args(argv)
+    for name, body in _PROBES.items():
+        runs = [probe(body) for _ in range(args.repeat)]
+        best = min(r["sec"] for r in runs)
+        heavy = ", ".join(runs[-1]["heavy"]) or "-"
+        print(f"{name:<24} {best * 1000:8.1f} ms   yüklenen ağır modüller: {heavy}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# path: benchmarks/bench_time_window.py
+"""
+Zaman penceresi motoru: tek tek (`study_window`) ve vektörel hesap.
+
+    python -m benchmarks.bench_time_window --studies 100000
+
+Karışık etütler üretilir (gündüz, gece vardiyası, birkaç günlük tam
+zamanlı); uçlar depodaki gibi metindir. Pencere uzunlukları skaler döngüyle ve `window_seconds_vec` ile
+hesaplanıp karşılaştırılır; ardından günlere (`day_buckets`) ve
+vardiyalara (`shift_overlap`) bölme süreleri raporlanır.
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.intervals import clock_text
+from modules.time_window import day_buckets, shift_overlap, window_bounds, window_seconds, window_seconds_vec
+
+
+def make_windows(n, seed=0):
+    rng = random.Random(seed)
+    days, starts, ends = [], [], []
+    for _ in range(n):
+        day = datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        start = datetime.time(rng.randrange(24), rng.randrange(60))
+        kind = rng.random()
+        if kind < 0.1:
+            s = datetime.datetime.combine(day, start)
+            starts.append(clock_text(s))
+            ends.append(clock_text(s + datetime.timedelta(minutes=rng.randrange(60, 4 * 1440))))
+        else:
+            starts.append(clock_text(start))
+            ends.append(clock_text(datetime.time(rng.randrange(24), rng.randrange(60))))
+        days.append(day.isoformat())
+    return days, starts, ends
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--studies", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    days, starts, ends = make_windows(args.studies)
+    scalar, t_scalar = timed(lambda: [window_seconds(s, e, d) for s, e, d in zip(starts, ends, days)])
+    s_col = pd.Series(starts)
+    e_col = pd.Series(ends)
+    d_col = pd.Series(days)
+    vector, t_vector = timed(lambda: window_seconds_vec(s_col, e_col, d_col))
+    assert np.allclose(np.asarray(scalar), vector), "skaler ve vektörel pencereler farklı"
+
+    s, e = window_bounds(s_col, e_col, d_col)
+    buckets, t_days = timed(lambda: day_buckets(s, e))
+    shifts, t_shifts = timed(lambda: shift_overlap(s, e))
+    assert np.allclose(buckets.groupby("study")["saniye"].sum().reindex(range(len(s)), fill_value=0), vector)
+
+    n = args.studies
+    print(f"etüt={n}")
+    print(f"  pencere (skaler)   {t_scalar * 1000:9.1f} ms")
+    print(f"  pencere (vektörel) {t_vector * 1000:9.1f} ms  ({t_scalar / t_vector:5.1f}x)")
+    print(f"  gün kovaları       {t_days * 1000:9.1f} ms  ({len(buckets)} satır)")
+    print(f"  vardiya kesişimi   {t_shifts * 1000:9.1f} ms  ({shifts.shape[1]} vardiya)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# path: benchmarks/load_ingest.py
+"""
+Veri alma servisine (`modules.ingest_service`) yük testi.
+
+    python -m benchmarks.load_ingest --clients 64 --batch 50 --seconds 10
+    python -m benchmarks.load_ingest --group-max 1      # grup commit kapalı
+    python -m benchmarks.load_ingest --url http://127.0.0.1:8080 --no-verify
+
+`--url` verilmezse servis geçici bir depoyla ayrı bir süreçte başlatılır
+(yük üreteci ile aynı GIL'i paylaşmasın diye). Her istemci kendi hat
+oturumuna `--batch` olaylık partiler gönderir (bir önceki yanıtı bekleyerek,
+PLC gibi). Süre sonunda saniyedeki olay / istek, gecikme yüzdelikleri ve
+servisin transaction başına yazdığı ortalama parti sayısı raporlanır;
+ardından depodaki olay sayısı gönderilenle karşılaştırılır.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_ready(session, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(f"{url}/health") as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"servis {timeout:.0f} s içinde açılmadı: {url}")
+        await asyncio.sleep(0.1)
+
+
+async def _client(session, url: str, name: str, batch: int, stop_at: float, latencies: list) -> int:
+    seq = sent = 0
+    while time.monotonic() < stop_at:
+        now = time.time()
+        events = []
+        for _ in range(batch):
+            seq += 1
+            events.append([seq, now, "başla" if seq % 2 else "bitir", "Plansız", "Sensör"])
+        started = time.perf_counter()
+        async with session.post(f"{url}/v1/events/{name}", json={"events": events}) as r:
+            if r.status != 200:
+                raise RuntimeError(f"{name}: HTTP {r.status} {await r.text()}")
+            await r.read()
+        latencies.append(time.perf_counter() - started)
+        sent += batch
+    return sent
+
+
+def _pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] * 1000 if values else 0.0
+
+
+async def run(url: str, clients: int, batch: int, seconds: float) -> dict:
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _wait_ready(session, url)
+        async with session.get(f"{url}/health") as r:
+            before = (await r.json())["yazma"]["olay"]
+        latencies: list = []
+        started = time.perf_counter()
+        stop_at = time.monotonic() + seconds
+        sent = await asyncio.gather(*[
+            _client(session, url, f"yuk-{os.getpid()}-{i}", batch, stop_at, latencies) for i in range(clients)
+        ])
+        elapsed = time.perf_counter() - started
+        async with session.get(f"{url}/health") as r:
+            after = (await r.json())["yazma"]["olay"]
+    tx = after["transaction"] - before["transaction"]
+    return {
+        "events": sum(sent),
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "latencies": latencies,
+        "transactions": tx,
+        "batches_per_tx": (after["oge"] - before["oge"]) / tx if tx else 0.0,
+        "sessions": [f"yuk-{os.getpid()}-{i}" for i in range(clients)],
+        "sent": sent,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="çalışan servis (verilmezse başlatılır)")
+    parser.add_argument("--clients", type=int, default=64, help="eşzamanlı istemci (hat oturumu)")
+    parser.add_argument("--batch", type=int, default=50, help="istek başına olay")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--group-max", type=int, default=None, help="başlatılan servisin --group-max değeri")
+    parser.add_argument("--no-verify", action="store_true", help="depodaki olay sayısını kontrol etme")
+    args = parser.parse_args(argv)
+
+    tmp = server = None
+    url = args.url
+    if url is None:
+        tmp = tempfile.TemporaryDirectory()
+        store = os.path.join(tmp.name, "veri_kaydi.db")
+        port = _free_port()
+        cmd = [sys.executable, "-m", "modules.ingest_service", "--port", str(port), "--store", store]
+        if args.group_max is not None:
+            cmd += ["--group-max", str(args.group_max)]
+        server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        res = asyncio.run(run(url, args.clients, args.batch, args.seconds))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    lat = res["latencies"]
+    print(f"istemci={args.clients}  parti={args.batch}  süre={res['seconds']:.1f} s")
+    print(f"  olay/s     {res['events'] / res['seconds']:10.0f}")
+    print(f"  istek/s    {res['requests'] / res['seconds']:10.0f}")
+    print(f"  gecikme    p50={_pct(lat, 0.50):.1f} ms  p95={_pct(lat, 0.95):.1f} ms  p99={_pct(lat, 0.99):.1f} ms")
+    print(f"  transaction={res['transactions']}  transaction başına parti={res['batches_per_tx']:.1f}")
+
+    if tmp is not None and not args.no_verify:
+        from modules.storage import load_events
+        stored = sum(len(load_events(s, store)) for s in res["sessions"])
+        status = "tamam" if stored == res["events"] else "EKSİK"
+        print(f"  depodaki olay={stored}  gönderilen={res['events']}  {status}")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# path: benchmarks/run.py
+"""
+Ölçüm paketi: özet, rapor ve depo yollarının süre / tepe bellek ölçümü.
+
+    python -m benchmarks.run                          # varsayılan ölçekler
+    python -m benchmarks.run --scales 10 1000 --cases ozet stops_df
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+
+Ölçek, duruş sayısı (özet / rapor durumları) ya da kayıt sayısıdır
+(depo durumları). Her durum için --repeat çalıştırmanın en iyisi süre
+olarak, ayrı bir çalıştırmada tracemalloc tepe belleği raporlanır
+(yalnızca Python ayırmaları; SQLite'ın C tarafı görünmez). Taban
+çizgisine göre --tolerance'tan fazla yavaşlayan durumlar işaretlenir ve
+çıkış kodu 1 olur. Streamlit gerekmez: özet için `summary_core` çekirdeği
+ölçülür (Streamlit kuruluysa `summary.calculate_summary` da önbelleği
+temizlenerek ölçülür).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import make_error_data, make_store_data
+
+DEFAULT_SCALES = [10, 1_000, 10_000, 100_000]
+
+# bunun altındaki farklar ölçüm gürültüsü sayılır
+_NOISE_SEC = 0.001
+
+_ETUD_INFO = (
+    "Kader", "Dizgi - 7", datetime.date(2025, 8, 1), "1. Vardiya",
+    datetime.time(6, 0), datetime.time(23, 0), 100, 4_100, 0.25, 30.0,
+)
+
+
+# ---- durumlar: hazırlık(ölçek) -> (çalıştır, temizle) ----
+def _case_summary(n: int):
+    from modules.summary_core import compute_summary
+    stops = make_error_data(n)
+    start, end, unit, brk = _ETUD_INFO[4], _ETUD_INFO[5], _ETUD_INFO[8], _ETUD_INFO[9]
+    return lambda: compute_summary(stops, start, end, 4_000, unit, brk), None
+
+
+def _case_calculate_summary(n: int):
+    from modules.summary import _cached_summary_df, calculate_summary
+    stops = make_error_data(n)
+    start, end, unit, brk = _ETUD_INFO[4], _ETUD_INFO[5], _ETUD_INFO[8], _ETUD_INFO[9]
+
+    def run():
+        _cached_summary_df.clear()   # her tekrar önbelleksiz (ilk rerun) maliyeti
+        return calculate_summary(stops, start, end, 4_000, unit, brk)
+    return run, None
+
+
+def _case_stops_df(n: int):
+    from modules.summary_core import _to_stops_df
+    stops = make_error_data(n)
+    return lambda: _to_stops_df(stops), None
+
+
+def _case_raw_export(n: int):
+    from modules.data_manager import _REPORT_CACHE, export_current_session_to_excel
+    stops = make_error_data(n)
+    tmp = tempfile.mkdtemp(prefix="bench_raw_")
+
+    def run():
+        _REPORT_CACHE.clear()
+        return export_current_session_to_excel(_ETUD_INFO, stops, tmp)
+    return run, lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _case_pretty_export(n: int):
+    from modules.data_manager import _REPORT_CACHE, export_pretty_report
+    from modules.summary_core import compute_summary, summary_frame
+    stops = make_error_data(n)
+    summary_df = summary_frame(compute_summary(stops, _ETUD_INFO[4], _ETUD_INFO[5], 4_000, _ETUD_INFO[8], _ETUD_INFO[9]))
+    tmp = tempfile.mkdtemp(prefix="bench_pretty_")
+    out = os.path.join(tmp, "rapor.xlsx")
+
+    def run():
+        _REPORT_CACHE.clear()
+        return export_pretty_report(_ETUD_INFO, stops, summary_df, out)
+    return run, lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _case_save_data(n: int):
+    from modules.storage import save_data
+    data = make_store_data(n)
+    tmp = tempfile.mkdtemp(prefix="bench_save_")
+    counter = iter(range(10**9))
+
+    def run():
+        # her tekrar boş bir depoya tam yazım
+        return save_data(data, os.path.join(tmp, f"veri_{next(counter)}.db"))
+    return run, lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _case_load_data(n: int):
+    from modules.storage import load_data, save_data
+    tmp = tempfile.mkdtemp(prefix="bench_load_")
+    store = os.path.join(tmp, "veri_kaydi.db")
+    save_data(make_store_data(n), store)
+    return lambda: load_data(store), lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _case_load_cached(n: int):
+    from modules.storage import save_data
+    from modules.study_cache import StudyCache
+    tmp = tempfile.mkdtemp(prefix="bench_cache_")
+    store = os.path.join(tmp, "veri_kaydi.db")
+    save_data(make_store_data(n), store)
+    cache = StudyCache(store)
+    return lambda: cache.studies(), lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _case_load_cached_write(n: int):
+    from modules.storage import save_data, save_study
+    from modules.study_cache import StudyCache
+    tmp = tempfile.mkdtemp(prefix="bench_cache_")
+    store = os.path.join(tmp, "veri_kaydi.db")
+    data = make_store_data(n)
+    save_data(data, store)
+    cache = StudyCache(store)
+    key = next(iter(data))
+    counter = iter(range(10**9))
+
+    def run():
+        # her tekrarda tek kayıt değişir; önbellek yalnız onu yeniden çözer
+        save_study(key, {**data[key], "_bench": next(counter)}, store)
+        return cache.studies()
+    return run, lambda: shutil.rmtree(tmp, ignore_errors=True)
+
+
+CASES: Dict[str, Tuple[str, Callable[[int], Any]]] = {
+    "ozet": ("compute_summary (calculate_summary çekirdeği) / duruş", _case_summary),
+    "ozet_st": ("summary.calculate_summary, önbelleksiz / duruş", _case_calculate_summary),
+    "stops_df": ("_to_stops_df / duruş", _case_stops_df),
+    "ham_excel": ("export_current_session_to_excel / duruş", _case_raw_export),
+    "rapor_excel": ("export_pretty_report / duruş", _case_pretty_export),
+    "save_data": ("save_data (boş depoya) / kayıt", _case_save_data),
+    "load_data": ("load_data / kayıt", _case_load_data),
+    "load_cached": ("study_cache, değişiklik yok / kayıt", _case_load_cached),
+    "load_cached_1": ("study_cache, tek kayıt değişti (yazma dahil) / kayıt", _case_load_cached_write),
+}
+
+
+def measure(setup: Callable[[int], Any], n: int, repeat: int) -> Dict[str, float]:
+    run, cleanup = setup(n)
+    try:
+        run()  # ısınma (içe aktarma, şema vb.)
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if cleanup:
+            cleanup()
+    return {"sec": best, "peak_mb": peak / 2**20}
+
+
+def _available(name: str) -> bool:
+    if name == "ozet_st":
+        try:
+            import streamlit  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Taban çizgisine göre tolerans dışı yavaşlamalar."""
+    slower = []
+    for case, by_scale in results.items():
+        for scale, m in by_scale.items():
+            ref = baseline.get("results", {}).get(case, {}).get(scale)
+            if ref and m["sec"] > ref["sec"] * (1 + tolerance) and m["sec"] - ref["sec"] > _NOISE_SEC:
+                slower.append(f"{case} @ {scale}: {ref['sec']:.4f} s -> {m['sec']:.4f} s ({m['sec'] / ref['sec']:.2f}x)")
+    return slower
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="süre için tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--baseline", help="karşılaştırılacak taban çizgisi (JSON)")
+    parser.add_argument("--save-baseline", help="sonuçları taban çizgisi olarak bu dosyaya yaz")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="izin verilen yavaşlama oranı (0.2 = %%20)")
+    args = parser.parse_args(argv)
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for case in args.cases:
+        label, setup = CASES[case]
+        if not _available(case):
+            print(f"{case:<12} atlandı (streamlit kurulu değil)")
+            continue
+        for n in args.scales:
+            m = measure(setup, n, args.repeat)
+            results.setdefault(case, {})[str(n)] = m
+            ref = (baseline or {}).get("results", {}).get(case, {}).get(str(n))
+            delta = f"  taban: {ref['sec']:.4f} s ({m['sec'] / ref['sec']:.2f}x)" if ref and ref["sec"] > 0 else ""
+            print(f"{case:<12} n={n:>7}  {m['sec']:9.4f} s  tepe={m['peak_mb']:8.1f} MiB{delta}   [{label}]")
+            sys.stdout.flush()
+
+    if args.save_baseline:
+        payload = {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"taban çizgisi yazıldı: {args.save_baseline}")
+
+    if baseline is not None:
+        slower = compare(results, baseline, args.tolerance)
+        for line in slower:
+            print(f"! yavaşlama: {line}")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# path: benchmarks/synthetic.py
+"""
+Ölçümler için tohumlu (tekrarlanabilir) sentetik veri üreticisi.
+
+- `make_error_data`: oturumdaki `error_data` biçiminde duruş listesi
+- `make_sessions`: (etud_info 10'lu demeti, error_data) çiftleri
+- `make_store_data`: veri_kaydi.json biçiminde {anahtar: kayıt} sözlüğü;
+  kayıtların bir kısmı eski "hatalar" / "Hata Türü" şemasındadır
+
+Aynı tohum her zaman aynı veriyi üretir.
+"""
+
+import datetime
+import random
+from typing import Any, Dict, List, Tuple
+
+from modules.data_manager import study_record
+from modules.storage import study_key
+
+STOP_TYPES = ("Planlı", "Plansız")
+REASONS = ("sensör", "ayar", "malzeme bekleme", "arıza", "kalıp değişimi", "dizgi", "temizlik", "mola uzaması")
+MACHINES = tuple(f"Dizgi - {i}" for i in range(1, 41))
+OPERATORS = ("Kader", "Sena", "Ayşe", "Mehmet", "Elif", "Can")
+SHIFTS = ("1. Vardiya", "2. Vardiya", "3. Vardiya")
+
+
+def _stop(rnd: random.Random) -> Dict[str, Any]:
+    return {
+        "Duruş Türü": rnd.choice(STOP_TYPES),
+        "Süre (sn)": rnd.randint(0, 3600),
+        "Açıklama": rnd.choice(REASONS),
+    }
+
+
+def make_error_data(n_stops: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Oturum `error_data` listesi (yalnız süreli duruşlar)."""
+    rnd = random.Random(seed)
+    return [_stop(rnd) for _ in range(n_stops)]
+
+
+def make_etud_info(rnd: random.Random, i: int = 0, day: datetime.date = datetime.date(2025, 8, 1)) -> Tuple[Any, ...]:
+    start = rnd.randint(6 * 60, 12 * 60)
+    end = start + rnd.randint(60, 8 * 60)
+    initial = rnd.randint(0, 500)
+    return (
+        rnd.choice(OPERATORS), MACHINES[i % len(MACHINES)], day, rnd.choice(SHIFTS),
+        datetime.time(start // 60, start % 60, rnd.randint(0, 59)),
+        datetime.time(min(end // 60, 23), end % 60),
+        initial, initial + rnd.randint(0, 200),
+        round(rnd.uniform(0.5, 6.0), 2), float(rnd.choice([0, 15, 30, 45])),
+    )
+
+
+def make_sessions(n: int, seed: int = 0, max_stops: int = 12) -> List[Tuple[Tuple[Any, ...], List[Dict[str, Any]]]]:
+    """n etüt: (etud_info, error_data) çiftleri."""
+    rnd = random.Random(seed)
+    return [
+        (make_etud_info(rnd, i), [_stop(rnd) for _ in range(rnd.randint(0, max_stops))])
+        for i in range(n)
+    ]
+
+
+def _legacy_record(rnd: random.Random, etud_info: Tuple[Any, ...], stops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # veri_kaydi.json'daki eski biçim: "hatalar" + "Hata Adı" / "Hata Türü"
+    operator, machine, day, vardiya = etud_info[:4]
+    return {
+        "tarih": day.isoformat(), "makine": machine, "operator": operator, "vardiya": vardiya,
+        "hatalar": [{"Hata Adı": s["Açıklama"], "Hata Türü": s["Duruş Türü"], "Süre (sn)": s["Süre (sn)"]} for s in stops],
+        "ozet": {"Toplam Süre (dk)": float(rnd.randint(60, 480))},
+    }
+
+
+def make_store_data(n: int, seed: int = 0, legacy_share: float = 0.2) -> Dict[str, Any]:
+    """veri_kaydi.json biçiminde n kayıt (anahtar: "<tarih>_<makine>")."""
+    rnd = random.Random(seed)
+    base = datetime.date(2024, 1, 1)
+    data: Dict[str, Any] = {}
+    for i in range(n):
+        day = base + datetime.timedelta(days=i // len(MACHINES))
+        etud_info = make_etud_info(rnd, i, day)
+        stops = [_stop(rnd) for _ in range(rnd.randint(0, 12))]
+        record = (
+            _legacy_record(rnd, etud_info, stops) if rnd.random() < legacy_share
+            else study_record(etud_info, stops)
+        )
+        data[study_key(day.isoformat(), etud_info[1])] = record
+    return data
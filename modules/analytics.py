@@ -0,0 +1,262 @@
+# path: modules/analytics.py
+"""
+Etütler arası KPI özetleri (makine / operatör / vardiya / gün-hafta-ay).
+
+Her etüdün katkısı (etüt süresi, planlı/plansız duruş, net çalışma,
+planlanan/gerçekleşen üretim) günlük bir özet tablosunda
+(tarih x makine x operatör x vardiya) toplanır. Tablo, depo yazma kancası
+sayesinde her kayıt/silmede aynı transaction içinde artımlı güncellenir;
+panolar ham kayıtları yeniden taramaz. Örnek:
+
+    kpi_rollup(by=("makine",), period="week", start_date="2025-06-01", machine="Dizgi - 7")
+
+Kanca kayıt sırasında bu modül yüklü değilse özet tablo eskir; bu durum
+depo sürümünden anlaşılır ve ilk sorguda tablo baştan kurulur.
+"""
+
+import datetime
+import json
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+from modules.data_manager import etud_info_from_record
+from modules.migrate import canonical_summary
+from modules.storage import (
+    DEFAULT_PATH, _connect, _index_fields, derived_in_sync, derived_is_fresh,
+    mark_derived_synced, register_write_hook,
+)
+from modules.summary_core import InvalidStudyError, compute_summary
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS rollup_daily (
+    tarih         TEXT NOT NULL,
+    makine        TEXT NOT NULL,
+    operator      TEXT NOT NULL,
+    vardiya       TEXT NOT NULL,
+    studies       INTEGER NOT NULL,
+    etud_min      REAL NOT NULL,
+    planned_sec   REAL NOT NULL,
+    unplanned_sec REAL NOT NULL,
+    net_sec       REAL NOT NULL,
+    planned_qty   REAL NOT NULL,
+    actual_qty    REAL NOT NULL,
+    PRIMARY KEY (tarih, makine, operator, vardiya)
+)""",
+    "CREATE INDEX IF NOT EXISTS ix_rollup_makine_tarih ON rollup_daily(makine, tarih)",
+)
+
+_MEASURES = ("studies", "etud_min", "planned_sec", "unplanned_sec", "net_sec", "planned_qty", "actual_qty")
+
+_GROUPS = ("makine", "operator", "vardiya")
+
+# ISO haftası: haftanın perşembesi yılı ve hafta numarasını belirler
+# (strftime('%W') yılın ilk pazartesisinden sayar; yılbaşını bölerdi)
+_ISO_THURSDAY = "date(tarih, '-3 days', 'weekday 4')"
+
+_PERIODS = {
+    "day": "tarih",
+    "week": (
+        f"CASE WHEN date(tarih) IS NOT NULL THEN printf('%s-W%02d', "
+        f"strftime('%Y', {_ISO_THURSDAY}), (strftime('%j', {_ISO_THURSDAY}) - 1) / 7 + 1) END"
+    ),
+    "month": "substr(tarih, 1, 7)",
+}
+
+_VERSION_KEY = "rollup_version"
+
+
+# ---- etüt katkısı ----
+def study_metrics(record: Any) -> Dict[str, float]:
+    """Tek kaydın özet tablosuna katkısı.
+
+    Saat bilgisi olan kayıtlar `compute_summary` ile hesaplanır; eski
+    kayıtlarda kayıtlı "ozet" bloğu, o da yoksa yalnızca duruş toplamları
+    kullanılır.
+    """
+    etud_info, error_data = etud_info_from_record(record)
+    (_op, _mk, _dt, _vd, start_time, end_time,
+     initial_count, final_count, unit_time, break_time) = etud_info
+
+    planned = sum(float(e["Süre (sn)"]) for e in error_data if e["Duruş Türü"] == "Planlı")
+    unplanned = sum(float(e["Süre (sn)"]) for e in error_data if e["Duruş Türü"] == "Plansız")
+    metrics = dict(studies=1, etud_min=0.0, planned_sec=planned, unplanned_sec=unplanned,
+                   net_sec=0.0, planned_qty=0.0, actual_qty=0.0)
+
+    try:
+        produced = max(0, (final_count or 0) - (initial_count or 0))
+        s = compute_summary(error_data, start_time, end_time, produced, unit_time or 0, break_time)
+    except (InvalidStudyError, TypeError, ValueError):
+        s = None
+
+    if s is not None:
+        metrics.update(
+            etud_min=s["Etüt Süresi (dk)"],
+            net_sec=max(s["Etüt Süresi (dk)"] * 60 - s["Toplam Duruş Süresi (sn)"], 0),
+            planned_qty=s["Planlanan Üretim (adet)"],
+            actual_qty=s["Gerçekleşen Üretim (adet)"],
+        )
+    elif isinstance(record, dict) and isinstance(record.get("ozet"), dict):
+        # saat bilgisi yok: kayıtlı özet (eski adlar kanonik adlara çevrilir)
+        oz = canonical_summary(record["ozet"])
+        etud_min = float(oz.get("Etüt Süresi (dk)", 0) or 0)
+        metrics.update(
+            etud_min=etud_min,
+            net_sec=max(etud_min * 60 - float(oz.get("Toplam Duruş Süresi (sn)", 0) or 0), 0),
+            planned_qty=float(oz.get("Planlanan Üretim (adet)", 0) or 0),
+            actual_qty=float(oz.get("Gerçekleşen Üretim (adet)", 0) or 0),
+        )
+    return metrics
+
+
+def _apply(conn: sqlite3.Connection, key: str, record: Any, sign: int) -> None:
+    tarih, makine, operator, vardiya = _index_fields(key, record)
+    m = study_metrics(record)
+    values = [sign * m[c] for c in _MEASURES]
+    conn.execute(
+        f"""
+        INSERT INTO rollup_daily (tarih, makine, operator, vardiya, {", ".join(_MEASURES)})
+        VALUES (?, ?, ?, ?, {", ".join("?" * len(_MEASURES))})
+        ON CONFLICT(tarih, makine, operator, vardiya) DO UPDATE SET
+            {", ".join(f"{c} = {c} + excluded.{c}" for c in _MEASURES)}
+        """,
+        (tarih, makine, operator, vardiya, *values),
+    )
+    if sign < 0:
+        conn.execute(
+            "DELETE FROM rollup_daily WHERE tarih = ? AND makine = ? AND operator = ? "
+            "AND vardiya = ? AND studies <= 0",
+            (tarih, makine, operator, vardiya),
+        )
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    # executescript açık transaction'ı commit ettiği için deyimler tek tek
+    for stmt in _SCHEMA:
+        conn.execute(stmt)
+
+
+def _has_table(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_daily'"
+    ).fetchone() is not None
+
+
+def _on_write(conn: sqlite3.Connection, key: str, old: Any, new: Any) -> None:
+    """Depo yazma kancası: eski katkıyı çıkar, yenisini ekle."""
+    _ensure_schema(conn)
+    if not derived_in_sync(conn, _VERSION_KEY):
+        return  # tablo zaten eski; ilk sorguda baştan kurulacak
+    if old is not None:
+        _apply(conn, key, old, -1)
+    if new is not None:
+        _apply(conn, key, new, +1)
+    mark_derived_synced(conn, _VERSION_KEY)
+
+
+register_write_hook(_on_write, _VERSION_KEY)
+
+
+# ---- bakım ----
+def rebuild_rollups(path: str = DEFAULT_PATH) -> int:
+    """Özet tabloyu tüm kayıtlardan baştan kur. İşlenen kayıt sayısını döndürür."""
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _ensure_schema(conn)
+            conn.execute("DELETE FROM rollup_daily")
+            n = 0
+            for key, payload in conn.execute("SELECT key, payload FROM studies").fetchall():
+                _apply(conn, key, json.loads(payload), +1)
+                n += 1
+            mark_derived_synced(conn, _VERSION_KEY)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return n
+
+
+def _ensure_fresh(conn: sqlite3.Connection, path: str) -> None:
+    if not _has_table(conn) or not derived_is_fresh(conn, _VERSION_KEY):
+        rebuild_rollups(path)
+
+
+# ---- sorgu ----
+def kpi_rollup(
+    path: str = DEFAULT_PATH,
+    by: Iterable[str] = ("makine",),
+    period: Optional[str] = None,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+    vardiya: Optional[str] = None,
+) -> pd.DataFrame:
+    """Özet tablodan KPI'ları grupla.
+
+    by: "makine", "operator", "vardiya" alt kümesi; period: None, "day",
+    "week" (ISO haftası, "2025-W01") ya da "month". Kapasite kullanımı net süre / etüt süresi,
+    gerçekleşme oranı gerçekleşen / planlanan üretim olarak toplamlar
+    üzerinden hesaplanır (ağırlıklı ortalama).
+    """
+    by = list(by)
+    bad = [b for b in by if b not in _GROUPS]
+    if bad:
+        raise ValueError(f"Geçersiz gruplama alanı: {bad}")
+    if period is not None and period not in _PERIODS:
+        raise ValueError(f"Geçersiz dönem: {period}")
+
+    select = list(by)
+    if period:
+        select.insert(0, f"{_PERIODS[period]} AS donem")
+    where, params = [], []
+    for col, val in (("makine", machine), ("operator", operator), ("vardiya", vardiya)):
+        if val is not None:
+            where.append(f"{col} = ?"); params.append(val)
+    if start_date is not None:
+        where.append("tarih >= ?"); params.append(str(start_date))
+    if end_date is not None:
+        where.append("tarih <= ?"); params.append(str(end_date))
+
+    group = (["donem"] if period else []) + by
+    sql = (
+        f"SELECT {', '.join(select + [f'SUM({c}) AS {c}' for c in _MEASURES])} FROM rollup_daily"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + (f" GROUP BY {', '.join(group)} ORDER BY {', '.join(group)}" if group else "")
+    )
+
+    with closing(_connect(path)) as conn:
+        _ensure_fresh(conn, path)
+        rows = conn.execute(sql, params).fetchall()
+    raw = pd.DataFrame(rows, columns=group + list(_MEASURES))
+    return _kpi_frame(raw, group)
+
+
+def last_days(days: int, machine: Optional[str] = None, path: str = DEFAULT_PATH,
+              today: Optional[datetime.date] = None, **kwargs: Any) -> pd.DataFrame:
+    """Son `days` günün KPI'ları (ör. son 90 gün, "Dizgi - 7")."""
+    today = today or datetime.date.today()
+    start = today - datetime.timedelta(days=days - 1)
+    return kpi_rollup(path, start_date=start.isoformat(), end_date=today.isoformat(),
+                      machine=machine, **kwargs)
+
+
+def _kpi_frame(raw: pd.DataFrame, group: list) -> pd.DataFrame:
+    etud_sec = raw["etud_min"] * 60
+    out = raw[group].copy()
+    out["Etüt Sayısı"] = raw["studies"].astype(int)
+    out["Etüt Süresi (dk)"] = raw["etud_min"].round(2)
+    out["Planlı Duruş (dk)"] = (raw["planned_sec"] / 60).round(2)
+    out["Plansız Duruş (dk)"] = (raw["unplanned_sec"] / 60).round(2)
+    out["Net Çalışma (dk)"] = (raw["net_sec"] / 60).round(2)
+    out["Kapasite Kullanımı (%)"] = (raw["net_sec"] / etud_sec.where(etud_sec > 0) * 100).fillna(0).round(2)
+    out["Planlanan Üretim (adet)"] = raw["planned_qty"].round(2)
+    out["Gerçekleşen Üretim (adet)"] = raw["actual_qty"].round(2)
+    out["Gerçekleşme Oranı (%)"] = (
+        raw["actual_qty"] / raw["planned_qty"].where(raw["planned_qty"] > 0) * 100
+    ).fillna(0).round(2)
+    return out
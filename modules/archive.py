@@ -0,0 +1,445 @@
+# path: modules/archive.py
+"""
+Geçmiş etütlerin sütunlu arşivi (Parquet ya da Arrow IPC).
+
+    python -m modules.archive export arsiv/                  # depo -> arşiv
+    python -m modules.archive export arsiv/ --format arrow --start 2025-01-01
+    python -m modules.archive import arsiv/ --store veri_kaydi.json
+
+Depo tek tek kayıt yazmak için iyidir; yıllık analizde ise her kaydın JSON'u
+çözülür. Arşiv aynı alanları (`tarih`, `makine`, `operator`, `vardiya`,
+duruşlar) iki tabloya ayırır ve ay klasörlerine (Hive biçimi) böler:
+
+    arsiv/_arsiv.json
+    arsiv/etutler/ay=2025-08/part-0.parquet
+    arsiv/duruslar/ay=2025-08/part-0.parquet
+
+Ay içinde satırlar makine, tarih sırasındadır ve küçük satır gruplarına
+yazılır; Parquet'te makine filtresi grup istatistikleriyle diğer makinelerin
+gruplarını atlar. (Ay / makine klasörleri de denendi; etüt sayısı makine
+başına ayda birkaç düzine olduğundan dosya başına maliyet baskın çıktı.)
+
+Filtreli dışa aktarma, filtreye uyan etütlerin aylarını bütünüyle yeniden
+yazar; var olan bir arşive tek makine ya da birkaç gün eklemek o ayın diğer
+satırlarını silmez.
+
+Okumalar (`scan_archive`, `read_archive`, `stop_totals`) yalnızca istenen
+sütunları ve tarih aralığındaki ay klasörlerini okur; dosyalar bellek
+eşlemeli (mmap) açılır. Arrow IPC dosyaları sıkıştırılmadan yazılır, böylece
+eşlenen sayfalar kopyalanmadan kullanılır; Parquet zstd ile sıkıştırılır.
+
+`import_archive` arşivi kanonik kayıtlara (`study_record` biçimi) geri çevirip
+depoya yazar. pyarrow yalnızca bu modülde, ilk kullanımda yüklenir.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+from modules.data_manager import RECORD_VERSION
+from modules.intervals import STOP_END, STOP_START
+from modules.migrate import _write_batch, canonical_record
+from modules.storage import DEFAULT_PATH, _connect
+from modules.summary_core import SUMMARY_COLUMNS
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+STUDIES = "etutler"
+STOPS = "duruslar"
+PARTITION_COLUMNS = ("ay",)
+_ROW_GROUP = 4_096
+MANIFEST = "_arsiv.json"
+_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"   # tarihi boş kayıtlar
+
+_STUDY_FIELDS = ("namespace", "key", "tarih", "makine", "operator", "vardiya", "baslangic", "bitis")
+_STUDY_NUMBERS = ("ilk_sayim", "son_sayim", "birim_sure", "mola")
+
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+    except ImportError as e:
+        raise ImportError("pyarrow gerekli: pip install pyarrow") from e
+    return pa, ds, pafs
+
+
+def _schemas(pa) -> Dict[str, "pa.Schema"]:
+    text, num = pa.string(), pa.float64()
+    return {
+        STUDIES: pa.schema(
+            [(f, text) for f in _STUDY_FIELDS]
+            + [(f, num) for f in _STUDY_NUMBERS]
+            + [(c, num) for c in SUMMARY_COLUMNS]
+            + [("ozet_diger", text)]   # özetteki diğer alanlar (JSON), genelde boş
+            + [(c, text) for c in PARTITION_COLUMNS]
+        ),
+        STOPS: pa.schema(
+            [(f, text) for f in ("namespace", "key", "tarih", "makine", "operator")]
+            + [("sira", pa.int32()), ("Duruş Türü", text)]
+            + [("Süre (sn)", num), ("Açıklama", text), (STOP_START, text), (STOP_END, text)]
+            + [(c, text) for c in PARTITION_COLUMNS]
+        ),
+    }
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _restore_number(value: Any) -> Any:
+    # JSON'da sayım / süre çoğunlukla tam sayıdır
+    if value is None:
+        return None
+    return int(value) if float(value).is_integer() else value
+
+
+# ---- dışa aktarma ----
+def _store_rows(
+    path: str, start_date: Any, end_date: Any, machine: Optional[str], batch_size: int,
+) -> Iterator[List[Tuple[str, str, Dict[str, Any]]]]:
+    """Depodan (ad alanı, anahtar, kanonik kayıt) partileri.
+
+    Filtre satırları değil ayları seçer: filtreye uyan en az bir etüdü olan
+    ayların tüm etütleri döner (ay klasörü bütünüyle yeniden yazılır).
+    """
+    where, params = [], []
+    if start_date is not None:
+        where.append("tarih >= ?"); params.append(str(start_date))
+    if end_date is not None:
+        where.append("tarih <= ?"); params.append(str(end_date))
+    if machine is not None:
+        where.append("makine = ?"); params.append(machine)
+    sql = "SELECT namespace, key, payload FROM studies"
+    if where:
+        sql += (" WHERE COALESCE(substr(tarih, 1, 7), '') IN (SELECT DISTINCT COALESCE(substr(tarih, 1, 7), '') "
+                "FROM studies WHERE " + " AND ".join(where) + ")")
+    # ay klasörü içinde makine, tarih sırası (satır grubu istatistikleri için)
+    sql += " ORDER BY substr(tarih, 1, 7), makine, tarih, rowid"
+    with closing(_connect(path)) as conn:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [(ns, key, canonical_record(key, json.loads(payload))) for ns, key, payload in rows]
+
+
+def _month(record: Dict[str, Any]) -> Optional[str]:
+    return (record.get("tarih") or "")[:7] or None
+
+
+def _study_batch(pa, schema, rows) -> "pa.RecordBatch":
+    cols: Dict[str, list] = {name: [] for name in schema.names}
+    for namespace, key, rec in rows:
+        ozet = rec.get("ozet") or {}
+        cols["namespace"].append(namespace)
+        cols["key"].append(key)
+        for f in _STUDY_FIELDS[2:]:
+            cols[f].append(rec.get(f) or None)
+        for f in _STUDY_NUMBERS:
+            cols[f].append(_number(rec.get(f)))
+        for c in SUMMARY_COLUMNS:
+            cols[c].append(_number(ozet.get(c)))
+        extra = {k: v for k, v in ozet.items() if k not in SUMMARY_COLUMNS}
+        cols["ozet_diger"].append(json.dumps(extra, ensure_ascii=False) if extra else None)
+        cols["ay"].append(_month(rec))
+    return pa.RecordBatch.from_pydict(cols, schema=schema)
+
+
+def _stop_batch(pa, schema, rows) -> "pa.RecordBatch":
+    cols: Dict[str, list] = {name: [] for name in schema.names}
+    for namespace, key, rec in rows:
+        ay = _month(rec)
+        for i, stop in enumerate(rec.get("duruslar") or ()):
+            cols["namespace"].append(namespace)
+            cols["key"].append(key)
+            cols["tarih"].append(rec.get("tarih") or None)
+            cols["makine"].append(rec.get("makine") or None)
+            cols["operator"].append(rec.get("operator") or None)
+            cols["sira"].append(i)
+            cols["Duruş Türü"].append(stop.get("Duruş Türü") or "")
+            cols["Süre (sn)"].append(_number(stop.get("Süre (sn)")) or 0.0)
+            cols["Açıklama"].append(stop.get("Açıklama") or "")
+            cols[STOP_START].append(stop.get(STOP_START))
+            cols[STOP_END].append(stop.get(STOP_END))
+            cols["ay"].append(ay)
+    return pa.RecordBatch.from_pydict(cols, schema=schema)
+
+
+def export_archive(
+    out_dir: str,
+    path: str = DEFAULT_PATH,
+    fmt: str = "parquet",
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    batch_size: int = 5_000,
+) -> Dict[str, Any]:
+    """Depodaki etütleri (filtreyle) arşive yaz.
+
+    Depo her tablo için bir kez, partiler halinde okunur; yazılan ay
+    klasörlerinin eski içeriği değiştirilir, diğerlerine dokunulmaz. Bu
+    yüzden filtre yalnız hangi ayların yazılacağını seçer: seçilen ayın
+    diğer makinelerdeki / aralık dışındaki etütleri de yeniden yazılır.
+    Arşivin tek biçimi vardır (`_arsiv.json`); var olan arşive farklı
+    biçimle yazmak ValueError verir. Dönen sözlük: path, format, studies, stops, seconds.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Bilinmeyen arşiv biçimi: {fmt} ({', '.join(FORMATS)})")
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            existing = json.load(f)["format"]
+    except FileNotFoundError:
+        existing = fmt
+    if existing != fmt:
+        raise ValueError(f"Arşiv {existing} biçiminde; {fmt} ile yazılamaz: {out_dir}")
+    pa, ds, _ = _pa()
+    t0 = time.perf_counter()
+    schemas = _schemas(pa)
+    partitioning = ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLUMNS]), flavor="hive")
+    file_format = ds.ParquetFileFormat() if fmt == "parquet" else ds.IpcFileFormat()
+    options = file_format.make_write_options(**({"compression": "zstd"} if fmt == "parquet" else {}))
+
+    counts = {}
+    for table, build in ((STUDIES, _study_batch), (STOPS, _stop_batch)):
+        schema = schemas[table]
+        n = 0
+
+        def batches():
+            nonlocal n
+            for rows in _store_rows(path, start_date, end_date, machine, batch_size):
+                batch = build(pa, schema, rows)
+                n += batch.num_rows
+                yield batch
+
+        ds.write_dataset(
+            batches(), os.path.join(out_dir, table), schema=schema, format=file_format,
+            file_options=options, partitioning=partitioning,
+            existing_data_behavior="delete_matching", max_partitions=100_000, max_rows_per_group=_ROW_GROUP,
+            basename_template="part-{i}." + ("parquet" if fmt == "parquet" else "arrow"),
+        )
+        counts[table] = n
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"format": fmt, "surum": RECORD_VERSION, "olusturma": time.strftime("%Y-%m-%d %H:%M:%S")}, f)
+    return {
+        "path": out_dir, "format": fmt, "studies": counts[STUDIES], "stops": counts[STOPS],
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+# ---- okuma ----
+def _partition_files(base: str, start_date: Any, end_date: Any) -> List[str]:
+    # klasör adlarından budama: aralık dışındaki aylar listelenmez bile
+    first = str(start_date)[:7] if start_date is not None else None
+    last = str(end_date)[:7] if end_date is not None else None
+    files: List[str] = []
+    if not os.path.isdir(base):
+        return files
+    for month in os.scandir(base):
+        ay = unquote(month.name.partition("=")[2])
+        if ay == _NULL_PARTITION or (first and ay < first) or (last and ay > last):
+            continue
+        files += sorted(f.path for f in os.scandir(month.path) if f.is_file())
+    return files
+
+
+def open_archive(
+    root: str,
+    table: str = STOPS,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+):
+    """Arşiv tablosunu bellek eşlemeli `pyarrow.dataset.Dataset` olarak aç.
+
+    Tarih verilirse yalnız aralıktaki ay klasörlerinin dosyaları veri
+    kümesine girer (satır filtresi yine `archive_filter` ile uygulanır).
+    """
+    pa, ds, pafs = _pa()
+    try:
+        with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+            fmt = json.load(f)["format"]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arşiv bulunamadı: {root}") from None
+    base = os.path.join(root, table)
+    source: Any = base
+    if start_date is not None or end_date is not None:
+        source = _partition_files(base, start_date, end_date)
+    return ds.dataset(
+        source, schema=_schemas(pa)[table], format=FORMATS[fmt],
+        partitioning=ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLUMNS]), flavor="hive"),
+        partition_base_dir=base, filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def archive_filter(
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+):
+    """Tarih aralığı (dahil) / makine / operatör filtresi; None ise filtre yok.
+
+    Tarih koşulu "ay" klasör alanına da yazılır, böylece aralık dışındaki
+    aylar hiç açılmaz.
+    """
+    _, ds, _ = _pa()
+    conds = []
+    if start_date is not None:
+        start = str(start_date)
+        conds += [ds.field("ay") >= start[:7], ds.field("tarih") >= start]
+    if end_date is not None:
+        end = str(end_date)
+        conds += [ds.field("ay") <= end[:7], ds.field("tarih") <= end]
+    if machine is not None:
+        conds.append(ds.field("makine") == machine)
+    if operator is not None:
+        conds.append(ds.field("operator") == operator)
+    expr = None
+    for cond in conds:
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def scan_archive(
+    root: str,
+    table: str = STOPS,
+    columns: Optional[Sequence[str]] = None,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+) -> "pa.Table":
+    """Arşivden yalnız `columns` sütunlarını, filtreye uyan klasörlerden oku."""
+    dataset = open_archive(root, table, start_date, end_date)
+    return dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=archive_filter(start_date, end_date, machine, operator),
+    )
+
+
+def read_archive(root: str, table: str = STOPS, columns: Optional[Sequence[str]] = None, **filters: Any) -> "pd.DataFrame":
+    """`scan_archive` sonucu DataFrame olarak."""
+    return scan_archive(root, table, columns, **filters).to_pandas()
+
+
+def stop_totals(
+    root: str,
+    by: Sequence[str] = ("makine", "Duruş Türü"),
+    **filters: Any,
+) -> "pd.DataFrame":
+    """Duruş süresi toplamı / sayısı; yalnız `by` ve "Süre (sn)" sütunları okunur."""
+    table = scan_archive(root, STOPS, [*by, "Süre (sn)"], **filters)
+    out = table.group_by(list(by)).aggregate([("Süre (sn)", "sum"), ("Süre (sn)", "count")])
+    df = out.to_pandas().rename(columns={"Süre (sn)_sum": "Toplam Süre (sn)", "Süre (sn)_count": "Duruş Sayısı"})
+    return df.sort_values(list(by), ignore_index=True)
+
+
+# ---- içe aktarma ----
+def _partitions(dataset) -> List[Any]:
+    # aynı klasördeki birden çok dosya tek kez okunsun
+    seen: Dict[str, Any] = {}
+    for fragment in dataset.get_fragments():
+        seen.setdefault(str(fragment.partition_expression), fragment.partition_expression)
+    return list(seen.values())
+
+
+def archive_records(root: str, **filters: Any) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Arşivdeki etütleri (ad alanı, anahtar, kanonik kayıt) olarak üret.
+
+    Ay klasörü başına bir okuma yapılır; bellekte aynı anda bir
+    klasörün satırları bulunur.
+    """
+    studies, stops = (open_archive(root, t, filters.get("start_date"), filters.get("end_date")) for t in (STUDIES, STOPS))
+    cond = archive_filter(**filters)
+    for part in _partitions(studies):
+        expr = part if cond is None else part & cond
+        stop_rows: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for s in stops.to_table(filter=expr).sort_by([("namespace", "ascending"), ("key", "ascending"), ("sira", "ascending")]).to_pylist():
+            stop = {"Duruş Türü": s["Duruş Türü"], "Süre (sn)": _restore_number(s["Süre (sn)"]), "Açıklama": s["Açıklama"]}
+            if s[STOP_START] is not None or s[STOP_END] is not None:
+                stop[STOP_START], stop[STOP_END] = s[STOP_START], s[STOP_END]
+            stop_rows.setdefault((s["namespace"], s["key"]), []).append(stop)
+        for row in studies.to_table(filter=expr).to_pylist():
+            ozet = {c: _restore_number(row[c]) for c in SUMMARY_COLUMNS if row[c] is not None}
+            if row["ozet_diger"]:
+                ozet.update(json.loads(row["ozet_diger"]))
+            record = {
+                "surum": RECORD_VERSION,
+                "tarih": row["tarih"] or "",
+                "makine": row["makine"] or "",
+                "operator": row["operator"] or "",
+                "vardiya": row["vardiya"] or "",
+                "baslangic": row["baslangic"] or "",
+                "bitis": row["bitis"] or "",
+                **{f: _restore_number(row[f]) for f in _STUDY_NUMBERS},
+                "duruslar": stop_rows.get((row["namespace"], row["key"]), []),
+                "ozet": ozet,
+            }
+            record["mola"] = record["mola"] or 0
+            yield row["namespace"], row["key"], record
+
+
+def import_archive(
+    root: str,
+    path: str = DEFAULT_PATH,
+    namespace: Optional[str] = None,
+    batch_size: int = 500,
+    **filters: Any,
+) -> Dict[str, int]:
+    """Arşivi depoya yaz (namespace verilirse tüm kayıtlar oraya). Dönen sayılar: read, written."""
+    stats = {"read": 0, "written": 0}
+    batch: List[Tuple[str, str, Dict[str, Any]]] = []
+    with closing(_connect(path)) as conn:
+        for ns, key, record in archive_records(root, **filters):
+            stats["read"] += 1
+            batch.append((ns if namespace is None else namespace, key, record))
+            if len(batch) >= batch_size:
+                stats["written"] += _write_batch(conn, batch)
+                batch.clear()
+        if batch:
+            stats["written"] += _write_batch(conn, batch)
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Etüt deposunu sütunlu arşive yazar ya da arşivden geri yükler.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="depo -> arşiv")
+    exp.add_argument("archive")
+    exp.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    imp = sub.add_parser("import", help="arşiv -> depo")
+    imp.add_argument("archive")
+    imp.add_argument("--namespace", default=None, help="tüm kayıtları bu ad alanına yaz")
+    for p in (exp, imp):
+        p.add_argument("--store", default=DEFAULT_PATH, help="etüt deposu (varsayılan: %(default)s)")
+        p.add_argument("--start", default=None, help="başlangıç tarihi (YYYY-MM-DD, dahil)")
+        p.add_argument("--end", default=None, help="bitiş tarihi (YYYY-MM-DD, dahil)")
+        p.add_argument("--machine", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        s = export_archive(args.archive, args.store, args.format, args.start, args.end, args.machine)
+        print(f"{s['path']}: {s['studies']} etüt, {s['stops']} duruş ({s['format']}), {s['seconds']:.2f} s")
+    else:
+        s = import_archive(args.archive, args.store, args.namespace,
+                           start_date=args.start, end_date=args.end, machine=args.machine)
+        print(f"{args.archive}: okunan {s['read']}  yazılan {s['written']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# path: modules/autosave.py
+"""
+Süren etüdün otomatik kaydı (taslak).
+
+Etüt (başlık alanları + duruşlar) yalnızca tarayıcı oturumunda yaşıyordu;
+sayfa yenilenince ya da sunucu yeniden başlayınca kayboluyordu. `Autosaver`
+her çalışmada durumu gözler (`observe`, O(1)) ve değişiklikleri geciktirerek
+(debounce) depoya yazar: son değişiklikten `delay` saniye sonra, düzenleme
+hiç durmasa da ilk yazılmamış değişiklikten en geç `max_wait` saniye sonra. Yazılan yalnızca son yazımdan bu yana olan farktır:
+değişen başlık alanları, yeni duruşlar (kimlikleri hep arttığı için son
+yazılan kimlikten büyük olanlar) ve silinen duruş kimlikleri, tek bir
+"delta" satırında. Art arda düzenlemeler tek yazımda birleşir; eklenip
+yazılmadan silinen duruş hiç yazılmaz.
+
+Taslak `?taslak=<kimlik>` sorgu parametresiyle tanınır. Sayfa yenilenince
+satırlar sırayla yeniden oynatılır (`replay`) ve oturum duruş kimlikleri
+korunarak kurulur. Satır sayısı `compact_every`'ye ulaşınca tam durum tek
+bir "snapshot" satırı olarak yazılır, öncekiler silinir.
+
+Etüt kaydedilince (`finish_draft`) taslak silinir ve sorgu parametresi
+kalkar; yenileme kaydedilmiş etüdü yarım kalmış gibi geri getirmez. Sahipsiz
+kalan taslaklar (kapatılan sekmeler) `DRAFT_TTL` sonra süreç başına saatte
+en çok bir kez temizlenir.
+
+Streamlit yalnızca `start_autosave` / `autosave_tick` içinde yüklenir.
+"""
+
+import datetime
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.stop_log import StopLog
+from modules.storage import (
+    DEFAULT_PATH, append_draft_op, delete_draft, delete_events, load_draft_ops, prune_drafts,
+)
+
+# etüt formundaki alanların oturum anahtarları ve türleri (layout_v2)
+HEADER_FIELDS = {
+    "etud_operator": "text",
+    "etud_machine": "text",
+    "etud_date": "date",
+    "etud_vardiya": "text",
+    "etud_break_time": "number",
+    "break_start": "time",
+    "etud_start": "time",
+    "etud_end": "time",
+    "etud_end_date": "date",
+    "etud_initial": "number",
+    "etud_final": "number",
+    "etud_unit": "number",
+}
+
+# geri yüklenen başlık: form alanlarının varsayılan değeri olarak okunur
+DEFAULTS_KEY = "etud_defaults"
+QUERY_PARAM = "taslak"
+_STATE = "_autosaver"
+_MISSING = object()
+
+DRAFT_TTL = 7 * 24 * 3600      # bu kadar süre yazılmayan taslak silinir
+_PRUNE_EVERY = 3600
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def _decode(field: str, value: Any) -> Any:
+    kind = HEADER_FIELDS.get(field)
+    if value is None or kind not in ("date", "time"):
+        return value
+    try:
+        return (datetime.date if kind == "date" else datetime.time).fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def replay(rows: List[Tuple[int, str, Any]]) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+    """Taslak satırlarından (başlık, {kimlik: duruş}) durumunu kur."""
+    header: Dict[str, Any] = {}
+    stops: Dict[int, Dict[str, Any]] = {}
+    for _seq, kind, payload in rows:
+        if kind == "snapshot":
+            header, stops = {}, {}
+        header.update(payload.get("header", {}))
+        for stop_id in payload.get("del", ()):
+            stops.pop(stop_id, None)
+        for stop_id, record in payload.get("add", ()):
+            stops[stop_id] = record
+    return {k: _decode(k, v) for k, v in header.items()}, stops
+
+
+class Autosaver:
+    """Bir taslağın gecikmeli, farka dayalı kaydı."""
+
+    def __init__(self, draft: Optional[str] = None, delay: float = 3.0, compact_every: int = 50,
+                 max_wait: float = 30.0):
+        self.draft = draft or uuid.uuid4().hex
+        self.delay = delay
+        self.max_wait = max_wait
+        self.compact_every = compact_every
+        self.writes = 0
+        self.last_flush: Optional[float] = None
+        self._lock = threading.Lock()
+        self._rows = 0                        # son snapshot'tan beri satır
+        self._saved_header: Dict[str, Any] = {}
+        self._saved_ids: set = set()
+        self._saved_next = 0
+        self._saved_log: Optional[int] = None  # yazılan StopLog nesnesinin id()'si
+        self._seen: Optional[Tuple[Any, ...]] = None
+        self._dirty_since: Optional[float] = None   # ilk yazılmamış değişiklik
+        self._last_change: Optional[float] = None
+
+    def observe(self, header: Dict[str, Any], log: StopLog, now: Optional[float] = None) -> bool:
+        """Durumu gözle; son gözlemden beri değiştiyse debounce saatini yeniden kur.
+
+        İlk gözlem yalnızca başlangıç durumunu (boş form) işaretler.
+        """
+        seen = (id(log), log.version, tuple(header.items()))
+        if seen == self._seen:
+            return False
+        first, self._seen = self._seen is None, seen
+        if first:
+            return False
+        now = now or time.time()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        self._last_change = now
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty_since is not None
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Son değişiklikten bu yana `delay` ya da ilk yazılmamış değişiklikten
+        bu yana `max_wait` saniye geçtiyse True."""
+        if self._dirty_since is None:
+            return False
+        now = now or time.time()
+        return now - self._last_change >= self.delay or now - self._dirty_since >= self.max_wait
+
+    def _delta(self, header: Dict[str, Any], log: StopLog) -> Tuple[str, Dict[str, Any]]:
+        full = id(log) != self._saved_log or log.next_id < self._saved_next or self._rows >= self.compact_every
+        if full:
+            return "snapshot", {
+                "header": {k: _encode(v) for k, v in header.items()},
+                "add": [[i, rec] for i, rec in log.items()],
+            }
+        payload: Dict[str, Any] = {}
+        changed = {k: _encode(v) for k, v in header.items() if self._saved_header.get(k, _MISSING) != v}
+        if changed:
+            payload["header"] = changed
+        removed = self._saved_ids.difference(log.ids()) if self._saved_ids else ()
+        if removed:
+            payload["del"] = sorted(removed)
+        added = [[i, rec] for i, rec in log.items(since=self._saved_next)]
+        if added:
+            payload["add"] = added
+        return "delta", payload
+
+    def flush(self, header: Dict[str, Any], log: StopLog, path: str = DEFAULT_PATH) -> bool:
+        """Son yazımdan beri değişenleri tek satır olarak yaz. Yazıldıysa True."""
+        with self._lock:
+            kind, payload = self._delta(header, log)
+            self._dirty_since = self._last_change = None
+            if not payload:
+                return False
+            append_draft_op(self.draft, kind, payload, path)
+            self._rows = 1 if kind == "snapshot" else self._rows + 1
+            self._saved_header = dict(header)
+            self._saved_ids = set(log.ids())
+            self._saved_next = log.next_id
+            self._saved_log = id(log)
+            self.writes += 1
+            self.last_flush = time.time()
+            return True
+
+    @classmethod
+    def restore(cls, draft: str, path: str = DEFAULT_PATH, **kwargs: Any) -> Tuple["Autosaver", Dict[str, Any], StopLog]:
+        """Taslağı depodan geri yükle: (kaydedici, başlık, duruşlar)."""
+        rows = load_draft_ops(draft, path)
+        header, stops = replay(rows)
+        log = StopLog.from_items(sorted(stops.items()))
+        saver = cls(draft, **kwargs)
+        if rows:
+            saver._rows = len(rows)
+            saver._saved_header = dict(header)
+            saver._saved_ids = set(stops)
+            saver._saved_next = log.next_id
+            saver._saved_log = id(log)
+            saver._seen = (id(log), log.version, tuple(header.items()))
+        return saver, header, log
+
+
+def _maybe_prune(path: str) -> None:
+    global _last_prune
+    now = time.time()
+    with _prune_lock:
+        if now - _last_prune < _PRUNE_EVERY:
+            return
+        _last_prune = now
+    prune_drafts(DRAFT_TTL, path)
+
+
+# ---- Streamlit ----
+def start_autosave(path: str = DEFAULT_PATH, delay: float = 3.0) -> Autosaver:
+    """Sayfanın başında: oturumun kaydedicisini döndür; ilk çalışmada taslağı geri yükle."""
+    import streamlit as st
+    saver = st.session_state.get(_STATE)
+    if saver is not None:
+        return saver
+    draft = st.query_params.get(QUERY_PARAM)
+    if draft:
+        saver, header, log = Autosaver.restore(draft, path, delay=delay)
+        if header or log:
+            # form alanları henüz çizilmedi: değerler varsayılan olarak verilir
+            st.session_state[DEFAULTS_KEY] = header
+            st.session_state["error_data"] = log
+    else:
+        saver = Autosaver(delay=delay)
+        st.query_params[QUERY_PARAM] = saver.draft
+        _maybe_prune(path)
+    st.session_state[_STATE] = saver
+    return saver
+
+
+def finish_draft(path: str = DEFAULT_PATH) -> None:
+    """Etüt kaydedildi: taslağı ve canlı kayıt olaylarını sil, sorgu parametresini kaldır.
+
+    Sonraki çalışmada `start_autosave` yeni bir taslak açar; o andaki durum
+    başlangıç kabul edilir, yalnız kayıttan sonraki değişiklikler yazılır.
+    Canlı kayıt da yeni taslağın kimliğiyle yeni bir oturum açar.
+    """
+    import streamlit as st
+    saver = st.session_state.pop(_STATE, None)
+    st.session_state.pop("capture_log", None)
+    if saver is not None:
+        with saver._lock:
+            delete_draft(saver.draft, path)
+            delete_events(saver.draft, path)
+    if QUERY_PARAM in st.query_params:
+        del st.query_params[QUERY_PARAM]
+
+
+def autosave_tick(path: str = DEFAULT_PATH) -> Optional[Autosaver]:
+    """Durumu gözle; debounce süresi dolduysa farkı yaz."""
+    import streamlit as st
+    saver = st.session_state.get(_STATE)
+    log = st.session_state.get("error_data")
+    if saver is None or not isinstance(log, StopLog):
+        return saver
+    header = {k: st.session_state.get(k) for k in HEADER_FIELDS}
+    saver.observe(header, log)
+    if saver.due():
+        saver.flush(header, log, path)
+    return saver
@@ -0,0 +1,174 @@
+# path: modules/batch_summary.py
+"""
+Toplu özet hesabı.
+
+`summary.calculate_summary` tek etüt için çalışır. Buradaki
+`calculate_summaries` aynı hesabı (planlı/plansız toplamlar, kapasite
+kullanımı, planlanan üretim, gerçekleşme oranı) binlerce etüt için birkaç
+vektörel NumPy/pandas işlemiyle yapar. Sonuçlar yuvarlama dahil
+`calculate_summary` ile birebir aynıdır.
+
+Girdiler:
+- studies: her satır bir etüt. Index etüt kimliğidir. Sütunlar:
+  start_time, end_time, produced_beds, unit_time, break_time
+  (ops. tarih). Başlangıç / bitiş saat ya da tam zaman olabilir; bitiş
+  saati başlangıçtan önceyse etüt gece yarısını geçer (`time_window`).
+- stops: uzun tablo, her satır bir duruş. Sütunlar:
+  etud_id, "Duruş Türü" (ya da eski "Hata Türü"), "Süre (sn)"; iki sütun
+  birlikte varsa boş "Duruş Türü" satırda eski addan tamamlanır
+  (`summary_core.canonical_stops` ile aynı kural)
+
+`study_calendar` aynı etütlerin takvim günü ve vardiya dağılımını verir.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.intervals import stop_span, study_intervals
+from modules.summary_core import canonical_stops
+from modules.time_window import day_buckets, shift_overlap, window_bounds, window_seconds_vec
+
+STUDY_ID = "etud_id"
+
+
+def _round(values: np.ndarray, nd: int = 2) -> np.ndarray:
+    """Python'un round(x, nd) sonucuyla birebir aynı vektörel yuvarlama.
+
+    np.round önce 10**nd ile çarptığı için yarım sınırına çok yakın
+    değerlerde Python'dan farklı sonuç verebilir; o (nadir) elemanlar
+    Python round ile yeniden hesaplanır.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.round(values, nd)
+    scaled = values * (10 ** nd)
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        idx = np.flatnonzero(near_half)
+        out[idx] = [round(float(v), nd) for v in values[idx]]
+    return out
+
+
+def calculate_summaries(studies: pd.DataFrame, stops: pd.DataFrame) -> pd.DataFrame:
+    """Tüm etütlerin özetini tek seferde hesapla.
+
+    Dönen tablo `studies` ile aynı index'e ve `calculate_summary` ile aynı
+    sütunlara sahiptir. Etüt süresi geçersiz (<= 0) olan satırlarda
+    "Geçerli" False olur ve metrikler NaN bırakılır.
+    """
+    n = len(studies)
+
+    # ---- etüt süresi (dk); gece yarısını / birkaç günü aşan pencereler dahil ----
+    total_minutes = window_seconds_vec(studies["start_time"], studies["end_time"], studies.get("tarih")) / 60
+    break_time = pd.to_numeric(studies["break_time"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    etud = _round(total_minutes - break_time, 2)
+    valid = etud > 0   # NaN (eksik uç) da geçersiz
+
+    # ---- duruş toplamları (etüt başına, tür başına) ----
+    planned_sec = np.zeros(n)
+    unplanned_sec = np.zeros(n)
+    if stops is not None and not stops.empty:
+        if "Duruş Türü" not in stops.columns:
+            kind = stops["Hata Türü"]
+        elif "Hata Türü" in stops.columns:
+            kind = stops["Duruş Türü"].fillna(stops["Hata Türü"])
+        else:
+            kind = stops["Duruş Türü"]
+        pos = studies.index.get_indexer(stops[STUDY_ID])
+        sec = pd.to_numeric(stops["Süre (sn)"], errors="coerce").fillna(0).to_numpy(dtype=float)
+        kind = kind.to_numpy()
+        known = pos >= 0
+        for target, label in ((planned_sec, "Planlı"), (unplanned_sec, "Plansız")):
+            mask = known & (kind == label)
+            target += np.bincount(pos[mask], weights=sec[mask], minlength=n)
+    total_sec = planned_sec + unplanned_sec
+
+    # ---- KPI'lar (calculate_summary ile aynı işlem sırası) ----
+    unit_time = pd.to_numeric(studies["unit_time"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    produced = pd.to_numeric(studies["produced_beds"], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        planned_available = np.maximum(etud - (planned_sec / 60.0), 0)
+        planned_production = np.where(unit_time > 0, planned_available / unit_time, 0)
+        net_seconds = np.maximum(etud * 60 - total_sec, 0)
+        utilization = np.where(etud > 0, (net_seconds / (etud * 60)) * 100, 0)
+        performance = np.where(planned_production > 0, produced / planned_production * 100, 0)
+
+    out = pd.DataFrame({
+        "Etüt Süresi (dk)": etud,
+        "Toplam Planlı Süre (sn)": _round(planned_sec, 2),
+        "Toplam Plansız Süre (sn)": _round(unplanned_sec, 2),
+        "Toplam Duruş Süresi (sn)": _round(total_sec, 2),
+        "Kapasite Kullanımı (%)": _round(utilization, 2),
+        "Gerçekleşen Üretim (adet)": np.trunc(produced).astype(np.int64),
+        "Planlanan Üretim (adet)": _round(planned_production, 2),
+        "Gerçekleşme Oranı (%)": _round(performance, 2),
+    }, index=studies.index)
+
+    metric_cols = [c for c in out.columns if c != "Gerçekleşen Üretim (adet)"]
+    out.loc[~valid, metric_cols] = np.nan
+    out["Geçerli"] = valid
+    return out
+
+
+def to_batch_frames(
+    sessions: Iterable[Tuple[Tuple[Any, ...], Iterable[Dict[str, Any]]]],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(etud_info, error_data) çiftlerinden `calculate_summaries` girdilerini kur.
+
+    etud_info, uygulamanın kullandığı 10'lu demettir
+    (operator, makine, tarih, vardiya, başlangıç, bitiş, ilk sayım, son sayım,
+    birim süre, mola). Etüt kimliği sıra numarasıdır.
+    """
+    study_rows: List[Tuple[Any, ...]] = []
+    stop_ids: List[int] = []
+    stop_types: List[Any] = []
+    stop_secs: List[Any] = []
+    for i, (etud_info, error_data) in enumerate(sessions):
+        (_op, _mk, etud_date, _vd, start_time, end_time,
+         initial_count, final_count, unit_time, break_time) = etud_info
+        produced = max(0, (final_count or 0) - (initial_count or 0))
+        study_rows.append((etud_date, start_time, end_time, produced, unit_time, break_time))
+        timed = []
+        for err in canonical_stops(error_data) or []:
+            kind = err.get("Duruş Türü", "")
+            span = stop_span(err)
+            if span:
+                timed.append((kind, *span))
+                continue
+            stop_ids.append(i)
+            stop_types.append(kind)
+            stop_secs.append(err.get("Süre (sn)", 0) or 0)
+        if timed:
+            # aralıklı duruşlar çakışmasız toplamlarına indirgenir (compute_summary ile aynı)
+            res = study_intervals(start_time, end_time, timed)
+            for kind, sec in (("Planlı", res["planned_sec"]), ("Plansız", res["unplanned_sec"])):
+                stop_ids.append(i); stop_types.append(kind); stop_secs.append(sec)
+
+    studies = pd.DataFrame(
+        study_rows,
+        columns=["tarih", "start_time", "end_time", "produced_beds", "unit_time", "break_time"],
+    )
+    studies.index.name = STUDY_ID
+    stops = pd.DataFrame({STUDY_ID: stop_ids, "Duruş Türü": stop_types, "Süre (sn)": stop_secs})
+    return studies, stops
+
+
+def study_calendar(studies: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Etüt pencerelerinin (gün, vardiya) dağılımı.
+
+    Dönenler: uzun tablo (etud_id, gun, dakika) — gece yarısını geçen etüt
+    iki güne bölünür — ve etüt başına vardiya dakikaları (sütun: vardiya).
+    Mola düşülmez; yalnız pencere geometrisidir.
+    """
+    start, end = window_bounds(studies["start_time"], studies["end_time"], studies.get("tarih"))
+    days = day_buckets(start, end)
+    days = pd.DataFrame({
+        STUDY_ID: studies.index.to_numpy()[days["study"].to_numpy()],
+        "gun": days["gun"].to_numpy(),
+        "dakika": _round(days["saniye"].to_numpy() / 60, 2),
+    })
+    shifts = shift_overlap(start, end).div(60).round(2)
+    shifts.index = studies.index
+    return days, shifts
@@ -0,0 +1,199 @@
+# path: modules/bulk_reports.py
+"""
+Depodaki tüm etütler için toplu "tek sayfa rapor" üretimi.
+
+    python -m modules.bulk_reports --out excel_raporlar/toplu --workers 8
+    python -m modules.bulk_reports --from 2025-08-01 --to 2025-08-31 --machine "Dizgi - 7"
+
+Raporlar bir süreç havuzunda paralel üretilir (openpyxl biçimlendirmesi CPU
+ağırlıklıdır). Her rapor önce geçici dosyaya yazılıp atomik olarak yerine
+taşınır; bu yüzden yarıda kesilen bir çalıştırma aynı komutla sürdürülebilir:
+zaten var olan raporlar atlanır (--force ile yeniden üretilir). Rapor
+dosyası kaydın son yazılmasından (`updated_at`) eskiyse etüt o arada
+düzenlenmiştir; rapor yeniden üretilir.
+
+Kayıtları süreçler depodan kendileri okur; ana süreç yalnız anahtarları
+tutar ve havuza en fazla `workers * _IN_FLIGHT` iş verir.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from modules.data_manager import _build_pretty_workbook, etud_info_from_record
+from modules.storage import DEFAULT_PATH, SHARED_NAMESPACE, load_study, study_rows
+from modules.summary_core import InvalidStudyError, compute_summary, summary_frame
+
+# süreç başına kuyruktaki iş sayısı
+_IN_FLIGHT = 4
+
+
+def _safe(text: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", text, flags=re.UNICODE).strip("_")
+
+
+def report_file_name(key: str, namespace: str = SHARED_NAMESPACE) -> str:
+    """Kayıt anahtarından dosya sistemi için güvenli rapor adı.
+
+    Aynı anahtar birden çok operatörün ad alanında bulunabilir; ortak ad
+    alanı dışındaki kayıtların adına ad alanı da eklenir. Temizleme farklı
+    anahtarları aynı ada indirebilir ("Hat/1", "Hat 1" -> "Hat_1"); adın
+    sonundaki kısa özet (namespace, key) çiftini ayırt eder.
+    """
+    name = _safe(key) or "etut"
+    if namespace:
+        name = f"{_safe(namespace) or 'ad_alani'}__{name}"
+    digest = hashlib.blake2b(f"{namespace}\0{key}".encode("utf-8"), digest_size=4).hexdigest()
+    return f"etut_raporu_{name}_{digest}.xlsx"
+
+
+def render_report(key: str, record: Any, out_path: str) -> Tuple[str, str]:
+    """Tek kaydın raporunu üret ve atomik olarak yaz. (anahtar, durum) döndürür."""
+    etud_info, error_data = etud_info_from_record(record)
+    (_op, _mk, _dt, _vd, start_time, end_time,
+     initial_count, final_count, unit_time, break_time) = etud_info
+
+    status = "ok"
+    try:
+        produced = max(0, (final_count or 0) - (initial_count or 0))
+        summary_df = summary_frame(compute_summary(
+            error_data, start_time, end_time, produced, unit_time or 0, break_time,
+        ))
+    except (InvalidStudyError, TypeError, ValueError):
+        # eksik/bozuk saat bilgisi: rapor yine yazılır, özet boş kalır
+        summary_df, status = pd.DataFrame(), "özetsiz"
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        _build_pretty_workbook(etud_info, error_data, summary_df).save(tmp_path)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return key, status
+
+
+def _render_stored(store_path: str, namespace: str, key: str, out_path: str) -> Tuple[str, str]:
+    # iş süreci kaydı kendisi okur (ana süreç kayıtları bellekte tutmaz)
+    record = load_study(key, store_path, namespace)
+    if record is None:
+        return key, "silinmiş"
+    return render_report(key, record, out_path)
+
+
+def _is_current(out_path: str, updated_at: float) -> bool:
+    try:
+        return os.path.getmtime(out_path) >= updated_at
+    except OSError:
+        return False
+
+
+def _pending(
+    store_path: str, out_dir: str, force: bool, filters: Dict[str, Any],
+) -> Iterator[Tuple[str, str, str, str]]:
+    for namespace, key, _version, updated_at in study_rows(store_path, **filters):
+        out_path = os.path.join(out_dir, report_file_name(key, namespace))
+        if force or not _is_current(out_path, updated_at):
+            yield store_path, namespace, key, out_path
+
+
+def _progress(done: int, total: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(f"\r[{done}/{total}] %{100 * done / max(total, 1):5.1f}  {rate:6.1f} rapor/sn")
+    sys.stderr.flush()
+
+
+def generate_reports(
+    store_path: str = DEFAULT_PATH,
+    out_dir: str = os.path.join("excel_raporlar", "toplu"),
+    workers: Optional[int] = None,
+    force: bool = False,
+    show_progress: bool = True,
+    **filters: Any,
+) -> Dict[str, Any]:
+    """Filtreye uyan tüm etütlerin raporlarını üret.
+
+    filters: `iter_studies` ile aynı (start_date, end_date, machine, operator).
+    Dönen sözlük: written, without_summary, skipped, failed (liste), seconds.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    total_matching = len(study_rows(store_path, **filters))
+    jobs = list(_pending(store_path, out_dir, force, filters))
+    skipped = total_matching - len(jobs)
+
+    started = time.perf_counter()
+    written, no_summary, failed = 0, 0, []  # type: int, int, List[Tuple[str, str]]
+    limit = (workers or os.cpu_count() or 1) * _IN_FLIGHT
+    queue = iter(jobs)
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures: Dict[Any, str] = {}
+        while True:
+            for job in queue:
+                _store, namespace, key, _out = job
+                futures[pool.submit(_render_stored, *job)] = f"{namespace}/{key}" if namespace else key
+                if len(futures) >= limit:
+                    break
+            if not futures:
+                break
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                key = futures.pop(fut)
+                try:
+                    _key, status = fut.result()
+                    written += status != "silinmiş"
+                    no_summary += status == "özetsiz"
+                except Exception as e:
+                    failed.append((key, repr(e)))
+                done += 1
+                if show_progress:
+                    _progress(done, len(jobs), started)
+    if show_progress and jobs:
+        sys.stderr.write("\n")
+
+    return {
+        "written": written,
+        "without_summary": no_summary,
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Depodaki etütler için toplu tek sayfa Excel raporu üretir.",
+    )
+    parser.add_argument("--store", default=DEFAULT_PATH, help="etüt deposu (varsayılan: %(default)s)")
+    parser.add_argument("--out", default=os.path.join("excel_raporlar", "toplu"), help="çıktı klasörü")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="süreç sayısı")
+    parser.add_argument("--from", dest="start_date", help="başlangıç tarihi (YYYY-MM-DD, dahil)")
+    parser.add_argument("--to", dest="end_date", help="bitiş tarihi (YYYY-MM-DD, dahil)")
+    parser.add_argument("--machine", help="yalnızca bu makine")
+    parser.add_argument("--force", action="store_true", help="var olan raporları da yeniden üret")
+    parser.add_argument("--quiet", action="store_true", help="ilerleme gösterme")
+    args = parser.parse_args(argv)
+
+    filters = {k: v for k, v in (("start_date", args.start_date), ("end_date", args.end_date),
+                                 ("machine", args.machine)) if v}
+    result = generate_reports(
+        args.store, args.out, workers=args.workers, force=args.force,
+        show_progress=not args.quiet, **filters,
+    )
+    print(f"yazılan: {result['written']} (özetsiz: {result['without_summary']})  atlanan: {result['skipped']}  "
+          f"hatalı: {len(result['failed'])}  süre: {result['seconds']} s")
+    for key, err in result["failed"]:
+        print(f"  ! {key}: {err}", file=sys.stderr)
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+# path: modules/charts.py
+"""
+Özet grafiklerinin Streamlit'ten bağımsız hazırlığı.
+
+`chart_series` duruş tablosunu bir kez (tür, açıklama) üzerinden gruplar;
+pasta ve çubuk grafiklerin serileri bu tek sonuçtan türetilir. Açıklaması
+boş kalan duruşlar da "" etiketiyle sayılır.
+
+`pie_png` pastayı PNG baytı olarak çizer. Figür pyplot'un küresel figür
+listesine hiç girmez (`matplotlib.figure.Figure` + Agg tuvali): kapatmayı
+unutmak ya da çizim sırasında hata çıkması sunucuda figür biriktirmez.
+Baytlar girdilerin (etiketler, değerler) özeti üzerinden sınırlı bir LRU
+önbellekte tutulur; aynı duruş dağılımı tekrar çizilmez, bellek en fazla
+`PIE_CACHE_SIZE` görüntü kadar büyür.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pandas / matplotlib ilk grafikte yüklenir
+    import pandas as pd
+
+STOP_KINDS = ("Planlı", "Plansız")
+PIE_CACHE_SIZE = 64
+
+
+def chart_series(
+    stops_df: "pd.DataFrame", kinds: Optional[Sequence[str]] = STOP_KINDS,
+    minutes: bool = True,
+) -> Optional[Tuple["pd.Series", ...]]:
+    """(pasta: tür -> sn, her tür için çubuk: açıklama -> dk ...).
+
+    Varsayılan: (pasta, planlı çubuk, plansız çubuk). kinds=None ise tek
+    çubuk döner: tüm türlerin açıklama başına toplamı. minutes=False ise
+    çubuklar saniye kalır. Girdi `_to_stops_df` biçimindedir; duruş yoksa None.
+    """
+    if stops_df.empty:
+        return None
+    # açıklaması boş (NaN) duruşlar gruplamadan düşmesin
+    desc = stops_df["Açıklama"]
+    if desc.isna().any():
+        if desc.dtype == "category" and "" not in desc.cat.categories:
+            desc = desc.cat.add_categories("")
+        desc = desc.fillna("")
+    grouped = stops_df["Süre (sn)"].groupby([stops_df["Duruş Türü"], desc], observed=True, dropna=False).sum()
+    pie = grouped.groupby(level=0, observed=True, dropna=False).sum()
+    if kinds is None:
+        bars = [grouped.groupby(level=1, observed=True, dropna=False).sum()]
+    else:
+        types = grouped.index.get_level_values(0)
+        bars = [grouped[types == kind].droplevel(0) for kind in kinds]
+    if minutes:
+        bars = [(bar / 60).round(2) for bar in bars]
+    return (pie, *(bar.sort_values(ascending=False) for bar in bars))
+
+
+@lru_cache(maxsize=PIE_CACHE_SIZE)
+def pie_png(labels: Tuple[str, ...], values: Tuple[float, ...]) -> bytes:
+    """Pasta grafiği PNG baytları (etiket / değer demetleriyle önbellekli)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def pie_from_series(pie: "pd.Series") -> bytes:
+    """`chart_series` pastasını çiz."""
+    return pie_png(tuple(map(str, pie.index)), tuple(float(v) for v in pie.tolist()))
+
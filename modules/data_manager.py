@@ -1,21 +1,244 @@
 # path: modules/data_manager.py
+import hashlib
+import json
 import os
-import pandas as pd
+import threading
+from collections import OrderedDict
+from copy import copy
+from io import BytesIO
 from datetime import datetime, date, time
-from typing import Any, Dict, Iterable, Tuple
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from modules.intervals import STOP_END, STOP_START, stop_span
+from modules.perf import instrument
+from modules.storage import DEFAULT_PATH, iter_studies
+from modules.time_window import parse_moment, study_window, window_minutes
+
+if TYPE_CHECKING:  # pandas yalnızca rapor üretilirken yüklenir
+    import pandas as pd
 
 # ---- yardımcı formatlayıcılar ----
 def _fmt_date(d: Any) -> str:
+    if d is None:
+        return ""
     if isinstance(d, (datetime, date)):
         return d.strftime("%Y-%m-%d")
     return str(d)
 
 def _fmt_time(t: Any) -> str:
+    if t is None:
+        return ""
+    if isinstance(t, datetime):
+        # birkaç günlük etüt: tam zaman
+        return t.strftime("%Y-%m-%d %H:%M:%S")
     if isinstance(t, time):
         return t.strftime("%H:%M:%S")
     return str(t)
 
-# ---- 1) Ham tablo export (değişmedi) ----
+RAW_COLUMNS = [
+    "Tarih", "Makine", "Operatör", "Vardiya", "Etüt Başlangıç", "Etüt Bitiş",
+    "Başlangıç Sayısı", "Bitiş Sayısı", "Üretim Süresi (dk)", "Mola (dk)",
+    "Planlanan Üretim", "Gerçekleşen Üretim",
+    "Duruş Türü", "Duruş Açıklaması", "Süre (sn)", "Süre (dk)",
+]
+
+def _raw_rows(
+    etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
+    error_data: Iterable[Dict[str, Any]],
+) -> Iterator[Tuple[Any, ...]]:
+    """Ham tablo satırlarını RAW_COLUMNS sırasında üret (duruş başına bir satır)."""
+    operator, machine, etud_date, vardiya, start_time, end_time, initial_count, final_count, unit_time, break_time = etud_info
+    produced_beds = max(0, (final_count or 0) - (initial_count or 0))
+
+    if study_window(start_time, end_time, etud_date):
+        # gece yarısını / birkaç günü aşan etütler dahil
+        total_minutes = window_minutes(start_time, end_time, etud_date)
+        production_time = round(total_minutes - float(break_time or 0), 2)
+        planned_production = round(production_time / float(unit_time), 2) if float(unit_time or 0) > 0 else 0
+    else:
+        # eski kayıtlarda saat bilgisi olmayabilir
+        production_time, planned_production = "", ""
+
+    head = (
+        _fmt_date(etud_date), machine, operator, vardiya,
+        _fmt_time(start_time), _fmt_time(end_time), initial_count, final_count,
+        production_time, break_time, planned_production, produced_beds,
+    )
+
+    empty = True
+    for err in error_data or []:
+        empty = False
+        durus_turu = err.get("Duruş Türü", "")
+        aciklama = err.get("Açıklama", "")
+        sure_sn = err.get("Süre (sn)", 0) or 0
+        yield head + (durus_turu, aciklama, sure_sn, round(float(sure_sn) / 60, 2))
+    if empty:
+        # duruş yoksa tek özet satırı yaz
+        yield head + ("", "", "", "")
+
+
+# ---- kayıt <-> etüt bilgisi ----
+# depodaki kayıt biçiminin sürümü; eski biçimler `modules.migrate` ile bu
+# biçime çevrilir. Bu sürümdeki kayıtlar alan adı denemeden okunur.
+RECORD_VERSION = 2
+
+
+def study_record(
+    etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
+    error_data: Iterable[Dict[str, Any]],
+    summary: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Oturumdaki etüdü depoya yazılacak (JSON uyumlu) kayda çevir.
+
+    Duruşlar kanonik adlarla ("Duruş Türü", "Süre (sn)", "Açıklama") gelir
+    (`StopLog` ve `etud_info_from_record` çıktısı).
+    """
+    operator, machine, etud_date, vardiya, start_time, end_time, initial_count, final_count, unit_time, break_time = etud_info
+    return {
+        "surum": RECORD_VERSION,
+        "tarih": _fmt_date(etud_date),
+        "makine": machine,
+        "operator": operator,
+        "vardiya": vardiya,
+        "baslangic": _fmt_time(start_time),
+        "bitis": _fmt_time(end_time),
+        "ilk_sayim": initial_count,
+        "son_sayim": final_count,
+        "birim_sure": unit_time,
+        "mola": break_time,
+        "duruslar": [
+            {
+                "Duruş Türü": e.get("Duruş Türü", ""),
+                "Süre (sn)": e.get("Süre (sn)", 0) or 0,
+                "Açıklama": e.get("Açıklama", ""),
+                **({STOP_START: span[0], STOP_END: span[1]} if span else {}),
+            }
+            for e in (error_data or [])
+            for span in (stop_span(e),)
+        ],
+        "ozet": dict(summary or {}),
+    }
+
+def _parse_time(t: Any) -> Any:
+    # "SS:DD:ss" -> time, "YYYY-AA-GG SS:DD:ss" -> datetime; çözülemeyen metin aynen kalır
+    if isinstance(t, str) and t:
+        return parse_moment(t) or t
+    return t
+
+def etud_info_from_record(record: Any) -> Tuple[Tuple[Any, ...], list]:
+    """Depodaki kayıttan (etud_info, error_data) çiftini geri kur.
+
+    Eski şemalar da okunur: "hatalar" + "Hata Adı"/"Hata Türü" kayıtları,
+    "etud_info"/"errors" kayıtları ve liste halindeki özet kayıtları.
+    Bulunamayan alanlar None olur.
+    """
+    if isinstance(record, dict) and record.get("surum") == RECORD_VERSION:
+        return _etud_info_v2(record)
+    if isinstance(record, list):
+        record = record[0] if record and isinstance(record[0], dict) else {}
+    if not isinstance(record, dict):
+        record = {}
+    info = record.get("etud_info") if isinstance(record.get("etud_info"), dict) else record
+
+    def pick(*names):
+        for n in names:
+            if info.get(n) is not None:
+                return info[n]
+        return None
+
+    etud_info = (
+        pick("operator"),
+        pick("makine", "machine"),
+        pick("tarih", "etud_date"),
+        pick("vardiya"),
+        _parse_time(pick("baslangic", "start_time")),
+        _parse_time(pick("bitis", "end_time")),
+        pick("ilk_sayim", "initial_count"),
+        pick("son_sayim", "final_count"),
+        pick("birim_sure", "unit_time"),
+        pick("mola", "break_time") or 0,
+    )
+
+    error_data = []
+    for e in record.get("duruslar") or record.get("hatalar") or record.get("errors") or []:
+        stop = {
+            "Duruş Türü": e.get("Duruş Türü", e.get("Hata Türü", e.get("type", ""))),
+            "Süre (sn)": e.get("Süre (sn)", e.get("duration", 0)) or 0,
+            "Açıklama": e.get("Açıklama", e.get("Hata Adı", e.get("name", ""))),
+        }
+        span = stop_span(e)
+        if span:
+            stop[STOP_START], stop[STOP_END] = span
+        error_data.append(stop)
+    return etud_info, error_data
+
+
+def _etud_info_v2(record: Dict[str, Any]) -> Tuple[Tuple[Any, ...], list]:
+    # kanonik kayıt: alanlar sabit, duruşlar zaten kanonik adlı
+    etud_info = (
+        record["operator"], record["makine"], record["tarih"], record["vardiya"],
+        _parse_time(record["baslangic"]) or None, _parse_time(record["bitis"]) or None,
+        record["ilk_sayim"], record["son_sayim"], record["birim_sure"], record["mola"] or 0,
+    )
+    return etud_info, list(record["duruslar"])
+
+
+# ---- rapor baytları için içerik önbelleği ----
+_REPORT_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_REPORT_CACHE_SIZE = 32
+_REPORT_LOCK = threading.Lock()
+
+def _content_key(kind: str, *parts: Any) -> str:
+    raw = json.dumps([kind, *parts], ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def report_content_key(kind: str, etud_info: Any, error_data: Iterable[Dict[str, Any]], summary_df: Any = None) -> str:
+    """Rapor baytlarının içerik anahtarı ("raw" / "pretty"); ekrandaki etüt değişince değişir."""
+    parts = [etud_info, list(error_data or [])]
+    if kind == "pretty":
+        parts.append(summary_df.iloc[0].to_dict() if _has_rows(summary_df) else {})
+    return _content_key(kind, *parts)
+
+def _cached_bytes(key: str, build) -> bytes:
+    """Aynı içerik için raporu bir kez üret; sonraki çağrılar önbellekten döner."""
+    with _REPORT_LOCK:
+        data = _REPORT_CACHE.get(key)
+        if data is not None:
+            _REPORT_CACHE.move_to_end(key)
+            return data
+    data = build()
+    with _REPORT_LOCK:
+        _REPORT_CACHE[key] = data
+        if len(_REPORT_CACHE) > _REPORT_CACHE_SIZE:
+            _REPORT_CACHE.popitem(last=False)
+    return data
+
+def _write_bytes(data: bytes, out_path: str) -> str:
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(data)
+    return out_path
+
+
+# ---- 1) Ham tablo export ----
+@instrument
+def raw_report_bytes(
+    etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
+    error_data: Iterable[Dict[str, Any]],
+) -> bytes:
+    """Ham tablo çıktısını bellekte (BytesIO) üretip .xlsx baytlarını döndür."""
+    error_data = list(error_data or [])
+
+    def build() -> bytes:
+        import pandas as pd
+        buf = BytesIO()
+        pd.DataFrame(list(_raw_rows(etud_info, error_data)), columns=RAW_COLUMNS).to_excel(buf, index=False)
+        return buf.getvalue()
+
+    return _cached_bytes(report_content_key("raw", etud_info, error_data), build)
+
+@instrument
 def export_current_session_to_excel(
     etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
     error_data: Iterable[Dict[str, Any]],
@@ -23,88 +246,162 @@ def export_current_session_to_excel(
 ) -> str:
     """
     Hızlı ham tablo çıktısı (satır bazlı). 'Duruş' isimleriyle uyumludur.
+    Dosyayı export_dir altına yazar; yalnızca bayt gerekiyorsa raw_report_bytes.
     """
-    os.makedirs(export_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_path = os.path.join(export_dir, f"etut_raporu_{timestamp}.xlsx")
+    return _write_bytes(raw_report_bytes(etud_info, error_data), file_path)
 
-    # unpack
-    operator, machine, etud_date, vardiya, start_time, end_time, initial_count, final_count, unit_time, break_time = etud_info
-    produced_beds = max(0, (final_count or 0) - (initial_count or 0))
 
-    total_minutes = (
-        datetime.combine(date.today(), end_time)
-        - datetime.combine(date.today(), start_time)
-    ).total_seconds() / 60
-    production_time = round(total_minutes - float(break_time or 0), 2)
-    planned_production = round(production_time / float(unit_time), 2) if float(unit_time) > 0 else 0
+# ---- 1b) Çok etütlü ham tablo export (akış halinde) ----
+@instrument
+def export_studies_to_excel(
+    out_path: str,
+    store_path: str = DEFAULT_PATH,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Depodaki etütleri (tarih aralığı / makine filtresiyle) ham tablo olarak yaz.
+    Satırlar depodan tek tek okunup openpyxl write-only moduyla diske akıtılır;
+    bellek kullanımı satır sayısından bağımsızdır.
+    Dönen sözlük: path, studies, rows, seconds, rows_per_sec.
+    """
+    try:
+        from openpyxl import Workbook
+    except Exception as e:
+        raise ImportError("openpyxl gerekli: pip install openpyxl") from e
 
-    rows = []
-    error_data = list(error_data or [])
+    t0 = perf_counter()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(RAW_COLUMNS)
 
-    if error_data:
-        for err in error_data:
-            # geri uyum: "Hata Türü" varsa onu kullan
-            durus_turu = err.get("Duruş Türü", err.get("Hata Türü", ""))
-            aciklama = err.get("Açıklama", "")
-            sure_sn = err.get("Süre (sn)", 0) or 0
-            rows.append({
-                "Tarih": _fmt_date(etud_date),
-                "Makine": machine,
-                "Operatör": operator,
-                "Vardiya": vardiya,
-                "Etüt Başlangıç": _fmt_time(start_time),
-                "Etüt Bitiş": _fmt_time(end_time),
-                "Başlangıç Sayısı": initial_count,
-                "Bitiş Sayısı": final_count,
-                "Üretim Süresi (dk)": production_time,
-                "Mola (dk)": break_time,
-                "Planlanan Üretim": planned_production,
-                "Gerçekleşen Üretim": produced_beds,
-                "Duruş Türü": durus_turu,
-                "Duruş Açıklaması": aciklama,
-                "Süre (sn)": sure_sn,
-                "Süre (dk)": round(float(sure_sn) / 60, 2),
-            })
-    else:
-        # duruş yoksa tek özet satırı yaz
-        rows.append({
-            "Tarih": _fmt_date(etud_date),
-            "Makine": machine,
-            "Operatör": operator,
-            "Vardiya": vardiya,
-            "Etüt Başlangıç": _fmt_time(start_time),
-            "Etüt Bitiş": _fmt_time(end_time),
-            "Başlangıç Sayısı": initial_count,
-            "Bitiş Sayısı": final_count,
-            "Üretim Süresi (dk)": production_time,
-            "Mola (dk)": break_time,
-            "Planlanan Üretim": planned_production,
-            "Gerçekleşen Üretim": produced_beds,
-            "Duruş Türü": "",
-            "Duruş Açıklaması": "",
-            "Süre (sn)": "",
-            "Süre (dk)": "",
-        })
+    n_studies = n_rows = 0
+    for _key, record in iter_studies(store_path, start_date=start_date, end_date=end_date, machine=machine):
+        etud_info, error_data = etud_info_from_record(record)
+        n_studies += 1
+        for row in _raw_rows(etud_info, error_data):
+            ws.append(row)
+            n_rows += 1
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    wb.save(out_path)
+    seconds = perf_counter() - t0
+    return {
+        "path": out_path,
+        "studies": n_studies,
+        "rows": n_rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(n_rows / seconds, 1) if seconds > 0 else 0.0,
+    }
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_path = os.path.join(export_dir, f"etut_raporu_{timestamp}.xlsx")
-    pd.DataFrame(rows).to_excel(file_path, index=False)
-    return file_path
+
+def _has_rows(summary_df: Any) -> bool:
+    # pandas'ı yalnızca bunun için yüklememek adına ördek tipleme
+    return hasattr(summary_df, "iloc") and not summary_df.empty
 
 
 # ---- 2) Tek sayfa “rapor görünümü” export (Planlı / Plansız ayrı tablolar) ----
+@instrument
+def pretty_report_bytes(
+    etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
+    error_data: Iterable[Dict[str, Any]],
+    summary_df: "pd.DataFrame",
+) -> bytes:
+    """Tek sayfa raporu bellekte üretip .xlsx baytlarını döndür (içerik önbellekli)."""
+    error_data = list(error_data or [])
+
+    def build() -> bytes:
+        buf = BytesIO()
+        _build_pretty_workbook(etud_info, error_data, summary_df).save(buf)
+        return buf.getvalue()
+
+    return _cached_bytes(report_content_key("pretty", etud_info, error_data, summary_df), build)
+
+@instrument
 def export_pretty_report(
     etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
     error_data: Iterable[Dict[str, Any]],
-    summary_df: pd.DataFrame,
+    summary_df: "pd.DataFrame",
     out_path: str,
 ) -> str:
     """
     Tek sayfa şık rapor (openpyxl ile).
     Planlı ve Plansız duruşlar iki AYRI tablo olarak yazılır.
+    Dosyayı out_path'e yazar; yalnızca bayt gerekiyorsa pretty_report_bytes.
+    """
+    return _write_bytes(pretty_report_bytes(etud_info, error_data, summary_df), out_path)
+
+# ---- rapor sayfası yazıcısı (paylaşılan stiller + toplu satır yazımı) ----
+def _report_named_styles():
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.styles.borders import DEFAULT_BORDER
+    from openpyxl.styles.fills import DEFAULT_EMPTY_FILL
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    def style(name, font=DEFAULT_FONT, fill=DEFAULT_EMPTY_FILL, border=DEFAULT_BORDER, alignment=None):
+        # belirtilmeyen öğeler hücre varsayılanında kalsın (NamedStyle boş nesne koyar)
+        return NamedStyle(name, font=copy(font), fill=copy(fill), border=copy(border), alignment=alignment)
+
+    center = Alignment(horizontal="center", vertical="center")
+    left = Alignment(horizontal="left", vertical="center")
+    thin = Side(border_style="thin", color="888888")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        style("etut_baslik", font=Font(size=14, bold=True), alignment=center),
+        style("etut_bolum", font=Font(size=12, bold=True), alignment=left),
+        style("etut_etiket", font=Font(bold=True), alignment=left),
+        style("etut_deger", alignment=left),
+        style("etut_kalin", font=Font(bold=True)),
+        style("etut_tablo_baslik", font=Font(bold=True), fill=PatternFill("solid", fgColor="DDDDDD"),
+              alignment=center, border=border),
+        style("etut_tablo_hucre", border=border),
+    ]
+
+class _SheetWriter:
+    """
+    Adlandırılmış stiller çalışma kitabına bir kez eklenir; hücrelere
+    font/fill/border/alignment tek tek atanmak yerine stil adı verilir
+    (`cell.style = ad`, openpyxl'in genel API'si). Satırlar toplu yazılır.
     """
+
+    def __init__(self, ws):
+        self.ws = ws
+        for style in _report_named_styles():
+            if style.name not in ws.parent.named_styles:
+                ws.parent.add_named_style(style)
+
+    def write_rows(self, start_row: int, rows: Iterable[Iterable[Any]], styles: Iterable[Optional[str]]) -> int:
+        """Satırları start_row'dan itibaren yaz; styles sütun başına stil adıdır
+        (None = stilsiz). Stilsiz None değerler hiç yazılmaz. Sonraki satırı döndürür."""
+        ws = self.ws
+        names = list(styles)
+        r = start_row
+        for values in rows:
+            for c, (val, name) in enumerate(zip(values, names), start=1):
+                if name is None:
+                    if val is not None:
+                        ws.cell(row=r, column=c, value=val)
+                    continue
+                ws.cell(row=r, column=c, value=val).style = name
+            r += 1
+        return r
+
+    def title(self, row: int, text: str, style: str, end_column: int = 7) -> None:
+        """Birleştirilmiş başlık satırı."""
+        self.ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=end_column)
+        self.write_rows(row, [(text,)], [style])
+
+def _build_pretty_workbook(
+    etud_info: Tuple[str, str, Any, str, time, time, int, int, float, float],
+    error_data: Iterable[Dict[str, Any]],
+    summary_df: "pd.DataFrame",
+):
+    """Tek sayfa raporun openpyxl Workbook nesnesini kur."""
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
         from openpyxl.utils import get_column_letter
     except Exception as e:
         raise ImportError("openpyxl gerekli: pip install openpyxl") from e
@@ -113,7 +410,7 @@ def export_pretty_report(
     operator, machine, etud_date, vardiya, start_time, end_time, initial_count, final_count, unit_time, break_time = etud_info
 
     # summary alanları
-    s = summary_df.iloc[0].to_dict() if isinstance(summary_df, pd.DataFrame) and not summary_df.empty else {}
+    s = summary_df.iloc[0].to_dict() if _has_rows(summary_df) else {}
     etud_minutes    = s.get("Etüt Süresi (dk)")
     planned_sec     = s.get("Toplam Planlı Süre (sn)") or 0
     unplanned_sec   = s.get("Toplam Plansız Süre (sn)") or 0
@@ -134,24 +431,14 @@ def export_pretty_report(
     wb = Workbook()
     ws = wb.active
     ws.title = "Etüt Raporu"
+    out = _SheetWriter(ws)
 
     # sütun genişlikleri
     for i, w in enumerate([22, 18, 22, 18, 24, 18, 18], start=1):
         ws.column_dimensions[get_column_letter(i)].width = w
 
-    # stiller
-    bold = Font(bold=True)
-    center = Alignment(horizontal="center", vertical="center")
-    left = Alignment(horizontal="left", vertical="center")
-    header_fill = PatternFill("solid", fgColor="DDDDDD")
-    thin = Side(border_style="thin", color="888888")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
     # başlık
-    ws.merge_cells("A1:G1")
-    ws["A1"] = "Zaman Etüdü Raporu"
-    ws["A1"].font = Font(size=14, bold=True)
-    ws["A1"].alignment = center
+    out.title(1, "Zaman Etüdü Raporu", "etut_baslik")
 
     # bilgi bloğu
     rows_info = [
@@ -161,20 +448,14 @@ def export_pretty_report(
         ("Bir Yatak Süresi (dk)", _num(unit_time, 2), "", "", "", "", ""),
     ]
     start_row = 3
-    for r, row in enumerate(rows_info, start=start_row):
-        for c, val in enumerate(row, start=1):
-            cell = ws.cell(row=r, column=c, value=val)
-            cell.alignment = left
-        for c in (1, 3, 5):
-            ws.cell(row=r, column=c).font = bold
+    info_styles = ["etut_etiket", "etut_deger"] * 3 + ["etut_deger"]
+    out.write_rows(start_row, rows_info, info_styles)
 
     # özet başlığı
     sum_header_row = start_row + len(rows_info) + 1
-    ws.merge_cells(start_row=sum_header_row, start_column=1, end_row=sum_header_row, end_column=7)
-    ws.cell(row=sum_header_row, column=1, value="Özet Göstergeler").font = Font(size=12, bold=True)
-    ws.cell(row=sum_header_row, column=1).alignment = left
+    out.title(sum_header_row, "Özet Göstergeler", "etut_bolum")
 
-    # metrikler
+    # metrikler (2 sütun çifti x 4 satır)
     metrics = [
         ("Etüt Süresi (dk)", _num(etud_minutes,2)),
         ("Toplam Planlı Süre (dk)", _num(planned_sec/60,2)),
@@ -186,49 +467,30 @@ def export_pretty_report(
         ("Gerçekleşme Oranı (%)", _num(performance_pct,2)),
     ]
     mrow = sum_header_row + 1
-    idx = 0
-    for rr in range(4):
-        ws.cell(row=mrow+rr, column=1, value=metrics[idx][0]).font = bold
-        ws.cell(row=mrow+rr, column=2, value=metrics[idx][1]); idx += 1
-        ws.cell(row=mrow+rr, column=4, value=metrics[idx][0]).font = bold
-        ws.cell(row=mrow+rr, column=5, value=metrics[idx][1]); idx += 1
-
-    # ---- YENİ: İki ayrı tablo yazıcı ----
+    metric_rows = [metrics[i] + (None,) + metrics[i + 1] for i in range(0, len(metrics), 2)]
+    out.write_rows(mrow, metric_rows, ["etut_kalin", None, None, "etut_kalin", None])
+
+    # ---- İki ayrı tablo yazıcı ----
     def write_stops_table(start_r: int, title: str, records: list) -> int:
         """Başlık + tablo (Açıklama, Süre sn/dk). Bitişten sonraki satırı döndürür."""
-        # başlık
-        ws.merge_cells(start_row=start_r, start_column=1, end_row=start_r, end_column=7)
-        ws.cell(row=start_r, column=1, value=title).font = Font(size=12, bold=True)
-        ws.cell(row=start_r, column=1).alignment = left
-
-        # header
-        hdrs = ["Açıklama", "Süre (sn)", "Süre (dk)"]
-        for c, h in enumerate(hdrs, start=1):
-            cell = ws.cell(row=start_r+1, column=c, value=h)
-            cell.font = bold; cell.fill = header_fill; cell.alignment = center; cell.border = border
-
-        # rows
-        r0 = start_r + 2
+        out.title(start_r, title, "etut_bolum")
+        out.write_rows(start_r + 1, [("Açıklama", "Süre (sn)", "Süre (dk)")], ["etut_tablo_baslik"] * 3)
+
         if records:
-            for i, e in enumerate(records):
-                row_idx = r0 + i
+            rows = []
+            for e in records:
                 sec = float(e.get("Süre (sn)", 0) or 0)
-                ws.cell(row=row_idx, column=1, value=e.get("Açıklama","")).border = border
-                ws.cell(row=row_idx, column=2, value=sec).border = border
-                ws.cell(row=row_idx, column=3, value=round(sec/60,2)).border = border
-            end_row = r0 + len(records)
+                rows.append((e.get("Açıklama",""), sec, round(sec/60,2)))
         else:
-            ws.cell(row=r0, column=1, value="Veri yok").border = border
-            ws.cell(row=r0, column=2, value="").border = border
-            ws.cell(row=r0, column=3, value="").border = border
-            end_row = r0 + 1
+            rows = [("Veri yok", "", "")]
+        end_row = out.write_rows(start_r + 2, rows, ["etut_tablo_hucre"] * 3)
 
         return end_row + 1  # bir satır boşluk
 
-    # kayıtları ayır (geri uyumlu)
+    # kayıtları ayır
     error_data = list(error_data or [])
-    planned_records = [e for e in error_data if (e.get("Duruş Türü", e.get("Hata Türü","")) == "Planlı")]
-    unplanned_records = [e for e in error_data if (e.get("Duruş Türü", e.get("Hata Türü","")) == "Plansız")]
+    planned_records = [e for e in error_data if e.get("Duruş Türü") == "Planlı"]
+    unplanned_records = [e for e in error_data if e.get("Duruş Türü") == "Plansız"]
 
     # planlı tablo
     cur = mrow + 6
@@ -240,6 +502,4 @@ def export_pretty_report(
     # dondurma (ilk tablonun veri başlangıcına yakın)
     ws.freeze_panes = ws[f"A{mrow+8}"]
 
-    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
-    wb.save(out_path)
-    return out_path
+    return wb
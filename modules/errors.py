@@ -1,9 +1,33 @@
 # path: modules/errors.py
 import streamlit as st
 
+import datetime
+import sqlite3
+
+from modules.intervals import STOP_END, STOP_START, clock_text, span_seconds
+from modules.autosave import QUERY_PARAM
+from modules.live_capture import EventLog
+from modules.live_oee import HUB
+from modules.stop_log import STOP_TYPES, StopLog
+from modules.storage import DEFAULT_PATH, draft_updated_at
+
+def _oee_line():
+    # canlı OEE hattı (makine, vardiya): ana sayfa `track_study` ile belirler;
+    # makine girilmemişse ya da açık etüt hattın güncel penceresi değilse None
+    return st.session_state.get("oee_line")
+
+
+def _publish_event(event):
+    # canlı kayıt olayı -> canlı OEE (düğme geri çağrısından çağrılır)
+    line = _oee_line()
+    if line:
+        HUB.apply_events(line, [event])
+
+
 def render_error_inputs():
-    if "error_data" not in st.session_state:
-        st.session_state["error_data"] = []
+    # eski oturumlarda liste olarak kalmış olabilir
+    if not isinstance(st.session_state.get("error_data"), StopLog):
+        st.session_state["error_data"] = StopLog.from_records(st.session_state.get("error_data") or [])
 
     st.markdown("### ➕ Yeni Duruş Ekle")
 
@@ -14,14 +38,36 @@ def render_error_inputs():
         sure = st.number_input("Süre (saniye)", min_value=0, key="duration_input")
     with col3:
         aciklama = st.text_input("Duruş Açıklaması", key="desc_input")
+
+    # opsiyonel: saat aralığı girilirse süre aralıktan hesaplanır ve
+    # çakışan duruşlar özette bir kez sayılır
+    col5, col6, _ = st.columns([1, 1, 2])
+    with col5:
+        bas = st.time_input("Duruş Başlangıcı (ops.)", value=None, step=60, key="stop_start_input")
+    with col6:
+        bit = st.time_input("Duruş Bitişi (ops.)", value=None, step=60, key="stop_end_input")
+
     with col4:
         if st.button("Duruş Ekle"):
-            if durus_turu and sure >= 0 and aciklama:
-                st.session_state["error_data"].append({
-                    "Duruş Türü": durus_turu,   # <- yeni ad
-                    "Süre (sn)": sure,
-                    "Açıklama": aciklama
-                })
+            kayit = {
+                "Duruş Türü": durus_turu,   # <- yeni ad
+                "Süre (sn)": sure,
+                "Açıklama": aciklama
+            }
+            # bitiş başlangıçtan önceyse gece yarısı geçilmiştir (en fazla 12 saat)
+            span = span_seconds(bas, bit) if bas is not None and bit is not None else None
+            if (bas is None) != (bit is None) or (bas is not None and span is None):
+                st.error("Duruş aralığı için başlangıç ve bitiş birlikte girilmeli; bitiş başlangıçtan sonra olmalıdır.")
+            elif durus_turu and sure >= 0 and aciklama:
+                if bas is not None:
+                    kayit["Süre (sn)"] = int(span)
+                    kayit[STOP_START], kayit[STOP_END] = clock_text(bas), clock_text(bit)
+                stop_id = st.session_state["error_data"].append(kayit)
+                # elle girilen duruş canlı OEE'ye süre olarak eklenir; silinince geri alınır
+                line = _oee_line()
+                if line:
+                    HUB.add_stop(line, durus_turu, kayit["Süre (sn)"])
+                    st.session_state.setdefault("oee_stops", {})[stop_id] = (line, durus_turu, kayit["Süre (sn)"])
                 st.success("Duruş eklendi.")
                 st.rerun()
             else:
@@ -29,13 +75,86 @@ def render_error_inputs():
 
     if st.session_state["error_data"]:
         st.markdown("### 📋 Duruş Kayıtları")
-        for i, row in enumerate(st.session_state["error_data"]):
-            # geriye dönük uyumluluk: eski "Hata Türü" ismi varsa oku
-            tur = row.get("Duruş Türü", row.get("Hata Türü", "—"))
+        for stop_id, row in st.session_state["error_data"].items():
+            tur = row["Duruş Türü"]   # StopLog eski "Hata Türü" adını eklerken çevirir
             col1, col2, col3, col4 = st.columns([2, 2, 4, 1])
             col1.write(f"Tür: {tur}")
-            col2.write(f"Süre: {row.get('Süre (sn)',0)} sn")
+            aralik = f" ({row[STOP_START][:5]}–{row[STOP_END][:5]})" if row.get(STOP_START) and row.get(STOP_END) else ""
+            col2.write(f"Süre: {row.get('Süre (sn)',0)} sn{aralik}")
             col3.write(f"Açıklama: {row.get('Açıklama','—')}")
-            if col4.button("❌", key=f"delete_{i}"):
-                st.session_state["error_data"].pop(i)
+            if col4.button("❌", key=f"delete_{stop_id}"):
+                st.session_state["error_data"].delete(stop_id)
+                published = st.session_state.get("oee_stops", {}).pop(stop_id, None)
+                if published:
+                    HUB.add_stop(published[0], published[1], -published[2])
                 st.rerun()
+
+
+def _live_stop(tur):
+    kayit = st.session_state["capture_log"].stop(tur, st.session_state.get("live_desc") or "Canlı kayıt")
+    if kayit:
+        st.session_state["error_data"].append(kayit)
+
+
+def _flush_events(log, path, force=False):
+    if force or log.due():
+        try:
+            log.flush(path)
+        except sqlite3.OperationalError:
+            # depo meşgul/kilitli: olaylar tamponda kalır, sonraki çalışmada yeniden denenir
+            st.caption(f"⚠️ {log.pending} olay henüz kaydedilemedi, yeniden denenecek.")
+
+
+def flush_live_capture(path=DEFAULT_PATH):
+    """Bekleyen canlı kayıt olaylarını yaz (sayfanın zamanlayıcılı bölümünden).
+
+    Düğmeye basılmasa da son olaylar birkaç saniye içinde depoya iner.
+    """
+    log = st.session_state.get("capture_log")
+    if log is not None and log.pending:
+        _flush_events(log, path, force=True)
+
+
+def _capture_log(path):
+    # oturum kimliği taslak kimliğidir (?taslak=): sayfa yenilenince açık
+    # duruşlar ve taslağın son yazımından sonra biten duruşlar olaylardan
+    # geri gelir (daha önce bitip taslakta silinmiş olanlar geri gelmez)
+    draft = st.query_params.get(QUERY_PARAM)
+    if not draft:
+        log = EventLog()
+    else:
+        log, stops = EventLog.restore(draft, path, since=draft_updated_at(draft, path) or 0.0)
+        error_data = st.session_state["error_data"]
+        seen = {(r["Duruş Türü"], r.get(STOP_START), r.get(STOP_END)) for _i, r in error_data.items()}
+        for kayit in stops:
+            if (kayit["Duruş Türü"], kayit[STOP_START], kayit[STOP_END]) not in seen:
+                error_data.append(kayit)
+    log.listeners.append(_publish_event)
+    return log
+
+
+@st.fragment
+def render_live_capture(path=DEFAULT_PATH):
+    """Kronometre düğmeleri; yalnızca bu bölüm yeniden çalışır (tüm sayfa değil)."""
+    if "capture_log" not in st.session_state:
+        st.session_state["capture_log"] = _capture_log(path)
+    log = st.session_state["capture_log"]
+
+    st.markdown("### ⏱️ Canlı Duruş Kaydı")
+    st.text_input("Duruş Açıklaması", key="live_desc")
+
+    acik = log.open_stops()
+    for col, tur in zip(st.columns(len(STOP_TYPES)), STOP_TYPES):
+        with col:
+            if tur in acik:
+                bas = datetime.datetime.fromtimestamp(acik[tur])
+                st.caption(f"🔴 {tur} duruş sürüyor (başlangıç {bas:%H:%M:%S})")
+                st.button(f"⏹ {tur} Bitir", key=f"live_stop_{tur}", on_click=_live_stop, args=(tur,))
+            else:
+                st.button(f"▶ {tur} Başlat", key=f"live_start_{tur}", on_click=log.start, args=(tur,))
+
+    if st.button("📊 Özeti Güncelle", key="live_refresh"):
+        _flush_events(log, path, force=True)
+        st.rerun()
+    _flush_events(log, path)
+    st.caption(f"Kaydedilen olay: {log.flushed} · bekleyen: {log.pending}")
@@ -0,0 +1,581 @@
+# path: modules/ingest_service.py
+"""
+Arayüzsüz (headless) veri alma / sorgu servisi.
+
+    python -m modules.ingest_service --port 8080 --store veri_kaydi.json
+
+Hat PLC'leri ve MES, Streamlit arayüzüne girmeden duruş olaylarını, üretim
+sayımlarını ve etütleri HTTP ile gönderir. Servis aiohttp üzerinde çalışır
+(tek olay döngüsü, çok sayıda eşzamanlı bağlantı) ve uygulamanın
+modüllerini aynen kullanır: kayıtlar `storage`'a yazılır, özet
+`batch_summary` ile hesaplanır, Excel çıktıları `data_manager`'dan gelir.
+
+Uç noktalar (gövdeler JSON):
+
+    GET  /health
+    POST /v1/events/{oturum}     {"events": [{"seq", "ts", "olay", "tur", "aciklama"}, ...]}
+    GET  /v1/events/{oturum}/stops
+    POST /v1/studies             {"studies": [{"record", "namespace", "key"?, "expected_version"?}, ...]}
+    POST /v1/counts              {"counts": [{"key", "namespace", "son_sayim", "hatali"?}, ...]}
+    POST /v1/summary             {"studies": [kayıt, ...]}      (depoya yazmaz)
+    GET  /v1/studies?start=&end=&machine=&operator=&namespace=&limit=
+    GET  /v1/studies/{anahtar}?namespace=
+    GET  /v1/studies/{anahtar}/report?namespace=&kind=raw|pretty
+    GET  /v1/export?start=&end=&machine=
+    GET  /v1/oee                 hatların canlı OEE değerleri
+    GET  /v1/oee/stream          aynısı, değiştikçe (server-sent events)
+
+Olaylar canlı kayıttaki (`live_capture`) biçimdedir; (oturum, seq) anahtarı
+sayesinde yeniden gönderilen parti çift yazılmaz. Etüt kayıtları herhangi
+bir eski biçimde gelebilir, kanonik biçime çevrilir; özet her zaman
+sunucuda yeniden hesaplanır. Yazmalarda ad alanı zorunludur (ortak ad alanı
+için ""; uygulama etütleri `operator_namespace(operatör)` altına yazar);
+okumalarda verilmezse ortak ad alanıdır.
+
+Yazılan olaylar ve sayımlar canlı OEE hub'ına (`live_oee`) da uygulanır;
+olayların hattı `?makine=&vardiya=` ile verilir (yoksa oturum adı).
+Sayımda isteğe bağlı "hatali" adedi kalite oranına girer (depoya yazılmaz).
+
+Eşzamanlılık: depo çağrıları olay döngüsünü bloklamasın diye iş
+parçacıklarında çalışır (okuma / hesap için sınırlı bir havuz, yazma için
+tek iş parçacığı). SQLite yazmaları zaten sıralıdır; bu yüzden aynı anda
+gelen isteklerin yazmaları kuyrukta toplanıp tek transaction'da yazılır
+(grup commit). Bir yazma sürerken biriken istekler sonraki transaction'a
+girer; yük arttıkça transaction başına olay sayısı kendiliğinden büyür.
+Kuyruk sınırlıdır; dolduğunda istekler bekler (geri basınç).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from modules.batch_summary import calculate_summaries, to_batch_frames
+from modules.data_manager import (
+    etud_info_from_record, export_studies_to_excel, pretty_report_bytes, raw_report_bytes,
+)
+from modules.live_capture import START, STOP, stops_from_events
+from modules.live_oee import HUB, OeeHub, snapshot_rows, track_study
+from modules.migrate import canonical_record
+from modules.storage import (
+    DEFAULT_PATH, ConcurrentUpdateError, append_event_batches, iter_namespaced, load_events,
+    read_study, save_studies, store_version, study_key,
+)
+from modules.summary_core import SUMMARY_COLUMNS, InvalidStudyError, compute_summary, summary_frame
+
+MAX_EVENTS = 10_000          # istek başına olay
+MAX_STUDIES = 1_000          # istek başına etüt
+MAX_BODY = 16 * 2**20        # istek gövdesi (bayt)
+GROUP_MAX = 20_000           # bir transaction'a giren en fazla öğe
+QUEUE_SIZE = 1_000           # bekleyen yazma isteği
+COUNT_RETRIES = 5            # sayım güncellemesinde sürüm çakışması denemesi
+KEEPALIVE_SEC = 15           # olay akışında boşta bekleme yorumu
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _web():
+    try:
+        from aiohttp import web
+    except ImportError as e:
+        raise ImportError("aiohttp gerekli: pip install aiohttp") from e
+    return web
+
+
+def _bad_request(message: str) -> Exception:
+    web = _web()
+    return web.HTTPBadRequest(text=json.dumps({"hata": message}, ensure_ascii=False), content_type="application/json")
+
+
+def _not_found(message: str) -> Exception:
+    web = _web()
+    return web.HTTPNotFound(text=json.dumps({"hata": message}, ensure_ascii=False), content_type="application/json")
+
+
+def _json(data: Any, **kwargs: Any):
+    return _web().json_response(data, dumps=lambda d: json.dumps(d, ensure_ascii=False), **kwargs)
+
+
+# ---- girdi doğrulama ----
+def parse_events(items: Any) -> List[Tuple[int, float, str, str, str]]:
+    """Gövdedeki olayları (seq, ts, olay, tür, açıklama) demetlerine çevir.
+
+    Olay sözlük ya da 5'li dizi olabilir; geçersiz olayda ValueError.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("events boş olmayan bir liste olmalı")
+    if len(items) > MAX_EVENTS:
+        raise ValueError(f"istek başına en fazla {MAX_EVENTS} olay")
+    events = []
+    for i, item in enumerate(items):
+        if isinstance(item, dict):
+            item = (item.get("seq"), item.get("ts"), item.get("olay"), item.get("tur"), item.get("aciklama", ""))
+        if not isinstance(item, (list, tuple)) or len(item) != 5:
+            raise ValueError(f"olay {i}: (seq, ts, olay, tur, aciklama) bekleniyor")
+        seq, ts, action, tur, aciklama = item
+        if isinstance(seq, bool) or not isinstance(seq, int) or seq < 1:
+            raise ValueError(f"olay {i}: seq pozitif tam sayı olmalı")
+        if isinstance(ts, bool) or not isinstance(ts, (int, float)):
+            raise ValueError(f"olay {i}: ts sayı (unix zamanı) olmalı")
+        if action not in (START, STOP):
+            raise ValueError(f"olay {i}: olay {START!r} ya da {STOP!r} olmalı")
+        if not isinstance(tur, str) or not tur:
+            raise ValueError(f"olay {i}: tur gerekli")
+        events.append((seq, float(ts), action, tur, str(aciklama or "")))
+    return events
+
+
+def _summaries(records: Sequence[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Kanonik kayıtların özetleri tek vektörel geçişte; geçersiz etütte None."""
+    if not records:
+        return []
+    sessions = [etud_info_from_record(r) for r in records]
+    try:
+        studies, stops = to_batch_frames(sessions)
+        table = calculate_summaries(studies, stops)
+    except (TypeError, ValueError):
+        # bozuk satır tüm partiyi düşürmesin: tek tek hesapla
+        return [_summary_one(info, stops) for info, stops in sessions]
+    out: List[Optional[Dict[str, Any]]] = []
+    for row in table.to_dict("records"):
+        out.append({c: row[c] for c in SUMMARY_COLUMNS} if row["Geçerli"] else None)
+    return out
+
+
+def _summary_one(etud_info: Tuple[Any, ...], error_data: list) -> Optional[Dict[str, Any]]:
+    _op, _mk, _d, _v, start, end, initial, final, unit, brk = etud_info
+    try:
+        return compute_summary(error_data, start, end, max(0, (final or 0) - (initial or 0)), unit, brk)
+    except (InvalidStudyError, TypeError, ValueError):
+        return None
+
+
+def prepare_studies(items: Any) -> List[Dict[str, Any]]:
+    """`POST /v1/studies` öğelerini kanonik kayda çevirip özetle.
+
+    Dönen öğe: {"namespace", "key", "record", "expected_version"} ya da
+    geçersizse {"hata"}.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError("studies boş olmayan bir liste olmalı")
+    if len(items) > MAX_STUDIES:
+        raise ValueError(f"istek başına en fazla {MAX_STUDIES} etüt")
+    prepared: List[Dict[str, Any]] = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("record"), (dict, list)):
+            prepared.append({"hata": "record gerekli"})
+            continue
+        record = canonical_record(str(item.get("key") or ""), item["record"])
+        if not record["tarih"] or not record["makine"]:
+            prepared.append({"hata": "tarih ve makine gerekli"})
+            continue
+        expected = item.get("expected_version")
+        if expected is not None and (isinstance(expected, bool) or not isinstance(expected, int)):
+            prepared.append({"hata": "expected_version tam sayı olmalı"})
+            continue
+        namespace = item.get("namespace")
+        if not isinstance(namespace, str):
+            prepared.append({"hata": 'namespace gerekli (ortak ad alanı için "")'})
+            continue
+        prepared.append({
+            "namespace": namespace,
+            "key": str(item.get("key") or study_key(record["tarih"], record["makine"])),
+            "record": record,
+            "expected_version": expected,
+        })
+    valid = [p for p in prepared if "hata" not in p]
+    for p, summary in zip(valid, _summaries([p["record"] for p in valid])):
+        if summary is None:
+            p.clear()
+            p["hata"] = "geçersiz etüt (süre <= 0 ya da eksik alan)"
+        else:
+            p["record"] = {**p["record"], "ozet": summary}
+    return prepared
+
+
+def _count(value: Any) -> bool:
+    # sayım: bool olmayan, negatif olmayan tam sayı
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _write_result(item: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    out = {"namespace": item["namespace"], "key": item["key"]}
+    if isinstance(result, ConcurrentUpdateError):
+        return {**out, "durum": "cakisma", "surum": result.actual}
+    return {**out, "durum": "ok", "surum": result}
+
+
+# ---- grup commit ----
+class GroupCommit:
+    """Eşzamanlı isteklerin yazmalarını tek transaction'da toplayan kuyruk.
+
+    `write(öğeler) -> sonuçlar` öğe başına bir sonuç döndürür ve yazma
+    iş parçacığında çalışır. Her istek kendi öğelerinin sonuçlarını alır;
+    yazma hata verirse o gruptaki tüm istekler aynı hatayı alır.
+    """
+
+    def __init__(self, write: Callable[[list], list], executor: ThreadPoolExecutor,
+                 max_items: int = GROUP_MAX, queue_size: int = QUEUE_SIZE):
+        self._write = write
+        self._executor = executor
+        self.max_items = max_items
+        self._queue: "asyncio.Queue[Tuple[list, asyncio.Future]]" = asyncio.Queue(queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.transactions = 0
+        self.items = 0
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, items: list) -> list:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self._queue.get()]
+            size = len(jobs[0][0])
+            while size < self.max_items and not self._queue.empty():
+                job = self._queue.get_nowait()
+                jobs.append(job)
+                size += len(job[0])
+            flat = [item for items, _future in jobs for item in items]
+            try:
+                results = await loop.run_in_executor(self._executor, self._write, flat)
+            except Exception as exc:
+                for _items, future in jobs:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.transactions += 1
+            self.items += len(flat)
+            pos = 0
+            for items, future in jobs:
+                if not future.done():   # istemci bağlantıyı kesmiş olabilir
+                    future.set_result(results[pos:pos + len(items)])
+                pos += len(items)
+
+
+# ---- servis ----
+class IngestService:
+    """Uç noktaları ve paylaşılan kaynakları (iş parçacığı havuzları, yazma kuyrukları) tutar."""
+
+    def __init__(self, path: str = DEFAULT_PATH, workers: int = 4, group_max: int = GROUP_MAX,
+                 hub: Optional[OeeHub] = None):
+        self.path = path
+        self.hub = hub or HUB
+        self.workers = workers
+        self.group_max = group_max
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self.events: Optional[GroupCommit] = None
+        self.studies: Optional[GroupCommit] = None
+
+    # yaşam döngüsü
+    async def on_startup(self, app) -> None:
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ingest-okuma")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="ingest-yazma")
+        # şema / taşıma ilk istekten önce, yazma iş parçacığında kurulsun
+        await asyncio.get_running_loop().run_in_executor(self._writer, store_version, self.path)
+        self.events = GroupCommit(lambda batch: append_event_batches(batch, self.path), self._writer, self.group_max)
+        self.studies = GroupCommit(self._save_studies, self._writer, self.group_max)
+        self.events.start()
+        self.studies.start()
+
+    async def on_cleanup(self, app) -> None:
+        for queue in (self.events, self.studies):
+            if queue is not None:
+                await queue.close()
+        for executor in (self._pool, self._writer):
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _save_studies(self, items: List[Dict[str, Any]]) -> list:
+        return save_studies(
+            [(i["namespace"], i["key"], i["record"], i["expected_version"]) for i in items], self.path,
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def _body(self, request, field: str) -> Any:
+        try:
+            body = await request.json()
+        except (ValueError, UnicodeDecodeError):
+            raise _bad_request("gövde geçerli JSON değil")
+        if not isinstance(body, dict) or field not in body:
+            raise _bad_request(f"gövdede {field!r} alanı gerekli")
+        return body[field]
+
+    # uç noktalar
+    async def health(self, request):
+        version = await self._run(store_version, self.path)
+        # grup commit istatistiği: transaction sayısı ve bunlara giren öğe (olay partisi / etüt) sayısı
+        return _json({
+            "ok": True,
+            "store_version": version,
+            "yazma": {
+                name: {"transaction": queue.transactions, "oge": queue.items}
+                for name, queue in (("olay", self.events), ("etut", self.studies))
+            },
+        })
+
+    async def post_events(self, request):
+        session = request.match_info["session"]
+        try:
+            events = parse_events(await self._body(request, "events"))
+        except ValueError as e:
+            raise _bad_request(str(e))
+        (written,) = await self.events.submit([(session, events)])
+        if written:
+            # yeniden gönderilen parti hub'da da etkisizdir (açık duruş yeniden açılmaz)
+            line = (request.query.get("makine") or session, request.query.get("vardiya", ""))
+            self.hub.apply_events(line, events)
+        return _json({"alinan": len(events), "yazilan": written})
+
+    async def session_stops(self, request):
+        events = await self._run(load_events, request.match_info["session"], self.path)
+        return _json({"duruslar": stops_from_events(events)})
+
+    async def post_studies(self, request):
+        try:
+            prepared = await self._run(prepare_studies, await self._body(request, "studies"))
+        except ValueError as e:
+            raise _bad_request(str(e))
+        valid = [p for p in prepared if "hata" not in p]
+        results = iter(await self.studies.submit(valid) if valid else [])
+        out = [
+            {"durum": "gecersiz", "hata": p["hata"]} if "hata" in p else _write_result(p, next(results))
+            for p in prepared
+        ]
+        return _json({"sonuclar": out})
+
+    async def post_counts(self, request):
+        """Üretim sayımlarını (son_sayim) güncelle; özet yeniden hesaplanır.
+
+        Oku-değiştir-yaz, `expected_version` ile yapılır; araya başka yazma
+        girerse çakışan öğeler yeniden okunup `COUNT_RETRIES` kez denenir.
+        """
+        items = await self._body(request, "counts")
+        if not isinstance(items, list) or not items or len(items) > MAX_STUDIES:
+            raise _bad_request(f"counts 1..{MAX_STUDIES} öğeli bir liste olmalı")
+        pending: Dict[int, Tuple[str, str, Any]] = {}
+        out: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for i, item in enumerate(items):
+            count = item.get("son_sayim") if isinstance(item, dict) else None
+            if not isinstance(item, dict) or not item.get("key") or not _count(count):
+                out[i] = {"durum": "gecersiz", "hata": "key ve negatif olmayan tam sayı son_sayim gerekli"}
+                continue
+            if not isinstance(item.get("namespace"), str):
+                out[i] = {"durum": "gecersiz", "hata": 'namespace gerekli (ortak ad alanı için "")'}
+                continue
+            defective = item.get("hatali")
+            if defective is not None and not _count(defective):
+                out[i] = {"durum": "gecersiz", "hata": "hatali negatif olmayan tam sayı olmalı"}
+                continue
+            pending[i] = (item["namespace"], str(item["key"]), count)
+
+        for _attempt in range(COUNT_RETRIES):
+            if not pending:
+                break
+            current = await self._run(self._read_many, [(ns, key) for ns, key, _c in pending.values()])
+            updates, slots = [], []
+            for (i, (ns, key, count)), (record, version) in zip(pending.items(), current):
+                if record is None:
+                    out[i] = {"namespace": ns, "key": key, "durum": "yok"}
+                    continue
+                record = {**canonical_record(key, record), "son_sayim": count}
+                updates.append({"namespace": ns, "key": key, "record": record, "expected_version": version})
+                slots.append(i)
+            for p, summary in zip(updates, await self._run(_summaries, [u["record"] for u in updates])):
+                p["record"]["ozet"] = summary or {}
+            results = await self.studies.submit(updates) if updates else []
+            retry = {}
+            for i, p, result in zip(slots, updates, results):
+                if isinstance(result, ConcurrentUpdateError):
+                    retry[i] = pending[i]
+                else:
+                    self._track(p["record"], items[i].get("hatali"))
+                out[i] = _write_result(p, result)
+            pending = retry
+        return _json({"sonuclar": out})
+
+    def _track(self, record: Dict[str, Any], defective: Optional[int]) -> None:
+        # sayımı güncellenen etüt, hattının canlı OEE penceresini ve sayımını belirler
+        key = ((record.get("makine") or "").strip(), record.get("vardiya") or "")
+        try:
+            produced = max(0, int(record.get("son_sayim") or 0) - int(record.get("ilk_sayim") or 0))
+        except (TypeError, ValueError):
+            return
+        track_study(key, record.get("baslangic"), record.get("bitis"), record.get("tarih"),
+                    record.get("birim_sure"), record.get("mola"), produced, self.hub)
+        if defective is not None:
+            self.hub.set_count(key, defective=defective)
+
+    def _read_many(self, keys: List[Tuple[str, str]]) -> List[Tuple[Any, int]]:
+        return [read_study(key, self.path, ns) for ns, key in keys]
+
+    async def post_summary(self, request):
+        items = await self._body(request, "studies")
+        if not isinstance(items, list) or not items or len(items) > MAX_STUDIES:
+            raise _bad_request(f"studies 1..{MAX_STUDIES} öğeli bir liste olmalı")
+        if not all(isinstance(r, (dict, list)) for r in items):
+            raise _bad_request("studies öğeleri etüt kaydı (nesne) olmalı")
+        records = [canonical_record("", r) for r in items]
+        return _json({"ozetler": await self._run(_summaries, records)})
+
+    async def list_studies(self, request):
+        q = request.query
+        try:
+            limit = int(q.get("limit", 1000))
+        except ValueError:
+            raise _bad_request("limit tam sayı olmalı")
+        filters = {
+            "start_date": q.get("start"), "end_date": q.get("end"),
+            "machine": q.get("machine"), "operator": q.get("operator"), "namespace": q.get("namespace"),
+        }
+
+        def read() -> List[Dict[str, Any]]:
+            rows = []
+            for ns, key, record in iter_namespaced(self.path, **filters):
+                if len(rows) >= limit:
+                    break
+                rows.append({"namespace": ns, "key": key, "record": record})
+            return rows
+
+        return _json({"etutler": await self._run(read)})
+
+    async def get_study(self, request):
+        key, ns = request.match_info["key"], request.query.get("namespace", "")
+        record, version = await self._run(read_study, key, self.path, ns)
+        if record is None:
+            raise _not_found(f"etüt yok: {key}")
+        return _json({"namespace": ns, "key": key, "surum": version, "record": record},
+                     headers={"ETag": f'"{version}"'})
+
+    async def study_report(self, request):
+        key, ns = request.match_info["key"], request.query.get("namespace", "")
+        kind = request.query.get("kind", "pretty")
+        if kind not in ("raw", "pretty"):
+            raise _bad_request("kind raw ya da pretty olmalı")
+        record, _version = await self._run(read_study, key, self.path, ns)
+        if record is None:
+            raise _not_found(f"etüt yok: {key}")
+
+        def build() -> bytes:
+            etud_info, error_data = etud_info_from_record(record)
+            if kind == "raw":
+                return raw_report_bytes(etud_info, error_data)
+            summary = _summary_one(etud_info, error_data)
+            if summary is None:
+                raise InvalidStudyError("geçersiz etüt")
+            return pretty_report_bytes(etud_info, error_data, summary_frame(summary))
+
+        try:
+            data = await self._run(build)
+        except InvalidStudyError as e:
+            raise _bad_request(str(e))
+        return _web().Response(body=data, content_type=XLSX, headers={
+            "Content-Disposition": f'attachment; filename="{kind}.xlsx"',
+        })
+
+    async def export(self, request):
+        q = request.query
+        fd, out_path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            await self._run(export_studies_to_excel, out_path, self.path, q.get("start"), q.get("end"), q.get("machine"))
+            response = _web().StreamResponse(headers={
+                "Content-Type": XLSX, "Content-Disposition": 'attachment; filename="etutler.xlsx"',
+            })
+            await response.prepare(request)
+            with open(out_path, "rb") as f:
+                while chunk := await self._run(f.read, 1 << 16):
+                    await response.write(chunk)
+            await response.write_eof()
+            return response
+        finally:
+            os.remove(out_path)
+
+
+    async def oee(self, request):
+        return _json({"hatlar": snapshot_rows(self.hub.snapshots())})
+
+    async def oee_stream(self, request):
+        """Hatların anlık değerlerini değiştikçe SSE ile it (önce tümü, sonra yalnız değişenler)."""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        sub = self.hub.subscribe(lambda: loop.call_soon_threadsafe(wake.set))
+        response = _web().StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        try:
+            await response.prepare(request)
+            pending = self.hub.snapshots()
+            while True:
+                if pending:
+                    data = json.dumps(snapshot_rows(pending), ensure_ascii=False)
+                    await response.write(f"data: {data}\n\n".encode())
+                try:
+                    await asyncio.wait_for(wake.wait(), KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    await response.write(b": canli\n\n")
+                wake.clear()
+                pending = sub.drain()
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            sub.close()
+        return response
+
+
+def create_app(path: str = DEFAULT_PATH, workers: int = 4, group_max: int = GROUP_MAX,
+               hub: Optional[OeeHub] = None):
+    """aiohttp uygulamasını kur (test / gömülü kullanım için)."""
+    web = _web()
+    service = IngestService(path, workers, group_max, hub)
+    app = web.Application(client_max_size=MAX_BODY)
+    app["service"] = service
+    app.on_startup.append(service.on_startup)
+    app.on_cleanup.append(service.on_cleanup)
+    app.router.add_get("/health", service.health)
+    app.router.add_post("/v1/events/{session}", service.post_events)
+    app.router.add_get("/v1/events/{session}/stops", service.session_stops)
+    app.router.add_post("/v1/studies", service.post_studies)
+    app.router.add_post("/v1/counts", service.post_counts)
+    app.router.add_post("/v1/summary", service.post_summary)
+    app.router.add_get("/v1/studies", service.list_studies)
+    app.router.add_get("/v1/studies/{key}", service.get_study)
+    app.router.add_get("/v1/studies/{key}/report", service.study_report)
+    app.router.add_get("/v1/export", service.export)
+    app.router.add_get("/v1/oee", service.oee)
+    app.router.add_get("/v1/oee/stream", service.oee_stream)
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Etüt verisi için HTTP veri alma / sorgu servisi.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--store", default=DEFAULT_PATH, help="etüt deposu (varsayılan: %(default)s)")
+    parser.add_argument("--workers", type=int, default=4, help="okuma / hesap iş parçacığı sayısı")
+    parser.add_argument("--group-max", type=int, default=GROUP_MAX,
+                        help="bir transaction'a giren en fazla öğe (1: grup commit kapalı)")
+    args = parser.parse_args(argv)
+    _web().run_app(create_app(args.store, args.workers, args.group_max), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
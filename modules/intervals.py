@@ -0,0 +1,176 @@
+# path: modules/intervals.py
+"""
+Zaman aralıklı duruşlar için süpürme (sweep-line) motoru.
+
+Duruş kaydında "Başlangıç" / "Bitiş" saatleri varsa duruş, etüt penceresi
+içinde bir aralık olarak ele alınır. Aralıklar tek bir sıralı olay listesi
+üzerinden süpürülür (O(n log n)); her an tek bir duruma yazılır:
+
+    mola > planlı > plansız > çalışma
+
+Böylece çakışan planlı/plansız duruşlar ya da molaya denk gelen duruşlar
+iki kez sayılmaz. Aralığı olmayan (yalnız süreli) eski kayıtlar bu motora
+girmez; özet hesabında eskisi gibi doğrudan toplanır.
+
+Saatler pencere başlangıcına göre `time_window` ile yerleştirilir; gece
+yarısını geçen etüt ve duruşlar (23:58–00:02) doğru sırada süpürülür.
+"""
+
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from modules.time_window import DAY_SEC, parse_moment, span_offsets, study_window
+
+STOP_START = "Başlangıç"
+STOP_END = "Bitiş"
+
+BREAK, PLANNED, UNPLANNED = 0, 1, 2       # öncelik sırası (küçük olan baskın)
+_KINDS = {"Planlı": PLANNED, "Plansız": UNPLANNED}
+
+# bitişi başlangıcından önce olan saat aralığı en fazla bu kadarsa gece
+# yarısını geçiyor sayılır; daha uzunu (10:20–10:10 gibi) hatalı girişdir
+MAX_WRAP_SEC = 12 * 3600
+
+
+# ---- saat yardımcıları ----
+def parse_clock(value: Any) -> Optional[int]:
+    """time ya da "SS:DD[:ss]" metnini gün içi saniyeye çevir; olmazsa None."""
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+    if isinstance(value, str) and value:
+        try:
+            value = datetime.time.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime.time):
+        return value.hour * 3600 + value.minute * 60 + value.second
+    return None
+
+
+def clock_text(value: Any) -> str:
+    """Saati kayıtta tutulan "SS:DD:ss" biçimine çevir (tam zaman "YYYY-AA-GG SS:DD:ss")."""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    return value.strftime("%H:%M:%S") if isinstance(value, datetime.time) else str(value or "")
+
+
+def span_seconds(start: Any, end: Any) -> Optional[float]:
+    """Aralığın uzunluğu (sn); eksik, boş ya da ters ise None.
+
+    İki uç saatse bitiş başlangıçtan önce olabilir (gece yarısını geçen
+    duruş), yeter ki sarılmış uzunluk `MAX_WRAP_SEC`'i aşmasın.
+    """
+    s, e = parse_moment(start), parse_moment(end)
+    if isinstance(s, datetime.datetime) and isinstance(e, datetime.datetime):
+        sec = (e - s).total_seconds()
+        return sec if sec > 0 else None
+    s, e = parse_clock(s), parse_clock(e)
+    if s is None or e is None or e == s:
+        return None
+    if e > s:
+        return float(e - s)
+    wrapped = e - s + DAY_SEC
+    return float(wrapped) if wrapped <= MAX_WRAP_SEC else None
+
+
+def stop_span(stop: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Kaydın (başlangıç, bitiş) metin aralığı; eksik ya da ters ise None."""
+    start, end = stop.get(STOP_START), stop.get(STOP_END)
+    if span_seconds(start, end) is None:
+        return None
+    return clock_text(start), clock_text(end)
+
+
+def break_interval(start: Any, minutes: Any) -> Tuple[Tuple[str, str], ...]:
+    """Mola başlangıcı + süresinden tek elemanlı mola aralığı (başlangıç yoksa boş).
+
+    Gece yarısını geçen mola bitiş saatine sarılır.
+    """
+    s = parse_clock(start)
+    if s is None or not minutes or float(minutes) <= 0:
+        return ()
+    e = (s + int(round(float(minutes) * 60))) % DAY_SEC
+    fmt = lambda sec: f"{sec // 3600:02d}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+    return ((fmt(s), fmt(e)),)
+
+
+# ---- süpürme ----
+def sweep(window_sec: float, spans: Iterable[Tuple[int, float, float]]) -> Dict[str, Any]:
+    """(durum, başlangıç sn, bitiş sn) aralıklarını pencereye kırpıp süpür.
+
+    Saniyeler pencere başlangıcına göredir. Dönen sözlük: her durumun
+    özel (çakışmasız) süresi ve pencereyi eksiksiz kaplayan
+    (başlangıç, bitiş, durum) parçaları; durum None çalışma demektir.
+    """
+    events: List[Tuple[float, int, int]] = []
+    for state, s, e in spans:
+        s, e = max(s, 0.0), min(e, window_sec)
+        if e > s:
+            events.append((s, 1, state))
+            events.append((e, -1, state))
+    events.sort()
+
+    active = [0, 0, 0]
+    covered = [0.0, 0.0, 0.0]
+    segments: List[Tuple[float, float, Optional[int]]] = []
+    prev = 0.0
+    for t, delta, state in events:
+        if t > prev:
+            current = next((i for i in (BREAK, PLANNED, UNPLANNED) if active[i]), None)
+            segments.append((prev, t, current))
+            if current is not None:
+                covered[current] += t - prev
+            prev = t
+        active[state] += delta
+    if window_sec > prev:
+        segments.append((prev, window_sec, None))
+
+    return {
+        "break_sec": covered[BREAK],
+        "planned_sec": covered[PLANNED],
+        "unplanned_sec": covered[UNPLANNED],
+        "running_sec": max(window_sec - sum(covered), 0.0),
+        "segments": segments,
+    }
+
+
+def study_intervals(
+    start_time: Any,
+    end_time: Any,
+    stops: Iterable[Tuple[str, Any, Any]],
+    breaks: Sequence[Tuple[Any, Any]] = (),
+) -> Dict[str, Any]:
+    """Etüt penceresindeki (tür, başlangıç, bitiş) duruşlarını ve molaları süpür.
+
+    Başlangıç / bitiş saat ya da tam zaman olabilir (`time_window`).
+    Planlı/Plansız dışındaki türler yok sayılır.
+    """
+    bounds = study_window(start_time, end_time)
+    if bounds is None:
+        raise ValueError("Etüt başlangıç ve bitişi gerekli.")
+    origin = bounds[0]
+    window = (bounds[1] - origin).total_seconds()
+    spans = []
+    for state, s, e in [(BREAK, s, e) for s, e in breaks] + [(_KINDS.get(k), s, e) for k, s, e in stops]:
+        offsets = span_offsets(s, e, origin, window) if state is not None else None
+        if offsets is not None:
+            spans.append((state, *offsets))
+    result = sweep(window, spans)
+    result["window_sec"] = window
+    return result
+
+
+def availability_timeline(result: Dict[str, Any]) -> List[float]:
+    """Dakika başına çalışma oranı (0-1); `sweep` / `study_intervals` çıktısından."""
+    window = result["window_sec"]
+    minutes = int(-(-window // 60))
+    running = [0.0] * minutes
+    for s, e, state in result["segments"]:
+        if state is not None:
+            continue
+        m = int(s // 60)
+        while s < e:
+            edge = min((m + 1) * 60.0, e)
+            running[m] += edge - s
+            s, m = edge, m + 1
+    return [round(r / min(60.0, window - i * 60), 4) for i, r in enumerate(running)]
@@ -3,24 +3,46 @@
 import streamlit as st
 import datetime
 
+from modules.time_window import study_window
+
+VARDIYALAR = ["1. Vardiya", "2. Vardiya", "3. Vardiya"]
+
+
 def render_etud_info_v2():
     st.subheader("🕐 Etüt Bilgileri")
 
-    operator = st.text_input("Operatör Adı")
-    machine = st.text_input("Makine Adı / Numarası")
-    etud_date = st.date_input("Etüt Tarihi", value=datetime.date.today())
-    vardiya = st.selectbox("Vardiya", ["1. Vardiya", "2. Vardiya", "3. Vardiya"])
+    # taslaktan geri yüklenen değerler (autosave) varsayılan olarak verilir;
+    # oturum boyunca değişmezler, alan kimlikleri sabit kalır
+    d = st.session_state.get("etud_defaults", {})
+
+    operator = st.text_input("Operatör Adı", value=d.get("etud_operator") or "", key="etud_operator")
+    machine = st.text_input("Makine Adı / Numarası", value=d.get("etud_machine") or "", key="etud_machine")
+    etud_date = st.date_input("Etüt Tarihi", value=d.get("etud_date") or datetime.date.today(), key="etud_date")
+    vardiya = st.selectbox(
+        "Vardiya", VARDIYALAR, key="etud_vardiya",
+        index=VARDIYALAR.index(d["etud_vardiya"]) if d.get("etud_vardiya") in VARDIYALAR else 0,
+    )
 
-    break_time = st.number_input("Toplam Mola Süresi (dk)", min_value=0.0, value=0.0)
-    start_time = st.time_input("Etüt Başlangıç Saati")
-    end_time = st.time_input("Etüt Bitiş Saati")
-    initial_count = st.number_input("Etüt Öncesi Yatak Sayısı", min_value=0)
-    final_count = st.number_input("Etüt Sonrası Yatak Sayısı", min_value=0)
-    unit_time = st.number_input("Bir Yatak Oluşma Süresi (dakika)", min_value=0.1)
+    break_time = st.number_input("Toplam Mola Süresi (dk)", min_value=0.0, value=float(d.get("etud_break_time") or 0.0), key="etud_break_time")
+    # opsiyonel: verilirse mola bir aralık olur ve molaya denk gelen duruşlar düşülmez
+    st.time_input("Mola Başlangıç Saati (ops.)", value=d.get("break_start"), step=60, key="break_start")
+    start_time = st.time_input("Etüt Başlangıç Saati", value=d.get("etud_start") or "now", key="etud_start")
+    end_time = st.time_input("Etüt Bitiş Saati", value=d.get("etud_end") or "now", key="etud_end")
+    # birkaç günlük etüt için; boşsa bitiş saati başlangıçtan önceyse ertesi gün sayılır (gece vardiyası)
+    end_date = st.date_input("Etüt Bitiş Tarihi (ops.)", value=d.get("etud_end_date"), key="etud_end_date")
+    initial_count = st.number_input("Etüt Öncesi Yatak Sayısı", min_value=0, value=d.get("etud_initial", "min"), key="etud_initial")
+    final_count = st.number_input("Etüt Sonrası Yatak Sayısı", min_value=0, value=d.get("etud_final", "min"), key="etud_final")
+    unit_time = st.number_input("Bir Yatak Oluşma Süresi (dakika)", min_value=0.1, value=d.get("etud_unit", "min"), key="etud_unit")
 
-    if start_time >= end_time:
-        st.error("Bitiş saati, başlangıç saatinden sonra olmalıdır.")
+    if end_date is not None:
+        start_time = datetime.datetime.combine(etud_date, start_time)
+        end_time = datetime.datetime.combine(end_date, end_time)
+    window = study_window(start_time, end_time, etud_date)
+    if window[1] <= window[0]:
+        st.error("Bitiş, başlangıçtan sonra olmalıdır.")
         return None
+    if window[1].date() > window[0].date():
+        st.caption(f"🌙 Etüt gece yarısını geçiyor: {window[0]:%d.%m %H:%M} → {window[1]:%d.%m %H:%M}")
 
     if not operator or not machine or unit_time is None:
         st.error("Lütfen tüm alanları doldurun.")
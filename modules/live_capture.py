@@ -0,0 +1,172 @@
+# path: modules/live_capture.py
+"""
+Kronometre ile canlı duruş kaydı.
+
+Operatör duruş süresini sonradan elle girmek yerine duruş başladığında ve
+bittiğinde düğmeye basar. Her basış bir olay olarak yerel tampona eklenir
+(kilit altında O(1)); olaylar sıra numarası (seq) alır ve zaman damgaları
+azalmaz, böylece art arda gelen olaylar sıra değiştirmez. Tampon depoya
+partiler halinde yazılır (`flush`); yazma başarısız olursa olaylar tamponda
+kalır ve sonraki denemede yeniden gönderilir. (oturum, seq) anahtarı
+sayesinde aynı olay iki kez yazılmaz.
+
+Biten her duruş `Başlangıç`/`Bitiş` saatli bir duruş kaydı olarak döner;
+özet hesabında aralık motoruna (`intervals`) girer. `listeners`'a eklenen
+geri çağrılar her olayı kilit dışında alır (ör. canlı OEE, `live_oee`).
+"""
+
+import datetime
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from modules.intervals import STOP_END, STOP_START
+from modules.storage import DEFAULT_PATH, append_events, load_events
+
+START, STOP = "başla", "bitir"
+
+# (seq, ts, olay, tür, açıklama)
+Event = Tuple[int, float, str, str, str]
+
+
+def stop_record(begin: Event, end: Event) -> Dict[str, Any]:
+    """Başla/bitir olay çiftinden duruş kaydı."""
+    t0 = datetime.datetime.fromtimestamp(begin[1])
+    t1 = datetime.datetime.fromtimestamp(end[1])
+    return {
+        "Duruş Türü": end[3],
+        "Süre (sn)": int(round(end[1] - begin[1])),
+        "Açıklama": end[4] or begin[4],
+        STOP_START: t0.strftime("%H:%M:%S"),
+        STOP_END: t1.strftime("%H:%M:%S"),
+    }
+
+
+def stops_from_events(events: Iterable[Event], since: float = 0.0) -> List[Dict[str, Any]]:
+    """Olay akışından tamamlanmış duruşları yeniden kur (ör. oturum kurtarma).
+
+    since verilirse yalnız o andan sonra biten duruşlar döner.
+    """
+    opened: Dict[str, Event] = {}
+    stops = []
+    for ev in sorted(events):
+        if ev[2] == START:
+            opened.setdefault(ev[3], ev)
+        elif ev[2] == STOP and ev[3] in opened:
+            begin = opened.pop(ev[3])
+            if ev[1] > since:
+                stops.append(stop_record(begin, ev))
+    return stops
+
+
+class EventLog:
+    """Bir oturumun tamponlu olay günlüğü (iş parçacığı güvenli)."""
+
+    def __init__(self, session: Optional[str] = None, batch_size: int = 50, max_age: float = 5.0):
+        self.session = session or uuid.uuid4().hex
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.flushed = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._last_ts = 0.0
+        self._pending: Deque[Event] = deque()
+        self._open: Dict[str, Event] = {}
+        self.listeners: List[Callable[[Event], None]] = []
+
+    def _append(self, action: str, tur: str, aciklama: str) -> Event:
+        # çağıran kilidi tutar; saat geri gitse de ts azalmaz
+        ts = max(time.time(), self._last_ts)
+        self._last_ts = ts
+        event = (next(self._seq), ts, action, tur, aciklama)
+        self._pending.append(event)
+        return event
+
+    def _emit(self, event: Event) -> None:
+        for listener in self.listeners:
+            listener(event)
+
+    def record(self, action: str, tur: str, aciklama: str = "") -> Event:
+        """Ham olay ekle."""
+        with self._lock:
+            event = self._append(action, tur, aciklama)
+        self._emit(event)
+        return event
+
+    def start(self, tur: str, aciklama: str = "") -> Optional[Event]:
+        """Bu türde duruş başlat; zaten açıksa None."""
+        with self._lock:
+            if tur in self._open:
+                return None
+            event = self._open[tur] = self._append(START, tur, aciklama)
+        self._emit(event)
+        return event
+
+    def stop(self, tur: str, aciklama: str = "") -> Optional[Dict[str, Any]]:
+        """Açık duruşu bitir ve duruş kaydını döndür; açık değilse None."""
+        with self._lock:
+            begin = self._open.pop(tur, None)
+            if begin is None:
+                return None
+            end = self._append(STOP, tur, aciklama)
+        self._emit(end)
+        return stop_record(begin, end)
+
+    def open_stops(self) -> Dict[str, float]:
+        """Açık duruşlar: {tür: başlangıç zaman damgası}."""
+        with self._lock:
+            return {tur: ev[1] for tur, ev in self._open.items()}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Parti dolduysa ya da en eski bekleyen olay `max_age` saniyeyi geçtiyse True."""
+        with self._lock:
+            if not self._pending:
+                return False
+            oldest = self._pending[0][1]
+            return len(self._pending) >= self.batch_size or (now or time.time()) - oldest >= self.max_age
+
+    def flush(self, path: str = DEFAULT_PATH) -> int:
+        """Bekleyen olayları tek transaction'da depoya yaz. Yazılan olay sayısını döndürür."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+            append_events(self.session, batch, path)
+            with self._lock:
+                # yeni olaylar yalnızca sağa eklenir; soldaki len(batch) olay yazılanlardır
+                for _ in batch:
+                    self._pending.popleft()
+            self.flushed += len(batch)
+            return len(batch)
+
+    @classmethod
+    def restore(cls, session: str, path: str = DEFAULT_PATH, since: float = 0.0,
+                **kwargs: Any) -> Tuple["EventLog", List[Dict[str, Any]]]:
+        """Depodaki olaylardan günlüğü ve tamamlanmış duruşları geri yükle.
+
+        Açık duruşlar günlükte açık kalır; duruş listesi `since`'ten sonra
+        bitenlerle sınırlanabilir (ör. taslağa henüz yazılmamış olanlar).
+        """
+        events = load_events(session, path)
+        log = cls(session, **kwargs)
+        if events:
+            log._seq = itertools.count(events[-1][0] + 1)
+            log._last_ts = events[-1][1]
+            log.flushed = len(events)
+        opened: Dict[str, Event] = {}
+        for ev in events:
+            if ev[2] == START:
+                opened.setdefault(ev[3], ev)
+            elif ev[2] == STOP:
+                opened.pop(ev[3], None)
+        log._open = opened
+        return log, stops_from_events(events, since)
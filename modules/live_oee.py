@@ -0,0 +1,380 @@
+# path: modules/live_oee.py
+"""
+Makine / vardiya başına artımlı (incremental) canlı OEE.
+
+`compute_summary` özeti her seferinde tüm duruş listesinden yeniden
+hesaplar. Canlı hat izlemede her hat için yalnızca birkaç koşan toplam
+tutulur (`LineState`); her olay bunları O(1) günceller:
+
+- duruş olayları (`live_capture` biçimi: başla / bitir) zaman içinde
+  süpürülür: son olaydan bu yana geçen süre o an baskın duruma yazılır
+  (mola > planlı > plansız > çalışma, `intervals` ile aynı öncelik), böylece
+  çakışan duruşlar iki kez sayılmaz;
+- yalnız süreli (sonradan girilen) duruşlar doğrudan toplama eklenir ya da
+  silinince çıkarılır;
+- üretim / hatalı sayımı güncellemesi sayacı değiştirir.
+
+Anlık değerler (`snapshot`) bu toplamlardan ve açık duruşların şu ana
+kadarki süresinden hesaplanır; formül `summary_core.summary_values` ile
+aynıdır, pencere kapandığında sonuç `compute_summary` ile birebir tutar.
+Klasik OEE bileşenleri de eklenir:
+
+    Kullanılabilirlik = çalışma / (etüt - planlı duruş)
+    Performans        = üretim x CT / çalışma
+    Kalite            = (üretim - hatalı) / üretim
+    OEE               = K x P x Ka  (= Gerçekleşme Oranı x Kalite)
+
+`OeeHub` hatları tutar ve her güncellemeden sonra yeni anlık değeri
+abonelere iter. Abone ya bir geri çağrıdır ya da hat başına yalnız en son
+değeri tutan bir posta kutusudur (`Subscription`): yavaş okuyan pano
+(ör. `run_every` ile yenilenen Streamlit bölümü) kuyruk biriktirmez.
+Süreç genelinde tek hub `HUB`'dır; Streamlit oturumları ve veri alma
+servisi aynı hub'a yazar.
+
+Hat, üzerinde çalışılan en yeni etüt penceresini gösterir: öncekiyle
+çakışmayan yeni pencere (ör. ertesi gün) bütün toplamları sıfırlar, güncel
+pencereden önce biten bir etüt (başka oturumda açık eski etüt) hattı
+değiştirmez (`OeeHub.track`). Penceresi `LINE_TTL` önce bitmiş hatlar atılır.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from modules.live_capture import START, STOP
+from modules.summary_core import summary_values
+from modules.time_window import study_window
+
+BREAK_TYPE = "Mola"
+_PRIORITY = (BREAK_TYPE, "Planlı", "Plansız")   # baskın olan önce
+
+STALE_SEC = 300.0   # okunmayan posta kutusu aboneliği bu kadar saniye sonra düşer
+LINE_TTL = 6 * 3600.0   # penceresi bu kadar saniye önce bitmiş (ya da güncellenmeyen) hat düşer
+
+OEE_COLUMNS = ["Kullanılabilirlik (%)", "Performans (%)", "Kalite (%)", "OEE (%)"]
+
+# (makine, vardiya)
+LineKey = Tuple[str, str]
+
+
+class LineState:
+    """Bir hattın (makine, vardiya) koşan toplamları. Kilitlemeyi `OeeHub` yapar.
+
+    Zamanlar Unix zaman damgasıdır. Başlangıç verilmezse ilk olay
+    başlangıç sayılır; bitiş verilmezse pencere şu ana kadar açıktır.
+    Olaylar zaman sırasıyla gelmelidir; geri kalan damga son olayın
+    zamanına çekilir (`EventLog` ile aynı kural).
+    """
+
+    __slots__ = ("start", "end", "unit_time", "break_min", "produced", "defective",
+                 "plain", "covered", "open", "clock", "events", "updated")
+
+    def __init__(self) -> None:
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.unit_time = 0.0
+        self.break_min = 0.0
+        self._clear()
+        self.updated = time.time()
+
+    def _clear(self) -> None:
+        # yeni pencere: önceki etüdün sayım ve duruşları taşınmaz
+        self.produced = 0
+        self.defective = 0
+        self.plain = {"Planlı": 0.0, "Plansız": 0.0}
+        self.covered = {k: 0.0 for k in _PRIORITY}
+        self.open: Dict[str, float] = {}
+        self.clock: Optional[float] = None
+        self.events = 0
+
+    def configure(self, start: Optional[float] = None, end: Optional[float] = None,
+                  unit_time: Optional[float] = None, break_min: Optional[float] = None) -> bool:
+        """Pencereyi / parametreleri ayarla (verilmeyenler değişmez). Değiştiyse True.
+
+        Başlangıç değişirse süpürülen aralık toplamları sıfırlanır; açık
+        duruşlar yeni başlangıçtan itibaren sürer. Yeni pencere eskisiyle
+        hiç çakışmıyorsa (ör. ertesi gün) tüm toplamlar ve açık duruşlar
+        sıfırlanır.
+        """
+        before = (self.start, self.end, self.unit_time, self.break_min)
+        if start is not None and start != self.start:
+            new_end = self.end if end is None else end
+            if self.start is not None and self.end is not None and (
+                start >= self.end or (new_end is not None and new_end <= self.start)
+            ):
+                self._clear()
+            else:
+                self.covered = {k: 0.0 for k in _PRIORITY}
+            self.start, self.clock = start, None
+        if end is not None:
+            self.end = end
+        if unit_time is not None:
+            self.unit_time = float(unit_time)
+        if break_min is not None:
+            self.break_min = float(break_min)
+        return (self.start, self.end, self.unit_time, self.break_min) != before
+
+    def _dominant(self) -> Optional[str]:
+        return next((k for k in _PRIORITY if k in self.open), None)
+
+    def _span(self, until: float) -> Tuple[Optional[str], float]:
+        # son olaydan `until`'e kadar pencereye düşen süre ve o anki baskın durum
+        lo = self.start if self.clock is None else max(self.clock, self.start)
+        hi = until if self.end is None else min(until, self.end)
+        return self._dominant(), max(hi - lo, 0.0)
+
+    def event(self, ts: float, action: str, tur: str) -> bool:
+        """Başla / bitir olayını uygula (O(1)). Durum değiştiyse True."""
+        if tur not in self.covered:
+            return False
+        if self.start is None:
+            self.start = ts
+        if self.clock is not None:
+            ts = max(ts, self.clock)
+        state, span = self._span(ts)
+        if state is not None:
+            self.covered[state] += span
+        self.clock = ts
+        if action == START and tur not in self.open:
+            self.open[tur] = ts
+        elif action == STOP and tur in self.open:
+            del self.open[tur]
+        else:
+            return False
+        self.events += 1
+        return True
+
+    def add_stop(self, tur: str, seconds: float) -> bool:
+        """Yalnız süreli duruş ekle (silmek için eksi süre)."""
+        if tur not in self.plain or not seconds:
+            return False
+        # pencere arada sıfırlandıysa eski duruşun silinmesi toplamı eksiye düşürmesin
+        self.plain[tur] = max(self.plain[tur] + float(seconds), 0.0)
+        return True
+
+    def set_count(self, produced: Optional[int] = None, defective: Optional[int] = None) -> bool:
+        before = (self.produced, self.defective)
+        if produced is not None:
+            self.produced = max(int(produced), 0)
+        if defective is not None:
+            self.defective = max(int(defective), 0)
+        return (self.produced, self.defective) != before
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Anlık özet + OEE (O(1)); pencere geçersizse "Geçerli" False."""
+        now = time.time() if now is None else now
+        covered = dict(self.covered)
+        if self.start is not None:
+            state, span = self._span(now)
+            if state is not None:
+                covered[state] += span
+            until = now if self.end is None else min(now, self.end)
+            elapsed_min = max(until - self.start, 0.0) / 60
+        else:
+            elapsed_min = 0.0
+        etud_min = round(elapsed_min - self.break_min - covered[BREAK_TYPE] / 60, 2)
+        snap: Dict[str, Any] = {
+            "Geçerli": etud_min > 0,
+            "Açık Duruşlar": sorted(self.open),
+            "Hatalı (adet)": self.defective,
+            "Olay": self.events,
+            "Zaman": now,
+        }
+        if etud_min <= 0:
+            return snap
+        planned = self.plain["Planlı"] + covered["Planlı"]
+        unplanned = self.plain["Plansız"] + covered["Plansız"]
+        snap.update(summary_values(etud_min, planned, unplanned, self.produced, self.unit_time))
+        snap.update(oee_values(etud_min, planned, unplanned, self.produced, self.defective, self.unit_time))
+        return snap
+
+
+def oee_values(etud_min: float, planned_sec: float, unplanned_sec: float,
+               produced: int, defective: int, unit_time: float) -> Dict[str, float]:
+    """Kullanılabilirlik, performans, kalite ve OEE (%); paydası 0 olan 0."""
+    loading = max(etud_min * 60 - planned_sec, 0.0)
+    running = max(etud_min * 60 - planned_sec - unplanned_sec, 0.0)
+    availability = running / loading if loading > 0 else 0.0
+    performance = produced * float(unit_time or 0) * 60 / running if running > 0 else 0.0
+    quality = max(produced - defective, 0) / produced if produced > 0 else 0.0
+    return {
+        "Kullanılabilirlik (%)": round(availability * 100, 2),
+        "Performans (%)": round(performance * 100, 2),
+        "Kalite (%)": round(quality * 100, 2),
+        "OEE (%)": round(availability * performance * quality * 100, 2),
+    }
+
+
+class Subscription:
+    """Hat başına yalnız son anlık değeri tutan posta kutusu.
+
+    `notify` verilmeyen ve `STALE_SEC` boyunca okunmayan abonelik (ör.
+    kapanmış bir tarayıcı sekmesi) hub tarafından düşürülür; `closed`
+    True olur, okuyan taraf yeniden abone olur.
+    """
+
+    def __init__(self, hub: "OeeHub", notify: Optional[Callable[[], None]] = None):
+        self._hub = hub
+        self._notify = notify
+        self._lock = threading.Lock()
+        self._latest: Dict[LineKey, Dict[str, Any]] = {}
+        self.last_read = time.time()
+        self.closed = False
+
+    def _push(self, key: LineKey, snap: Dict[str, Any]) -> None:
+        with self._lock:
+            self._latest[key] = snap
+        if self._notify is not None:
+            self._notify()
+
+    def drain(self) -> Dict[LineKey, Dict[str, Any]]:
+        """Son okumadan bu yana değişen hatların son değerleri (ve kutuyu boşalt)."""
+        with self._lock:
+            latest, self._latest = self._latest, {}
+        self.last_read = time.time()
+        return latest
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+    def _stale(self, now: float) -> bool:
+        return self._notify is None and now - self.last_read > STALE_SEC
+
+
+class OeeHub:
+    """Hatların canlı durumu ve aboneleri (iş parçacığı güvenli)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lines: Dict[LineKey, LineState] = {}
+        self._subscribers: List[Subscription] = []
+        self._callbacks: List[Callable[[LineKey, Dict[str, Any]], None]] = []
+
+    # abonelik
+    def subscribe(self, notify: Optional[Callable[[], None]] = None) -> Subscription:
+        """Posta kutusu aboneliği; `notify` her yeni değerde (kilit dışında) çağrılır."""
+        sub = Subscription(self, notify)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+            sub.closed = True
+
+    def on_update(self, callback: Callable[[LineKey, Dict[str, Any]], None]) -> None:
+        """Her güncellemede callback(hat, anlık değer) çağır."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    # güncelleme
+    def _update(self, key: LineKey, change: Callable[[LineState], bool]) -> Dict[str, Any]:
+        # değişiklik kilit altında uygulanır; yayın (aboneler) kilit dışında yapılır
+        with self._lock:
+            line = self._lines.get(key)
+            if line is None:
+                line = self._lines[key] = LineState()
+            now = time.time()
+            if not change(line):
+                return line.snapshot(now)
+            line.updated = now
+            snap = line.snapshot(now)
+            for sub in [s for s in self._subscribers if s._stale(now)]:
+                self._subscribers.remove(sub)
+                sub.closed = True
+            self._evict(now)
+            subscribers, callbacks = list(self._subscribers), list(self._callbacks)
+        for sub in subscribers:
+            sub._push(key, snap)
+        for callback in callbacks:
+            callback(key, snap)
+        return snap
+
+    def _evict(self, now: float) -> None:
+        # kilit altında çağrılır: penceresi çoktan bitmiş / uzun süre güncellenmeyen hatlar
+        for key in [k for k, line in self._lines.items() if _expired(line, now)]:
+            del self._lines[key]
+
+    def configure(self, key: LineKey, **params: Any) -> Dict[str, Any]:
+        """`LineState.configure` (start, end, unit_time, break_min)."""
+        return self._update(key, lambda line: line.configure(**params))
+
+    def track(self, key: LineKey, start: float, end: float, unit_time: float, break_min: float,
+              produced: int) -> bool:
+        """Etüdün penceresini ve sayımını hatta uygula (tek yayın).
+
+        Hattın güncel penceresi başladığında zaten bitmiş (eski) ya da
+        `LINE_TTL`'den önce bitmiş bir etüt hattı değiştirmez; o zaman False.
+        """
+        if end < time.time() - LINE_TTL:
+            return False
+        current = True
+
+        def change(line: LineState) -> bool:
+            nonlocal current
+            if line.start is not None and line.end is not None and end <= line.start:
+                current = False
+                return False
+            changed = line.configure(start=start, end=end, unit_time=unit_time, break_min=break_min)
+            return line.set_count(produced=produced) or changed
+
+        self._update(key, change)
+        return current
+
+    def apply_events(self, key: LineKey, events: List[Tuple[int, float, str, str, str]]) -> Dict[str, Any]:
+        """(seq, ts, olay, tür, açıklama) olaylarını sırayla uygula; tek yayın yapılır."""
+        def change(line: LineState) -> bool:
+            return sum(line.event(ts, action, tur) for _seq, ts, action, tur, _aciklama in sorted(events)) > 0
+        return self._update(key, change)
+
+    def add_stop(self, key: LineKey, tur: str, seconds: float) -> Dict[str, Any]:
+        return self._update(key, lambda line: line.add_stop(tur, seconds))
+
+    def set_count(self, key: LineKey, produced: Optional[int] = None, defective: Optional[int] = None) -> Dict[str, Any]:
+        return self._update(key, lambda line: line.set_count(produced, defective))
+
+    # okuma
+    def snapshot(self, key: LineKey, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            line = self._lines.get(key)
+            return line.snapshot(now) if line is not None else None
+
+    def snapshots(self, now: Optional[float] = None) -> Dict[LineKey, Dict[str, Any]]:
+        """Tüm hatların anlık değerleri (hat başına O(1))."""
+        with self._lock:
+            self._evict(time.time())
+            return {key: line.snapshot(now) for key, line in self._lines.items()}
+
+    def remove(self, key: LineKey) -> None:
+        with self._lock:
+            self._lines.pop(key, None)
+
+
+def _expired(line: LineState, now: float) -> bool:
+    # pencere bitişi belliyse ona, değilse son güncellemeye göre
+    return now - (line.end if line.end is not None else line.updated) > LINE_TTL
+
+
+def snapshot_rows(snaps: Dict[LineKey, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """{hat: anlık değer} -> tablo satırları (makine, vardiya sütunlarıyla)."""
+    return [{"Makine": m, "Vardiya": v, **snap} for (m, v), snap in sorted(snaps.items())]
+
+
+def track_study(key: LineKey, start_time: Any, end_time: Any, etud_date: Any, unit_time: Any,
+                break_time: Any, produced: int, hub: Optional[OeeHub] = None) -> bool:
+    """Arayüzdeki etüdün penceresini ve sayımını hatta yansıt (değişmediyse yayın yapılmaz).
+
+    Etüt hattın güncel penceresiyse True; değilse (eski etüt, geçersiz
+    pencere) hat değişmez, oturum duruşlarını hatta yazmamalıdır.
+    """
+    hub = hub or HUB
+    window = study_window(start_time, end_time, etud_date)
+    if window is None:
+        return False
+    return hub.track(key, window[0].timestamp(), window[1].timestamp(),
+                     float(unit_time or 0), float(break_time or 0), produced)
+
+
+HUB = OeeHub()
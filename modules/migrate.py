@@ -0,0 +1,301 @@
+# path: modules/migrate.py
+"""
+Eski kayıt dosyalarını kanonik, sürümlü biçime çeviren tek seferlik araç.
+
+    python -m modules.migrate                                  # veri_kaydi.json + data.json
+    python -m modules.migrate eski/veri_kaydi.json --store veri_kaydi.json
+    python -m modules.migrate --dry-run
+
+Depoda birkaç şema birarada:
+
+- veri_kaydi.json: "hatalar" + "Hata Adı"/"Hata Türü", eski adlı "ozet"
+- liste halinde tek satırlık özet kayıtları ("etud_date", "planned_stop_sec" ...)
+- "etud_info" + "errors" ("name"/"type"/"duration") kayıtları
+- data.json: operatör adıyla anahtarlanmış taslaklar ({"Kader": {...}})
+
+Hepsi `data_manager.study_record` biçimine (RECORD_VERSION, "surum" alanı)
+çevrilir; özet adları `compute_summary` sütunlarıyla aynı olur. data.json
+kayıtları operatörün ad alanına yazılır, boş taslaklar atlanır.
+
+Dosyalar bütünüyle belleğe alınmaz: üst düzey nesne `raw_decode` ile kayıt
+kayıt okunur ve depoya partiler halinde (parti başına bir transaction)
+yazılır. Ardından depoda kalan eski biçimli satırlar da yerinde çevrilir ve
+dosya VACUUM ile sıkıştırılır. Araç tekrar çalıştırılabilir; aynı içerik
+yeniden yazılmaz.
+
+Hedef deponun kendi JSON'u (veri_kaydi.json -> veri_kaydi.db) kaynaklar
+arasında olmasa da önce çevrilir ve depo "içe aktarıldı" diye işaretlenir;
+uygulama ilk açılışta o dosyayı bir daha okumaz.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from modules.data_manager import RECORD_VERSION, etud_info_from_record, study_record
+from modules.storage import (
+    DEFAULT_PATH, SHARED_NAMESPACE, _bump_version, _connect, _index_fields, _set_meta, _settle_version,
+    _upsert, db_path, operator_namespace, study_key,
+)
+
+DEFAULT_SOURCES = ("veri_kaydi.json", "data.json")
+
+# eski özet adı -> (kanonik ad, çarpan)
+_SUMMARY_ALIASES = {
+    "Toplam Süre (dk)": ("Etüt Süresi (dk)", 1),
+    "etud_duration_min": ("Etüt Süresi (dk)", 1),
+    "Planlı Duruş (dk)": ("Toplam Planlı Süre (sn)", 60),
+    "planned_stop_sec": ("Toplam Planlı Süre (sn)", 1),
+    "Plansız Duruş (dk)": ("Toplam Plansız Süre (sn)", 60),
+    "unplanned_stop_sec": ("Toplam Plansız Süre (sn)", 1),
+    "Kapasite Kullanım (%)": ("Kapasite Kullanımı (%)", 1),
+    "Gerçekleşen Üretim Adedi": ("Gerçekleşen Üretim (adet)", 1),
+    "actual_production": ("Gerçekleşen Üretim (adet)", 1),
+    "Planlanan Üretim Adedi": ("Planlanan Üretim (adet)", 1),
+    "planned_production": ("Planlanan Üretim (adet)", 1),
+}
+
+_DATED_KEY = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+# ---- akan JSON okuma ----
+def iter_json_object(path: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """Üst düzeyi nesne olan JSON dosyasının (anahtar, değer) çiftlerini sırayla üret.
+
+    Bellekte aynı anda en fazla bir değer ve bir okuma parçası tutulur.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buf, pos, eof = "", 0, False
+
+        def more() -> bool:
+            nonlocal buf, pos, eof
+            chunk = "" if eof else f.read(chunk_size)
+            eof = eof or not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            return bool(chunk)
+
+        def skip_ws() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or not more():
+                    return buf[pos] if pos < len(buf) else ""
+
+        def decode() -> Any:
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if more():
+                        continue
+                    raise
+                # tampon sonunda biten sayı / sabit yarım kalmış olabilir
+                if end == len(buf) and more():
+                    continue
+                pos = end
+                return value
+
+        def expect(char: str) -> None:
+            nonlocal pos
+            if skip_ws() != char:
+                raise ValueError(f"{path}: '{char}' bekleniyordu (konum ~{f.tell()})")
+            pos += 1
+
+        expect("{")
+        if skip_ws() == "}":
+            return
+        while True:
+            skip_ws()
+            key = decode()
+            expect(":")
+            skip_ws()
+            yield key, decode()
+            sep = skip_ws()
+            pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"{path}: ',' ya da '}}' bekleniyordu (konum ~{f.tell()})")
+
+
+# ---- kanonik biçim ----
+def canonical_summary(ozet: Any) -> Dict[str, Any]:
+    """Eski adlı özet bloğunu `compute_summary` sütun adlarına çevir."""
+    if not isinstance(ozet, dict):
+        return {}
+    out: Dict[str, Any] = {}
+    for name, value in ozet.items():
+        target, factor = _SUMMARY_ALIASES.get(name, (name, 1))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = round(value * factor, 2)
+        out.setdefault(target, value)
+    if "Toplam Duruş Süresi (sn)" not in out and (
+        "Toplam Planlı Süre (sn)" in out or "Toplam Plansız Süre (sn)" in out
+    ):
+        out["Toplam Duruş Süresi (sn)"] = round(
+            float(out.get("Toplam Planlı Süre (sn)", 0) or 0) + float(out.get("Toplam Plansız Süre (sn)", 0) or 0), 2
+        )
+    # türetilebilir (etüt süresi - duruşlar), kanonik özette yok
+    out.pop("Net Üretim Süresi (dk)", None)
+    return out
+
+
+def canonical_record(key: str, record: Any) -> Dict[str, Any]:
+    """Herhangi bir eski biçimdeki kaydı kanonik kayda çevir (kanonikse aynen döner)."""
+    if isinstance(record, dict) and record.get("surum") == RECORD_VERSION:
+        return record
+    etud_info, error_data = etud_info_from_record(record)
+    tarih, makine, _operator, _vardiya = _index_fields(key, record)
+    etud_info = (
+        etud_info[0] or "", etud_info[1] or makine, etud_info[2] or tarih, etud_info[3] or "",
+        *etud_info[4:],
+    )
+    if isinstance(record, dict):
+        summary = record.get("ozet")
+    else:
+        # liste biçimi: özet alanları kaydın kendisinde
+        summary = record[0] if isinstance(record, list) and record and isinstance(record[0], dict) else {}
+        summary = {k: v for k, v in summary.items() if k in _SUMMARY_ALIASES}
+    return study_record(etud_info, error_data, canonical_summary(summary))
+
+
+def _is_user_draft(key: str, value: Any) -> bool:
+    # data.json: {"<operatör>": {"etud_info": ..., "errors": [...], "ozet": {...}}}
+    return not _DATED_KEY.match(str(key)) and isinstance(value, dict) and "etud_info" in value
+
+
+def legacy_entries(path: str) -> Iterator[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    """Dosyadaki kayıtları (ad alanı, anahtar, kanonik kayıt) olarak üret; boş taslak için kayıt None."""
+    for key, value in iter_json_object(path):
+        if _is_user_draft(key, value):
+            if not value.get("etud_info") and not value.get("errors"):
+                yield operator_namespace(key), str(key), None
+                continue
+            record = canonical_record("", value)
+            if not record["operator"]:
+                record["operator"] = str(key)
+            yield operator_namespace(key), study_key(record["tarih"], record["makine"]), record
+        else:
+            yield SHARED_NAMESPACE, str(key), canonical_record(key, value)
+
+
+# ---- depoya yazma ----
+def _write_batch(conn, batch: List[Tuple[str, str, Dict[str, Any]]]) -> int:
+    """Partiyi tek transaction'da yaz; içeriği değişen kayıt sayısını döndür."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _bump_version(conn)
+        now = time.time()
+        written = sum(_upsert(conn, key, record, now, namespace) for namespace, key, record in batch)
+        _settle_version(conn, written > 0)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return written
+
+
+def migrate_file(path: str, store: str = DEFAULT_PATH, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Eski bir JSON dosyasını depoya akıt. Dönen sayılar: read, written, skipped."""
+    stats = {"read": 0, "written": 0, "skipped": 0}
+    batch: List[Tuple[str, str, Dict[str, Any]]] = []
+    # deponun kendi JSON'u (uygulamanın ilk açılışta içe aktaracağı dosya)
+    sibling = store if db_path(store) != store else None
+    with closing(_connect(db_path(store))) as conn:
+        imported = conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone()
+        if (not dry_run and not imported and sibling and os.path.exists(sibling)
+                and os.path.abspath(sibling) != os.path.abspath(path)):
+            for name, value in migrate_file(sibling, store, batch_size).items():
+                stats[name] += value
+        for namespace, key, record in legacy_entries(path):
+            stats["read"] += 1
+            if record is None:
+                stats["skipped"] += 1
+                continue
+            batch.append((namespace, key, record))
+            if len(batch) >= batch_size:
+                stats["written"] += 0 if dry_run else _write_batch(conn, batch)
+                batch.clear()
+        if batch and not dry_run:
+            stats["written"] += _write_batch(conn, batch)
+        if not dry_run and not imported:
+            # uygulama ilk açılışta deponun JSON'unu yeniden içe aktarmasın
+            _set_meta(conn, "legacy_imported", sibling or path)
+    return stats
+
+
+def migrate_store(store: str = DEFAULT_PATH, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Depoda kalan eski biçimli satırları yerinde çevir. Dönen sayılar: scanned, converted."""
+    stats = {"scanned": 0, "converted": 0}
+    last = 0
+    with closing(_connect(db_path(store))) as conn:
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, namespace, key, payload FROM studies WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last = rows[-1][0]
+            stats["scanned"] += len(rows)
+            batch = []
+            for _rowid, namespace, key, payload in rows:
+                record = json.loads(payload)
+                if not (isinstance(record, dict) and record.get("surum") == RECORD_VERSION):
+                    batch.append((namespace, key, canonical_record(key, record)))
+            stats["converted"] += len(batch)
+            if batch and not dry_run:
+                _write_batch(conn, batch)
+        if not dry_run:
+            _set_meta(conn, "record_format", RECORD_VERSION)
+    return stats
+
+
+def compact_store(store: str = DEFAULT_PATH) -> Tuple[int, int]:
+    """WAL'ı boşalt ve dosyayı VACUUM ile sıkıştır. (önceki, sonraki) bayt."""
+    db = db_path(store)
+    before = os.path.getsize(db) + (os.path.getsize(db + "-wal") if os.path.exists(db + "-wal") else 0)
+    with closing(_connect(db)) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    after = os.path.getsize(db) + (os.path.getsize(db + "-wal") if os.path.exists(db + "-wal") else 0)
+    return before, after
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Eski JSON kayıtlarını kanonik biçimde depoya aktarır ve depoyu sıkıştırır.",
+    )
+    parser.add_argument("sources", nargs="*", help="eski JSON dosyaları (varsayılan: var olanlar arasından %s)"
+                        % ", ".join(DEFAULT_SOURCES))
+    parser.add_argument("--store", default=DEFAULT_PATH, help="etüt deposu (varsayılan: %(default)s)")
+    parser.add_argument("--batch", type=int, default=500, help="transaction başına kayıt")
+    parser.add_argument("--dry-run", action="store_true", help="yalnızca say, yazma")
+    parser.add_argument("--no-vacuum", action="store_true", help="sonda VACUUM yapma")
+    args = parser.parse_args(argv)
+
+    sources = args.sources or [p for p in DEFAULT_SOURCES if os.path.exists(p)]
+    started = time.perf_counter()
+    for path in sources:
+        s = migrate_file(path, args.store, args.batch, args.dry_run)
+        print(f"{path}: okunan {s['read']}  yazılan {s['written']}  atlanan (boş) {s['skipped']}")
+    s = migrate_store(args.store, args.batch, args.dry_run)
+    print(f"depo: taranan {s['scanned']}  çevrilen {s['converted']}")
+    if not args.dry_run and not args.no_vacuum:
+        before, after = compact_store(args.store)
+        print(f"sıkıştırma: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+    print(f"süre: {time.perf_counter() - started:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
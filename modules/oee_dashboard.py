@@ -0,0 +1,60 @@
+# path: modules/oee_dashboard.py
+"""
+Canlı OEE panosu.
+
+Pano `live_oee.HUB`'a abone olur ve birkaç saniyede bir yalnız kendi
+bölümünü yeniden çalıştırır (`st.fragment(run_every=...)`). Her
+yenilemede posta kutusundan son değişen hatlar alınır; tablo hub'daki
+koşan toplamlardan çizilir (hat başına O(1)), duruş listeleri yeniden
+okunmaz ya da hesaplanmaz.
+"""
+
+import datetime
+
+import streamlit as st
+
+from modules.live_oee import HUB, OEE_COLUMNS, snapshot_rows
+
+REFRESH_SEC = 2
+
+_COLUMNS = [
+    "Makine", "Vardiya", "Açık Duruşlar", "Etüt Süresi (dk)",
+    "Kapasite Kullanımı (%)", "Gerçekleşme Oranı (%)", *OEE_COLUMNS,
+    "Gerçekleşen Üretim (adet)", "Hatalı (adet)", "Olay",
+]
+
+
+def _subscription(hub):
+    # oturum başına bir abonelik; uzun süre okunmadıysa hub düşürmüştür
+    sub = st.session_state.get("oee_sub")
+    if sub is None or sub.closed:
+        sub = st.session_state["oee_sub"] = hub.subscribe()
+    return sub
+
+
+@st.fragment(run_every=REFRESH_SEC)
+def render_oee_dashboard(hub=HUB):
+    import pandas as pd
+
+    changed = _subscription(hub).drain()
+    rows = snapshot_rows(hub.snapshots())
+    if not rows:
+        st.info("Henüz canlı veri yok. Etüt formu doldurulduğunda ya da veri alma servisine olay geldiğinde hatlar burada görünür.")
+        return
+
+    machines = sorted({r["Makine"] for r in rows})
+    selected = st.multiselect("Makine", machines, key="oee_machines")
+    if selected:
+        rows = [r for r in rows if r["Makine"] in selected]
+
+    valid = [r for r in rows if r["Geçerli"]]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Ortalama OEE", f"{sum(r['OEE (%)'] for r in valid) / len(valid):.1f} %" if valid else "—")
+    col2.metric("Duruştaki hat", sum(bool(r["Açık Duruşlar"]) for r in rows))
+    col3.metric("Hat", len(rows))
+
+    df = pd.DataFrame(rows).reindex(columns=_COLUMNS)
+    df["Açık Duruşlar"] = df["Açık Duruşlar"].map(lambda kinds: ", ".join(kinds) if isinstance(kinds, list) else "")
+    st.dataframe(df, hide_index=True)
+    updated = ", ".join(f"{m} / {v}" for m, v in sorted(changed)) or "—"
+    st.caption(f"Son yenilemeden bu yana güncellenen: {updated} · {datetime.datetime.now():%H:%M:%S}")
@@ -0,0 +1,207 @@
+# path: modules/perf.py
+"""
+Rerun süre ölçümü ve fonksiyon profili.
+
+Sayfa bölümleri `section_timer` ile sarılır; her bölümün son çalışmasının
+süresi (ms) oturumda tutulur ve kenar çubuğundaki panelde gösterilir.
+Fragment olarak yeniden çalışan bölümlerin süresi kendi çalışmalarında
+güncellenir; panel bir sonraki tam sayfa çalışmasında yenilenir.
+
+Sıcak yoldaki fonksiyonlar `@instrument` ile işaretlenir. Profil varsayılan
+olarak kapalıdır; kapalıyken sarmalayıcı tek bir bayrak kontrolü yapar.
+Açıkken her çalışma için fonksiyon başına çağrı sayısı ve toplam/en uzun
+süre toplanır. Paneldeki anahtar yalnız o oturumu etkiler (bayrak oturumun
+iş parçacığındadır); diğer kullanıcıların profili açılıp kapanmaz.
+ZAMAN_ETUDU_PROFIL=1 tüm oturumlar için varsayılanı açar ve tracemalloc'u
+da başlatır: tepe bellek yalnız bu durumda ölçülür (izleme tüm süreci
+yavaşlattığı için oturumdan açılmaz). ZAMAN_ETUDU_PROFIL_JSONL=<dosya>
+verilirse her çalışmanın sonuçları satır satır JSON olarak eklenir.
+
+Bu modül depo ve rapor modüllerinden de yüklendiği için Streamlit'i yalnızca
+panel fonksiyonlarında içe aktarır.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_SECTIONS = "_perf_sections"
+_RUN_START = "_perf_run_start"
+
+# ortam değişkeniyle süreç genelinde açık (varsayılan + bellek izleme)
+_ENABLED = os.environ.get("ZAMAN_ETUDU_PROFIL", "") not in ("", "0")
+_JSONL_PATH: Optional[str] = os.environ.get("ZAMAN_ETUDU_PROFIL_JSONL") or None
+
+# açık/kapalı bayrağı ve aktif çalışmanın istatistikleri iş parçacığına
+# bağlıdır (Streamlit her oturumun betiğini ayrı iş parçacığında çalıştırır);
+# çalışma dışındaki çağrılar ortak sözlüğe yazılır
+_local = threading.local()
+_GLOBAL_STATS: Dict[str, List[float]] = {}
+_STATS_LOCK = threading.Lock()
+
+
+# ---- fonksiyon profili ----
+def is_enabled() -> bool:
+    """Bu iş parçacığında (oturumda) profil açık mı?"""
+    return _local.__dict__.get("on", _ENABLED)
+
+
+def set_enabled(enabled: bool, jsonl_path: Optional[str] = None) -> None:
+    """Bu iş parçacığında profili aç/kapat; jsonl_path verilirse çalışma sonuçları oraya eklenir.
+
+    Bellek izlemeyi başlatmaz (bkz. ZAMAN_ETUDU_PROFIL).
+    """
+    global _JSONL_PATH
+    _local.on = bool(enabled)
+    if jsonl_path is not None:
+        _JSONL_PATH = jsonl_path or None
+
+
+def _ensure_tracing() -> None:
+    if _ENABLED and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _stats() -> Dict[str, List[float]]:
+    stats = getattr(_local, "stats", None)
+    return _GLOBAL_STATS if stats is None else stats
+
+
+def _record(name: str, ms: float, peak: int) -> None:
+    stats = _stats()
+    with _STATS_LOCK:
+        row = stats.get(name)
+        if row is None:
+            stats[name] = [1, ms, ms, peak]
+        else:
+            row[0] += 1
+            row[1] += ms
+            row[2] = max(row[2], ms)
+            row[3] = max(row[3], peak)
+
+
+def instrument(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Çağrı sayısı, süre ve tepe belleği profil açıkken kaydeden dekoratör."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _local.__dict__.get("on", _ENABLED):
+            return func(*args, **kwargs)
+        # iç içe çağrılarda reset_peak dıştakinin tepesini silmesin diye
+        # her seviye gördüğü en yüksek değeri yığında taşır
+        tracing = tracemalloc.is_tracing()
+        stack = _local.__dict__.setdefault("mem_stack", [])
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            stack.append([current, 0])
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            peak_bytes = 0
+            if tracing and stack:
+                start, seen = stack.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], seen)
+                peak_bytes = max(peak - start, 0)
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak)
+            _record(name, ms, peak_bytes)
+
+    return wrapper
+
+
+def begin_profile() -> None:
+    """Bu iş parçacığında yeni bir çalışma için boş istatistik başlat."""
+    _ensure_tracing()
+    _local.stats = {}
+    _local.mem_stack = []
+
+
+def end_profile(run: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Çalışmanın fonksiyon istatistiklerini döndür (ve JSONL'e ekle).
+
+    `begin_profile` çağrılmadıysa çalışma dışındaki ortak istatistikler
+    döner ve sıfırlanır.
+    """
+    stats = _stats()
+    with _STATS_LOCK:
+        rows = [
+            {"func": name, "calls": int(c), "ms": round(total, 2), "max_ms": round(mx, 2),
+             "peak_kb": round(peak / 1024, 1)}
+            for name, (c, total, mx, peak) in sorted(stats.items(), key=lambda kv: -kv[1][1])
+        ]
+        stats.clear()
+    if _JSONL_PATH and rows:
+        stamp = time.time()
+        with open(_JSONL_PATH, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"ts": stamp, "run": run, **row}, ensure_ascii=False) + "\n")
+    _local.stats = None
+    return rows
+
+
+# ---- bölüm süreleri (Streamlit) ----
+def _sections() -> Dict[str, Tuple[float, float]]:
+    import streamlit as st
+    return st.session_state.setdefault(_SECTIONS, {})
+
+
+def start_run() -> None:
+    """Tam sayfa çalışmasının başlangıcını işaretle (betiğin en üstünde çağrılır)."""
+    import streamlit as st
+    st.session_state[_RUN_START] = time.perf_counter()
+    # oturumun bayrağı bu çalışmanın iş parçacığına taşınır (süreç geneli değişmez)
+    set_enabled(st.session_state.get("perf_profile", _ENABLED))
+    if is_enabled():
+        begin_profile()
+    else:
+        _local.stats = None
+
+
+@contextmanager
+def section_timer(name: str) -> Iterator[None]:
+    """Bloğun süresini `name` bölümü için kaydet."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _sections()[name] = ((time.perf_counter() - t0) * 1000, time.time())
+
+
+def render_perf_panel() -> None:
+    """Kenar çubuğunda bölüm başına son süreleri (ms) ve fonksiyon profilini göster."""
+    import streamlit as st
+    started = st.session_state.get(_RUN_START)
+    if started is not None:
+        _sections().pop("Sayfa (toplam)", None)   # listenin sonunda dursun
+        _sections()["Sayfa (toplam)"] = ((time.perf_counter() - started) * 1000, time.time())
+    with st.sidebar.expander("⏱️ Bölüm süreleri (ms)", expanded=False):
+        rows = [
+            {"Bölüm": name, "ms": round(ms, 1), "Son çalışma": time.strftime("%H:%M:%S", time.localtime(at))}
+            for name, (ms, at) in _sections().items()
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.caption("Henüz ölçüm yok.")
+
+        profiled = getattr(_local, "stats", None) is not None
+        func_rows = end_profile(run=time.strftime("%Y-%m-%dT%H:%M:%S")) if profiled else []
+        st.toggle("🔬 Fonksiyon profili", value=_ENABLED, key="perf_profile",
+                  help="Yalnız bu oturumda, sonraki çalışmadan itibaren süre ve çağrı sayısı toplar.")
+        if func_rows:
+            st.dataframe(func_rows, hide_index=True)
+            if not tracemalloc.is_tracing():
+                st.caption("Tepe bellek için sunucuyu ZAMAN_ETUDU_PROFIL=1 ile başlatın.")
+            if _JSONL_PATH:
+                st.caption(f"JSONL: {_JSONL_PATH}")
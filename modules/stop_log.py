@@ -0,0 +1,255 @@
+# path: modules/stop_log.py
+"""
+Duruş kayıtları için sıkı (sütunlu) bellek içi kap.
+
+`st.session_state["error_data"]` eskiden her duruş için uzun Türkçe
+anahtarlı bir sözlük tutan bir listeydi ve her rerun'da yeniden DataFrame'e
+çevriliyordu. `StopLog` aynı veriyi sütunlar halinde tutar:
+
+- duruş türü: tür tablosuna tam sayı kod (kategorik; tür sayısı sınırsız),
+- süre: int64 saniye,
+- açıklama: tekilleştirilmiş (intern) metin tablosuna int32 indeks,
+- her duruşa kalıcı bir kimlik (id); silme kimlikle yapılır,
+- diğer alanlar (ör. "Başlangıç"/"Bitiş" saatleri) seyrek bir sözlükte.
+
+Sona ekleme O(1), kimlikle silme O(log n) (silinenler işaretlenir, sonra
+toplu sıkıştırılır). DataFrame görünümü ve özet girdileri sürüm numarasıyla
+önbelleklenir; içerik değişmedikçe yeniden kurulmaz.
+
+Liste gibi davranır (len, döngü, indeks, append, pop) ve döngüde eski
+sözlük biçimini ({"Duruş Türü", "Süre (sn)", "Açıklama"}) üretir; bu yüzden
+errors.py ve data_manager.py değişmeden çalışır.
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.intervals import stop_span
+
+if TYPE_CHECKING:  # DataFrame görünümü istenene kadar pandas yüklenmez
+    import pandas as pd
+
+STOP_TYPES = ("Planlı", "Plansız")
+
+_CORE_KEYS = ("Duruş Türü", "Süre (sn)", "Açıklama")
+
+
+class StopLog:
+    """Sütunlu duruş listesi (bkz. modül açıklaması)."""
+
+    __slots__ = (
+        "_ids", "_types", "_secs", "_desc", "_alive", "_dead",
+        "_type_labels", "_type_index", "_labels", "_label_index",
+        "_extra", "_next_id", "_version", "_cache",
+    )
+
+    def __init__(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        self._ids = array("q")
+        self._types = array("l")
+        self._secs = array("q")
+        self._desc = array("l")
+        self._alive = bytearray()
+        self._dead = 0
+        self._type_labels: List[str] = list(STOP_TYPES)
+        self._type_index: Dict[str, int] = {t: i for i, t in enumerate(STOP_TYPES)}
+        self._labels: List[str] = []
+        self._label_index: Dict[str, int] = {}
+        self._extra: Dict[int, Dict[str, Any]] = {}   # çekirdek dışı alanlar (seyrek)
+        self._next_id = 0
+        self._version = 0
+        self._cache: Dict[str, Tuple[int, Any]] = {}
+        for rec in records or []:
+            self.append(rec)
+
+    # ---- dönüştürme ----
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "StopLog":
+        """Eski sözlük listesinden kur ("Hata Türü" adı da okunur)."""
+        return records if isinstance(records, cls) else cls(records)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[int, Dict[str, Any]]]) -> "StopLog":
+        """(kimlik, kayıt) çiftlerinden kimlikleri koruyarak kur (kimlikler artan sırada)."""
+        log = cls()
+        for stop_id, record in items:
+            if stop_id < log._next_id:
+                raise ValueError(f"kimlikler artan sırada olmalı: {stop_id}")
+            log._next_id = stop_id
+            log.append(record)
+        return log
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Eski sözlük listesi biçimine çevir (JSON'a yazılabilir)."""
+        return list(self)
+
+    # ---- ekleme / silme ----
+    def _intern(self, table: List[str], index: Dict[str, int], value: str) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Duruş ekle; kalıcı kimliğini döndürür."""
+        kind = record.get("Duruş Türü", record.get("Hata Türü", ""))
+        stop_id = self._next_id
+        self._next_id += 1
+        self._ids.append(stop_id)
+        self._types.append(self._intern(self._type_labels, self._type_index, str(kind)))
+        self._secs.append(int(round(float(record.get("Süre (sn)", 0) or 0))))
+        self._desc.append(self._intern(self._labels, self._label_index, str(record.get("Açıklama", "") or "")))
+        self._alive.append(1)
+        extra = {k: v for k, v in record.items() if k not in _CORE_KEYS and k != "Hata Türü"}
+        if extra:
+            self._extra[stop_id] = extra
+        self._version += 1
+        return stop_id
+
+    def _slot(self, stop_id: int) -> int:
+        slot = bisect_left(self._ids, stop_id)
+        if slot == len(self._ids) or self._ids[slot] != stop_id or not self._alive[slot]:
+            raise KeyError(stop_id)
+        return slot
+
+    def delete(self, stop_id: int) -> None:
+        """Kimliği verilen duruşu sil."""
+        slot = self._slot(stop_id)
+        self._alive[slot] = 0
+        self._dead += 1
+        self._extra.pop(stop_id, None)
+        self._version += 1
+        if self._dead > 32 and self._dead * 2 > len(self._ids):
+            self._compact()
+
+    def pop(self, index: int = -1) -> Dict[str, Any]:
+        """Listedeki sıraya göre sil (eski `list.pop` uyumluluğu)."""
+        self._compact()
+        stop_id = self._ids[index]
+        record = self._record(self._slot(stop_id))
+        self.delete(stop_id)
+        return record
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def _compact(self) -> None:
+        """Silinmiş işaretli satırları sütunlardan topluca at."""
+        if not self._dead:
+            return
+        keep = [i for i, a in enumerate(self._alive) if a]
+        self._ids = array("q", (self._ids[i] for i in keep))
+        self._types = array("l", (self._types[i] for i in keep))
+        self._secs = array("q", (self._secs[i] for i in keep))
+        self._desc = array("l", (self._desc[i] for i in keep))
+        self._alive = bytearray(b"\x01" * len(keep))
+        self._dead = 0
+
+    # ---- okuma ----
+    def _record(self, slot: int) -> Dict[str, Any]:
+        rec = {
+            "Duruş Türü": self._type_labels[self._types[slot]],
+            "Süre (sn)": self._secs[slot],
+            "Açıklama": self._labels[self._desc[slot]],
+        }
+        extra = self._extra.get(self._ids[slot])
+        if extra:
+            rec.update(extra)
+        return rec
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._dead
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for slot, alive in enumerate(self._alive):
+            if alive:
+                yield self._record(slot)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        self._compact()
+        return self._record(range(len(self._ids))[index])
+
+    def items(self, since: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(kimlik, kayıt) çiftleri; since verilirse yalnızca kimliği >= since olanlar."""
+        for slot in range(bisect_left(self._ids, since) if since else 0, len(self._ids)):
+            if self._alive[slot]:
+                yield self._ids[slot], self._record(slot)
+
+    def ids(self) -> List[int]:
+        """Canlı duruşların kimlikleri (eklenme sırasıyla)."""
+        return [i for i, alive in zip(self._ids, self._alive) if alive]
+
+    @property
+    def next_id(self) -> int:
+        """Sıradaki eklemenin alacağı kimlik (kimlikler hep artar)."""
+        return self._next_id
+
+    @property
+    def version(self) -> int:
+        """Her değişiklikte artan sayaç."""
+        return self._version
+
+    def _cached(self, name: str, build):
+        hit = self._cache.get(name)
+        if hit is not None and hit[0] == self._version:
+            return hit[1]
+        value = build()
+        self._cache[name] = (self._version, value)
+        return value
+
+    def to_frame(self) -> "pd.DataFrame":
+        """_to_stops_df ile aynı sütunlarda DataFrame (kategorik tür/açıklama).
+
+        Sonuç önbelleklenir ve paylaşılır; değiştirmeden önce kopyalayın.
+        """
+        def build() -> "pd.DataFrame":
+            import numpy as np
+            import pandas as pd
+            self._compact()
+            return pd.DataFrame({
+                "Duruş Türü": pd.Categorical.from_codes(
+                    np.frombuffer(self._types, dtype=np.dtype(f"i{self._types.itemsize}")).copy(), categories=self._type_labels),
+                "Süre (sn)": np.frombuffer(self._secs, dtype=np.int64).copy(),
+                "Açıklama": pd.Categorical.from_codes(
+                    np.frombuffer(self._desc, dtype=np.dtype(f"i{self._desc.itemsize}")).copy(),
+                    categories=self._labels),
+            })
+        return self._cached("frame", build)
+
+    def stop_items(self) -> Tuple[Tuple[Any, ...], ...]:
+        """summary_core.stop_items ile aynı çıktı, sürüm başına bir kez kurulur."""
+        def build():
+            labels, types, secs, ids, extra = self._type_labels, self._types, self._secs, self._ids, self._extra
+            items = []
+            for slot, alive in enumerate(self._alive):
+                if alive:
+                    item = (labels[types[slot]], float(secs[slot]))
+                    more = extra.get(ids[slot])
+                    items.append(item + (stop_span(more) or ()) if more else item)
+            return tuple(items)
+        return self._cached("items", build)
+
+    def fingerprint(self) -> str:
+        """İçerik özeti (tür + süre + açıklama); önbellek anahtarı için."""
+        def build() -> str:
+            self._compact()
+            h = hashlib.sha1()
+            h.update(self._types.tobytes()); h.update(self._secs.tobytes()); h.update(self._desc.tobytes())
+            h.update("\x1f".join(self._type_labels).encode("utf-8"))
+            h.update("\x1f".join(self._labels).encode("utf-8"))
+            h.update(repr(sorted(self._extra.items())).encode("utf-8"))
+            return h.hexdigest()
+        return self._cached("fingerprint", build)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (StopLog, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"StopLog({len(self)} duruş)"
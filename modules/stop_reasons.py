@@ -0,0 +1,227 @@
+# path: modules/stop_reasons.py
+"""
+Duruş nedeni indeksi (Pareto / en çok N neden).
+
+Serbest metin açıklamalar kanonik bir koda indirgenir ("Sensör",
+" sensör ", "SENSOR" -> "sensor"): Türkçe büyük/küçük harf kuralları, boşluk
+ve Türkçe karakterler normalize edilir. Her kodun gün x makine x duruş türü
+bazında toplam süresi ve adedi bir tabloda tutulur; tablo depo yazma
+kancasıyla kayıtla aynı transaction içinde güncellenir. Böylece
+"bu çeyrekte tüm makinelerde en çok süren 10 plansız duruş" sorusu ham
+kayıtlar taranmadan yanıtlanır:
+
+    top_reasons(n=10, tur="Plansız", **quarter_range(datetime.date.today()))
+"""
+
+import datetime
+import json
+import re
+import sqlite3
+import unicodedata
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from modules.data_manager import etud_info_from_record
+from modules.storage import (
+    DEFAULT_PATH, _connect, _index_fields, derived_in_sync, derived_is_fresh,
+    mark_derived_synced, register_write_hook,
+)
+from modules.summary_core import _to_stops_df
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS stop_reason_daily (
+    tarih     TEXT NOT NULL,
+    makine    TEXT NOT NULL,
+    tur       TEXT NOT NULL,
+    kod       TEXT NOT NULL,
+    total_sec REAL NOT NULL,
+    adet      INTEGER NOT NULL,
+    PRIMARY KEY (tarih, makine, tur, kod)
+)""",
+    "CREATE INDEX IF NOT EXISTS ix_reason_tur_tarih ON stop_reason_daily(tur, tarih)",
+    """
+CREATE TABLE IF NOT EXISTS stop_reason_labels (
+    kod    TEXT PRIMARY KEY,
+    etiket TEXT NOT NULL
+)""",
+)
+
+_VERSION_KEY = "reason_version"
+
+UNKNOWN_CODE = "tanimsiz"
+
+# Türkçe harfleri ASCII karşılığına indir (İ/I kuralları casefold'dan önce)
+_TR_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+_TR_FOLD = str.maketrans({"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u"})
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_reason(text: Any) -> str:
+    """Serbest metin duruş açıklamasını kanonik koda çevir ("Dizgi  Ayarı" -> "dizgi_ayari")."""
+    if text is None or (isinstance(text, float) and text != text):
+        return UNKNOWN_CODE
+    s = str(text).translate(_TR_UPPER).lower().translate(_TR_FOLD)
+    # kalan aksanlı harfler (é, â, ...) için
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    s = _NON_WORD.sub("_", s).strip("_")
+    return s or UNKNOWN_CODE
+
+
+# ---- kayıt katkısı ----
+def _reason_totals(key: str, record: Any) -> List[Tuple[str, str, str, str, str, float, int]]:
+    """Tek kaydın (tarih, makine, tur, kod) bazında katkısı.
+
+    Yazma kancasında her kayıt için çalıştığından DataFrame kurmadan,
+    `etud_info_from_record`'un kanonik duruş sözlükleri üzerinden toplanır.
+    """
+    tarih, makine, _op, _vd = _index_fields(key, record)
+    _etud_info, error_data = etud_info_from_record(record)
+    totals: Dict[Tuple[str, str], List[Any]] = {}
+    for e in error_data:
+        kod = normalize_reason(e["Açıklama"])
+        slot = totals.setdefault((str(e["Duruş Türü"]), kod), [e["Açıklama"], 0.0, 0])
+        slot[1] += float(e["Süre (sn)"] or 0)
+        slot[2] += 1
+    return [(tarih, makine, tur, kod, label, sec, n) for (tur, kod), (label, sec, n) in totals.items()]
+
+
+def _apply(conn: sqlite3.Connection, totals: Iterable[Tuple[Any, ...]], sign: int) -> None:
+    """totals: (tarih, makine, tur, kod, etiket, saniye, adet) satırları."""
+    totals = list(totals)
+    rows = [(t, m, tur, kod, sign * float(sec), sign * int(n)) for t, m, tur, kod, _lbl, sec, n in totals]
+    conn.executemany(
+        """
+        INSERT INTO stop_reason_daily (tarih, makine, tur, kod, total_sec, adet)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(tarih, makine, tur, kod) DO UPDATE SET
+            total_sec = total_sec + excluded.total_sec, adet = adet + excluded.adet
+        """,
+        rows,
+    )
+    if sign > 0:
+        conn.executemany(
+            "INSERT OR IGNORE INTO stop_reason_labels (kod, etiket) VALUES (?, ?)",
+            [(kod, str(lbl).strip() or kod) for _t, _m, _tur, kod, lbl, _sec, _n in totals],
+        )
+    else:
+        conn.executemany(
+            "DELETE FROM stop_reason_daily WHERE tarih = ? AND makine = ? AND tur = ? AND kod = ? AND adet <= 0",
+            [row[:4] for row in rows],
+        )
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    for stmt in _SCHEMA:
+        conn.execute(stmt)
+
+
+def _on_write(conn: sqlite3.Connection, key: str, old: Any, new: Any) -> None:
+    """Depo yazma kancası: eski kaydın katkısını çıkar, yenisini ekle."""
+    _ensure_schema(conn)
+    if not derived_in_sync(conn, _VERSION_KEY):
+        return  # indeks zaten eski; ilk sorguda baştan kurulacak
+    if old is not None:
+        _apply(conn, _reason_totals(key, old), -1)
+    if new is not None:
+        _apply(conn, _reason_totals(key, new), +1)
+    mark_derived_synced(conn, _VERSION_KEY)
+
+
+register_write_hook(_on_write, _VERSION_KEY)
+
+
+# ---- bakım ----
+def rebuild_reason_index(path: str = DEFAULT_PATH) -> int:
+    """İndeksi tüm kayıtlardan tek bir uzun tablo üzerinden baştan kur."""
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _ensure_schema(conn)
+            conn.execute("DELETE FROM stop_reason_daily")
+            stops: List[Dict[str, Any]] = []
+            dims: Dict[str, List[str]] = {"tarih": [], "makine": []}
+            n = 0
+            for key, payload in conn.execute("SELECT key, payload FROM studies").fetchall():
+                record = json.loads(payload)
+                tarih, makine, _op, _vd = _index_fields(key, record)
+                _info, error_data = etud_info_from_record(record)
+                stops.extend(error_data)
+                dims["tarih"].extend([tarih] * len(error_data))
+                dims["makine"].extend([makine] * len(error_data))
+                n += 1
+            df = _to_stops_df(stops)
+            if not df.empty:
+                df = df.assign(
+                    tarih=dims["tarih"], makine=dims["makine"],
+                    tur=df["Duruş Türü"].astype(str),
+                    kod=df["Açıklama"].map(normalize_reason),
+                    sec=pd.to_numeric(df["Süre (sn)"], errors="coerce").fillna(0),
+                )
+                totals = df.groupby(["tarih", "makine", "tur", "kod"], sort=False).agg(
+                    etiket=("Açıklama", "first"), total_sec=("sec", "sum"), adet=("sec", "size"),
+                ).reset_index()
+                _apply(conn, totals.itertuples(index=False, name=None), +1)
+            mark_derived_synced(conn, _VERSION_KEY)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return n
+
+
+# ---- sorgu ----
+def quarter_range(day: datetime.date) -> Dict[str, str]:
+    """Verilen günün çeyreği: {"start_date": ..., "end_date": ...}."""
+    q0 = (day.month - 1) // 3 * 3 + 1
+    start = datetime.date(day.year, q0, 1)
+    nxt = datetime.date(day.year + (q0 == 10), (q0 + 3 - 1) % 12 + 1, 1)
+    return {"start_date": start.isoformat(), "end_date": (nxt - datetime.timedelta(days=1)).isoformat()}
+
+
+def top_reasons(
+    path: str = DEFAULT_PATH,
+    n: Optional[int] = 10,
+    tur: Optional[str] = None,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machines: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """En çok süren duruş nedenleri (Pareto sırası).
+
+    tur: "Planlı" / "Plansız" / None (hepsi). n=None tüm nedenleri döndürür.
+    "Pay (%)" ve "Kümülatif Pay (%)" filtreye uyan tüm duruş süresine göredir.
+    """
+    where, params = [], []
+    if tur is not None:
+        where.append("d.tur = ?"); params.append(tur)
+    if start_date is not None:
+        where.append("d.tarih >= ?"); params.append(str(start_date))
+    if end_date is not None:
+        where.append("d.tarih <= ?"); params.append(str(end_date))
+    if machines is not None:
+        machines = list(machines)
+        where.append(f"d.makine IN ({', '.join('?' * len(machines))})"); params.extend(machines)
+    sql = (
+        "SELECT d.kod, COALESCE(l.etiket, d.kod), SUM(d.total_sec), SUM(d.adet) "
+        "FROM stop_reason_daily d LEFT JOIN stop_reason_labels l ON l.kod = d.kod"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " GROUP BY d.kod ORDER BY SUM(d.total_sec) DESC"
+    )
+
+    with closing(_connect(path)) as conn:
+        _ensure_schema(conn)
+        if not derived_is_fresh(conn, _VERSION_KEY):
+            rebuild_reason_index(path)
+        rows = conn.execute(sql, params).fetchall()
+
+    df = pd.DataFrame(rows, columns=["Kod", "Açıklama", "total_sec", "Adet"])
+    total = df["total_sec"].sum()
+    share = df["total_sec"] / total * 100 if total > 0 else df["total_sec"] * 0
+    df["Toplam Süre (dk)"] = (df["total_sec"] / 60).round(2)
+    df["Pay (%)"] = share.round(2)
+    df["Kümülatif Pay (%)"] = share.cumsum().round(2)
+    df = df.drop(columns="total_sec")[["Kod", "Açıklama", "Toplam Süre (dk)", "Adet", "Pay (%)", "Kümülatif Pay (%)"]]
+    return df.head(n) if n is not None else df
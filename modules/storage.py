@@ -1,18 +1,735 @@
-# path: modules/storage.py
-
-import json
-import os
-
-def load_data(path="veri_kaydi.json"):
-    if not os.path.exists(path):
-        return {}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        # bozuk dosyayı kurtarmak için boş sözlük döndür
-        return {}
-
-def save_data(data, file_path="veri_kaydi.json"):
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# path: modules/storage.py
+"""
+Etüt kayıt deposu.
+
+Kayıtlar eskiden tek bir JSON dosyasına (veri_kaydi.json) her kayıtta baştan
+yazılıyordu. Artık aynı isimli bir SQLite dosyasında (veri_kaydi.db) satır
+satır tutuluyor:
+
+- tek etüt kaydetmek tek satırlık bir UPSERT'tir (tüm geçmişi yeniden yazmaz),
+- yazmalar transaction içinde, atomiktir; iki oturum birbirinin kaydını ezmez,
+- kayıtlar ad alanı içinde "<tarih>_<makine>" anahtarıyla tutulur; tarih ve
+  makine ve operatör ayrıca indekslidir, tarih aralığı / makine / operatör
+  sorguları tüm dosyayı okumaz.
+
+Eski JSON dosyası varsa veritabanı ilk açılışta ondan bir kez doldurulur.
+`load_data` / `save_data` imzaları değişmedi.
+
+Aynı sunucuyu birden çok operatör kullanır. Kayıtlar ad alanlarına ayrılır
+(birincil anahtar (namespace, key)): her operatör kendi ad alanına yazar,
+böylece aynı gün aynı makinede çalışan iki operatör birbirinin etüdünü
+ezmez. Eski kayıtlar ve `load_data` / `save_data` ortak ad alanında ("")
+kalır; `save_data` yalnızca kendi ad alanını eşitler.
+
+Kilitleme SQLite'ındır: her yazma kısa bir BEGIN IMMEDIATE transaction'ıdır
+(tek satır), okumalar WAL sayesinde beklemez. Kayıp güncellemeye karşı
+iyimser eşzamanlılık: `read_study` kaydı sürümüyle döndürür; `save_study` /
+`delete_study`'ye `expected_version` verilirse satır o arada değiştiyse
+`ConcurrentUpdateError` yükselir (0: kayıt henüz yok demektir).
+
+Şema sürümü `PRAGMA user_version` ile tutulur; eski dosyalar ilk açılışta
+yerinde taşınır.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from modules.perf import instrument
+
+DEFAULT_PATH = "veri_kaydi.json"
+
+SHARED_NAMESPACE = ""
+
+# PRAGMA user_version: 0 = tek anahtarlı ilk şema, 1 = (namespace, key)
+SCHEMA_VERSION = 1
+
+_STUDIES_TABLE = """
+CREATE TABLE IF NOT EXISTS studies (
+    namespace  TEXT NOT NULL DEFAULT '',
+    key        TEXT NOT NULL,
+    tarih      TEXT,
+    makine     TEXT,
+    operator   TEXT,
+    vardiya    TEXT,
+    payload    TEXT NOT NULL,
+    version    INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)"""
+
+_SCHEMA = _STUDIES_TABLE + """;
+CREATE INDEX IF NOT EXISTS ix_studies_tarih ON studies(tarih);
+CREATE INDEX IF NOT EXISTS ix_studies_makine_tarih ON studies(makine, tarih);
+CREATE INDEX IF NOT EXISTS ix_studies_operator_tarih ON studies(operator, tarih);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS capture_events (
+    oturum   TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    ts       REAL NOT NULL,
+    olay     TEXT NOT NULL,
+    tur      TEXT NOT NULL,
+    aciklama TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (oturum, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS draft_ops (
+    taslak  TEXT NOT NULL,
+    seq     INTEGER NOT NULL,
+    kind    TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    ts      REAL NOT NULL,
+    PRIMARY KEY (taslak, seq)
+) WITHOUT ROWID;
+"""
+
+# şeması hazırlanmış veritabanı dosyaları (süreç başına bir kez)
+_READY = set()
+
+# yazma kancaları: hook(conn, key, old_record, new_record) — aynı transaction içinde
+# çağrılır; ekleme için old_record, silme için new_record None'dır.
+_WRITE_HOOKS: List[Callable[[sqlite3.Connection, str, Any, Any], None]] = []
+
+# kancaların beslediği türetilmiş tabloların sürüm anahtarları (meta tablosunda)
+_DERIVED_KEYS: List[str] = []
+
+
+class ConcurrentUpdateError(RuntimeError):
+    """Kayıt okunduktan sonra başka bir oturum tarafından değiştirildi."""
+
+    def __init__(self, key: str, expected: int, actual: int, namespace: str = SHARED_NAMESPACE):
+        self.key, self.expected, self.actual, self.namespace = key, expected, actual, namespace
+        where = f"{namespace}/{key}" if namespace else key
+        super().__init__(f"{where}: beklenen sürüm {expected}, depodaki sürüm {actual}")
+
+
+# ---- yardımcılar ----
+def study_key(tarih: Any, makine: str) -> str:
+    """Kayıt anahtarı: "<tarih>_<makine>"."""
+    return f"{tarih}_{makine}"
+
+
+def operator_namespace(operator: Any) -> str:
+    """Operatörün ad alanı (büyük/küçük harf ve boşluk farkı aynı operatördür)."""
+    return " ".join(str(operator or "").split()).casefold()
+
+
+def db_path(path: str = DEFAULT_PATH) -> str:
+    """veri_kaydi.json -> veri_kaydi.db (diğer uzantılar olduğu gibi)."""
+    root, ext = os.path.splitext(path)
+    return root + ".db" if ext.lower() == ".json" else path
+
+
+def _index_fields(key: str, record: Any) -> Tuple[str, str, str, str]:
+    """Kayıttan indeks alanlarını (tarih, makine, operator, vardiya) çıkar.
+
+    Eski kayıtlar farklı şekillerde olabilir; bulunamayan alanlar anahtardan
+    ("<tarih>_<makine>") ya da boş metinden tamamlanır.
+    """
+    info: Dict[str, Any] = {}
+    if isinstance(record, dict):
+        info = record.get("etud_info") if isinstance(record.get("etud_info"), dict) else record
+    elif isinstance(record, list) and record and isinstance(record[0], dict):
+        info = record[0]
+
+    key_date, _, key_machine = str(key).partition("_")
+    tarih = info.get("tarih", info.get("etud_date")) or key_date
+    makine = info.get("makine", info.get("machine")) or key_machine
+    return (
+        str(tarih),
+        str(makine),
+        str(info.get("operator", "") or ""),
+        str(info.get("vardiya", "") or ""),
+    )
+
+
+def _dumps(record: Any) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _load_legacy_json(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        # bozuk dosyayı kurtarmak için boş sözlük döndür
+        return {}
+
+
+def register_write_hook(
+    hook: Callable[[sqlite3.Connection, str, Any, Any], None], version_key: Optional[str] = None,
+) -> None:
+    """Her kayıt ekleme/güncelleme/silmede (içerik değiştiyse) çağrılacak kanca ekle.
+
+    Kanca yazmayla aynı transaction içinde çalışır; türetilmiş tabloları
+    (ör. analytics özetleri) kayıtla birlikte atomik olarak güncelleyebilir.
+    version_key verilirse tablo bu transaction'dan önce güncelse, commit
+    öncesi depo sürümüyle işaretlenir (kanca o kayıtta bir şey yazmasa da).
+    """
+    if hook not in _WRITE_HOOKS:
+        _WRITE_HOOKS.append(hook)
+    if version_key is not None and version_key not in _DERIVED_KEYS:
+        _DERIVED_KEYS.append(version_key)
+
+
+def _meta_int(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _set_meta(conn: sqlite3.Connection, name: str, value: Any) -> None:
+    conn.execute(
+        "INSERT INTO meta (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+        (name, str(value)),
+    )
+
+
+def _bump_version(conn: sqlite3.Connection) -> int:
+    """Depo sürümünü (her yazma transaction'ında bir) artır.
+
+    Transaction'ın başında çağrılır (kancalar yeni sürümü görür); sonunda
+    `_settle_version` hiçbir satır değişmediyse artışı geri alır.
+    """
+    version = _meta_int(conn, "store_version") + 1
+    _set_meta(conn, "store_version", version)
+    return version
+
+
+def _settle_version(conn: sqlite3.Connection, changed: bool) -> None:
+    """Commit öncesi: içerik değişmediyse depo sürümünü geri al; değiştiyse
+    güncel olan türetilmiş tabloları yeni sürümle işaretle.
+
+    Aksi halde aynı içerikli bir kayıt da sürümü artırır, kancalar
+    çalışmadığı için türetilmiş tablolar eskimiş görünür ve baştan kurulur.
+    """
+    if not changed:
+        _set_meta(conn, "store_version", _meta_int(conn, "store_version") - 1)
+        return
+    for version_key in _DERIVED_KEYS:
+        if derived_in_sync(conn, version_key):
+            mark_derived_synced(conn, version_key)
+
+
+def derived_in_sync(conn: sqlite3.Connection, version_key: str) -> bool:
+    """Yazma kancası içinden: türetilmiş tablo bu yazmadan önce güncel miydi?
+
+    Aynı transaction'daki birden çok kayıt için de True döner (sürüm bu
+    transaction'da zaten işaretlenmiş olabilir).
+    """
+    return _meta_int(conn, version_key) >= _meta_int(conn, "store_version") - 1
+
+
+def mark_derived_synced(conn: sqlite3.Connection, version_key: str) -> None:
+    """Türetilmiş tabloyu güncel depo sürümüyle işaretle."""
+    _set_meta(conn, version_key, _meta_int(conn, "store_version"))
+
+
+def derived_is_fresh(conn: sqlite3.Connection, version_key: str) -> bool:
+    """Türetilmiş tablo depo sürümüyle aynı mı (sorgu öncesi kontrol)?"""
+    return _meta_int(conn, version_key) == _meta_int(conn, "store_version")
+
+
+def _current_version(conn: sqlite3.Connection, namespace: str, key: str) -> int:
+    row = conn.execute("SELECT version FROM studies WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+    return row[0] if row else 0
+
+
+def _check_version(conn: sqlite3.Connection, namespace: str, key: str, expected: Optional[int]) -> None:
+    # transaction içinde (yazma kilidi alınmışken) çağrılır
+    if expected is None:
+        return
+    actual = _current_version(conn, namespace, key)
+    if actual != expected:
+        raise ConcurrentUpdateError(key, expected, actual, namespace)
+
+
+def _upsert(conn: sqlite3.Connection, key: str, record: Any, now: float, namespace: str = SHARED_NAMESPACE) -> bool:
+    """Kaydı yaz; içerik değiştiyse True."""
+    tarih, makine, operator, vardiya = _index_fields(key, record)
+    payload = _dumps(record)
+    old = None
+    if _WRITE_HOOKS:
+        row = conn.execute(
+            "SELECT payload FROM studies WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row and row[0] == payload:
+            return False
+        old = json.loads(row[0]) if row else None
+    cur = conn.execute(
+        """
+        INSERT INTO studies (namespace, key, tarih, makine, operator, vardiya, payload, version, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+        ON CONFLICT(namespace, key) DO UPDATE SET
+            tarih = excluded.tarih, makine = excluded.makine,
+            operator = excluded.operator, vardiya = excluded.vardiya,
+            payload = excluded.payload, version = studies.version + 1,
+            updated_at = excluded.updated_at
+        WHERE studies.payload != excluded.payload
+        """,
+        (namespace, key, tarih, makine, operator, vardiya, payload, now),
+    )
+    if cur.rowcount:
+        for hook in _WRITE_HOOKS:
+            hook(conn, key, old, record)
+    return cur.rowcount > 0
+
+
+def _delete(conn: sqlite3.Connection, key: str, namespace: str = SHARED_NAMESPACE) -> bool:
+    old = None
+    if _WRITE_HOOKS:
+        row = conn.execute(
+            "SELECT payload FROM studies WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        old = json.loads(row[0]) if row else None
+    cur = conn.execute("DELETE FROM studies WHERE namespace = ? AND key = ?", (namespace, key))
+    if cur.rowcount:
+        for hook in _WRITE_HOOKS:
+            hook(conn, key, old, None)
+    return cur.rowcount > 0
+
+
+def _connect(path: str = DEFAULT_PATH) -> sqlite3.Connection:
+    """Bağlantı aç; ilk açılışta şemayı kur ve eski JSON'u içe aktar."""
+    db = db_path(path)
+    os.makedirs(os.path.dirname(db) or ".", exist_ok=True)
+    if not os.path.exists(db):
+        _READY.discard(db)
+    # isolation_level=None: transaction'ları kendimiz (BEGIN IMMEDIATE) açıyoruz
+    conn = sqlite3.connect(db, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if db not in _READY:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _migrate(conn)
+        conn.executescript(_SCHEMA)
+        if db != path:
+            _import_legacy(conn, path)
+        _READY.add(db)
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Şemayı SCHEMA_VERSION'a taşı (user_version < SCHEMA_VERSION ise).
+
+    0 -> 1: studies tablosu (namespace, key) birincil anahtarıyla yeniden
+    kurulur; eski satırlar ortak ad alanına, aynı sırayla kopyalanır.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # kilit alındıktan sonra yeniden bak: başka bir süreç taşımış olabilir
+        (current,) = conn.execute("PRAGMA user_version").fetchone()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(studies)")}
+        if current < 1 and columns and "namespace" not in columns:
+            conn.execute("ALTER TABLE studies RENAME TO studies_v0")
+            conn.execute("DROP INDEX IF EXISTS ix_studies_tarih")
+            conn.execute("DROP INDEX IF EXISTS ix_studies_makine_tarih")
+            conn.execute("DROP INDEX IF EXISTS ix_studies_operator_tarih")
+            conn.execute(_STUDIES_TABLE)
+            conn.execute(
+                "INSERT INTO studies (namespace, key, tarih, makine, operator, vardiya, payload, version, updated_at) "
+                "SELECT '', key, tarih, makine, operator, vardiya, payload, version, updated_at "
+                "FROM studies_v0 ORDER BY rowid"
+            )
+            conn.execute("DROP TABLE studies_v0")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _import_legacy(conn: sqlite3.Connection, json_path: str) -> None:
+    """Yanındaki eski JSON'u bir kez içe aktar; kayıtlar kanonik biçime çevrilerek yazılır."""
+    from modules.migrate import canonical_record  # döngüsel içe aktarmayı önlemek için burada
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        done = conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone()
+        if not done:
+            _bump_version(conn)
+            now = time.time()
+            changed = False
+            for key, record in _load_legacy_json(json_path).items():
+                changed |= _upsert(conn, key, canonical_record(key, record), now)
+            _settle_version(conn, changed)
+            conn.execute("INSERT INTO meta (name, value) VALUES ('legacy_imported', ?)", (json_path,))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+# ---- eski API (imza değişmedi) ----
+@instrument
+def load_data(path=DEFAULT_PATH, namespace=SHARED_NAMESPACE):
+    """Ad alanındaki kayıtları {anahtar: kayıt} sözlüğü olarak döndür.
+
+    Her çağrı depoyu baştan okur; sık okuyan görünümler paylaşılan
+    önbelleği (`study_cache.load_data_cached`) kullanmalı.
+    """
+    try:
+        return dict(iter_studies(path, namespace=namespace))
+    except sqlite3.DatabaseError:
+        # bozuk dosyayı kurtarmak için boş sözlük döndür
+        return {}
+
+
+@instrument
+def save_data(data, file_path=DEFAULT_PATH, namespace=SHARED_NAMESPACE):
+    """Sözlüğün tamamını ad alanına eşitle.
+
+    Yalnızca içeriği değişen kayıtlar yazılır; sözlükte olmayan kayıtlar
+    silinir (eski "dosyayı baştan yaz" davranışıyla aynı sonuç). Diğer ad
+    alanlarına dokunulmaz. Tek etüt kaydetmek için `save_study` kullanın.
+    """
+    now = time.time()
+    with closing(_connect(file_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _bump_version(conn)
+            existing = {k for (k,) in conn.execute("SELECT key FROM studies WHERE namespace = ?", (namespace,))}
+            changed = False
+            for key in existing.difference(data):
+                changed |= _delete(conn, key, namespace)
+            for key, record in data.items():
+                changed |= _upsert(conn, key, record, now, namespace)
+            _settle_version(conn, changed)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+# ---- tekil / sorgu API ----
+@instrument
+def save_study(
+    key: str, record: Any, path: str = DEFAULT_PATH,
+    namespace: str = SHARED_NAMESPACE, expected_version: Optional[int] = None,
+) -> int:
+    """Tek etüdü ekle/güncelle (O(1)). Kaydın yeni sürüm numarasını döndürür.
+
+    expected_version verilirse ve depodaki sürüm farklıysa (0: kayıt yok)
+    hiçbir şey yazılmaz, `ConcurrentUpdateError` yükselir.
+    """
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _check_version(conn, namespace, key, expected_version)
+            _bump_version(conn)
+            _settle_version(conn, _upsert(conn, key, record, time.time(), namespace))
+            version = _current_version(conn, namespace, key)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return version
+
+
+@instrument
+def save_studies(
+    items: Iterable[Tuple[str, str, Any, Optional[int]]], path: str = DEFAULT_PATH,
+) -> List[Union[int, ConcurrentUpdateError]]:
+    """(ad alanı, anahtar, kayıt, expected_version) öğelerini tek transaction'da yaz.
+
+    Öğe başına yeni sürüm döner. Sürümü tutmayan öğe yazılmaz, yerine
+    `ConcurrentUpdateError` nesnesi döner; diğer öğeler yine yazılır.
+    """
+    results: List[Union[int, ConcurrentUpdateError]] = []
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _bump_version(conn)
+            now = time.time()
+            changed = False
+            for namespace, key, record, expected in items:
+                try:
+                    _check_version(conn, namespace, key, expected)
+                except ConcurrentUpdateError as exc:
+                    results.append(exc)
+                    continue
+                changed |= _upsert(conn, key, record, now, namespace)
+                results.append(_current_version(conn, namespace, key))
+            _settle_version(conn, changed)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return results
+
+
+@instrument
+def load_study(key: str, path: str = DEFAULT_PATH, namespace: str = SHARED_NAMESPACE) -> Optional[Any]:
+    """Tek etüdü anahtarıyla oku; yoksa None."""
+    return read_study(key, path, namespace)[0]
+
+
+def read_study(key: str, path: str = DEFAULT_PATH, namespace: str = SHARED_NAMESPACE) -> Tuple[Optional[Any], int]:
+    """(kayıt, sürüm); kayıt yoksa (None, 0). Sürüm `expected_version` olarak geri verilir."""
+    with closing(_connect(path)) as conn:
+        row = conn.execute(
+            "SELECT payload, version FROM studies WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+    return (json.loads(row[0]), row[1]) if row else (None, 0)
+
+
+@instrument
+def delete_study(
+    key: str, path: str = DEFAULT_PATH,
+    namespace: str = SHARED_NAMESPACE, expected_version: Optional[int] = None,
+) -> bool:
+    """Tek etüdü sil. Silindiyse True (expected_version: `save_study` ile aynı)."""
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _check_version(conn, namespace, key, expected_version)
+            _bump_version(conn)
+            deleted = _delete(conn, key, namespace)
+            _settle_version(conn, deleted)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return deleted
+
+
+@instrument
+def store_version(path: str = DEFAULT_PATH) -> int:
+    """Depo sürümü: içerik değiştiren her yazma transaction'ında artar (önbellek/türetilmiş tablo tazeliği için)."""
+    with closing(_connect(path)) as conn:
+        return _meta_int(conn, "store_version")
+
+
+def namespaces(path: str = DEFAULT_PATH) -> List[str]:
+    """Kayıt bulunan ad alanları."""
+    with closing(_connect(path)) as conn:
+        return [ns for (ns,) in conn.execute("SELECT DISTINCT namespace FROM studies ORDER BY namespace")]
+
+
+def _study_filters(
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+    namespace: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    where, params = [], []
+    if namespace is not None:
+        where.append("namespace = ?"); params.append(namespace)
+    if start_date is not None:
+        where.append("tarih >= ?"); params.append(str(start_date))
+    if end_date is not None:
+        where.append("tarih <= ?"); params.append(str(end_date))
+    if machine is not None:
+        where.append("makine = ?"); params.append(machine)
+    if operator is not None:
+        where.append("operator = ?"); params.append(operator)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def iter_studies(
+    path: str = DEFAULT_PATH,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+    namespace: Optional[str] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """(anahtar, kayıt) çiftlerini sırayla üret.
+
+    Tarih aralığı (dahil, "YYYY-MM-DD") ve makine/operatör filtreleri
+    indeks üzerinden uygulanır; yalnızca eşleşen kayıtlar çözülür.
+    namespace None ise tüm ad alanları gezilir; anahtar ad alanları arasında
+    tekrarlanabilir, anahtara göre ayıran tüketiciler `iter_namespaced` kullanmalı.
+    """
+    for _ns, key, record in iter_namespaced(path, start_date, end_date, machine, operator, namespace):
+        yield key, record
+
+
+def iter_namespaced(
+    path: str = DEFAULT_PATH,
+    start_date: Optional[Any] = None,
+    end_date: Optional[Any] = None,
+    machine: Optional[str] = None,
+    operator: Optional[str] = None,
+    namespace: Optional[str] = None,
+) -> Iterator[Tuple[str, str, Any]]:
+    """(ad alanı, anahtar, kayıt) üçlülerini sırayla üret (filtreler `iter_studies` ile aynı)."""
+    where, params = _study_filters(start_date, end_date, machine, operator, namespace)
+    with closing(_connect(path)) as conn:
+        for ns, key, payload in conn.execute(
+            f"SELECT namespace, key, payload FROM studies{where} ORDER BY rowid", params
+        ):
+            yield ns, key, json.loads(payload)
+
+
+def study_rows(path: str = DEFAULT_PATH, **filters: Any) -> List[Tuple[str, str, int, float]]:
+    """Eşleşen kayıtların (namespace, anahtar, sürüm, updated_at) bilgisi; payload okunmaz.
+
+    Filtreler `iter_studies` ile aynıdır.
+    """
+    where, params = _study_filters(**filters)
+    with closing(_connect(path)) as conn:
+        return conn.execute(
+            f"SELECT namespace, key, version, updated_at FROM studies{where} ORDER BY rowid", params
+        ).fetchall()
+
+
+@instrument
+def query_studies(path: str = DEFAULT_PATH, namespace: str = SHARED_NAMESPACE, **filters: Any) -> Dict[str, Any]:
+    """Ad alanında `iter_studies` filtreleriyle eşleşen kayıtları {anahtar: kayıt} olarak döndür.
+
+    Anahtar yalnız bir ad alanı içinde tekildir; bu yüzden varsayılan ortak
+    ad alanıdır. Tüm ad alanları için `iter_namespaced` kullanın.
+    """
+    if namespace is None:
+        raise ValueError("query_studies tek bir ad alanı ister; tümü için iter_namespaced")
+    return dict(iter_studies(path, namespace=namespace, **filters))
+
+
+# ---- canlı kayıt olayları ----
+@instrument
+def append_events(session: str, events: List[Tuple[int, float, str, str, str]], path: str = DEFAULT_PATH) -> int:
+    """Canlı kayıt olaylarını (seq, ts, olay, tür, açıklama) tek transaction'da ekle.
+
+    (oturum, seq) birincil anahtar olduğundan aynı parti yeniden yazılırsa
+    çift kayıt oluşmaz. Etüt kaydı olmadığı için depo sürümü artmaz.
+    """
+    return append_event_batches([(session, events)], path)[0]
+
+
+@instrument
+def append_event_batches(
+    batches: Iterable[Tuple[str, List[Tuple[int, float, str, str, str]]]], path: str = DEFAULT_PATH,
+) -> List[int]:
+    """Birden çok oturumun olay partilerini tek transaction'da ekle (`append_events`).
+
+    Parti başına eklenen (daha önce yazılmamış) olay sayısı döner.
+    """
+    written = []
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for session, events in batches:
+                cur = conn.executemany(
+                    "INSERT OR IGNORE INTO capture_events (oturum, seq, ts, olay, tur, aciklama) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(session, *e) for e in events],
+                )
+                written.append(cur.rowcount)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return written
+
+
+@instrument
+def load_events(session: str, path: str = DEFAULT_PATH) -> List[Tuple[int, float, str, str, str]]:
+    """Oturumun olaylarını sıra numarasına göre döndür."""
+    with closing(_connect(path)) as conn:
+        return conn.execute(
+            "SELECT seq, ts, olay, tur, aciklama FROM capture_events WHERE oturum = ? ORDER BY seq",
+            (session,),
+        ).fetchall()
+
+
+def delete_events(session: str, path: str = DEFAULT_PATH) -> int:
+    """Oturumun tüm olaylarını sil (ör. etüt kaydedildiğinde)."""
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute("DELETE FROM capture_events WHERE oturum = ?", (session,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return cur.rowcount
+
+
+# ---- taslaklar (otomatik kayıt) ----
+@instrument
+def append_draft_op(draft: str, kind: str, payload: Any, path: str = DEFAULT_PATH) -> int:
+    """Taslağa bir işlem satırı ekle; sıra numarasını döndürür.
+
+    kind "snapshot" ise satır tam durumdur ve taslağın önceki satırları aynı
+    transaction'da silinir (sıkıştırma). Etüt kaydı olmadığı için depo
+    sürümü artmaz.
+    """
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # seq depoda verilir: aynı taslağı açan iki sekme çakışmaz
+            (seq,) = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM draft_ops WHERE taslak = ?", (draft,)
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO draft_ops (taslak, seq, kind, payload, ts) VALUES (?, ?, ?, ?, ?)",
+                (draft, seq, kind, _dumps(payload), time.time()),
+            )
+            if kind == "snapshot":
+                conn.execute("DELETE FROM draft_ops WHERE taslak = ? AND seq < ?", (draft, seq))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return seq
+
+
+@instrument
+def load_draft_ops(draft: str, path: str = DEFAULT_PATH) -> List[Tuple[int, str, Any]]:
+    """Taslağın (seq, kind, payload) satırları, sırayla."""
+    with closing(_connect(path)) as conn:
+        rows = conn.execute(
+            "SELECT seq, kind, payload FROM draft_ops WHERE taslak = ? ORDER BY seq", (draft,)
+        ).fetchall()
+    return [(seq, kind, json.loads(payload)) for seq, kind, payload in rows]
+
+
+def draft_updated_at(draft: str, path: str = DEFAULT_PATH) -> Optional[float]:
+    """Taslağın son yazım zamanı (taslak yoksa None)."""
+    with closing(_connect(path)) as conn:
+        return conn.execute("SELECT MAX(ts) FROM draft_ops WHERE taslak = ?", (draft,)).fetchone()[0]
+
+
+def delete_draft(draft: str, path: str = DEFAULT_PATH) -> int:
+    """Taslağın tüm satırlarını sil (ör. etüt kaydedildiğinde)."""
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute("DELETE FROM draft_ops WHERE taslak = ?", (draft,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return cur.rowcount
+
+
+def prune_drafts(older_than: float, path: str = DEFAULT_PATH) -> int:
+    """Son yazımı `older_than` saniyeden eski taslakları sil; silinen satır sayısını döndürür.
+
+    Arayüzün canlı kayıt oturumu taslakla aynı kimliği taşır; taslağın
+    olayları da silinir.
+    """
+    with closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stale = [d for (d,) in conn.execute(
+                "SELECT taslak FROM draft_ops GROUP BY taslak HAVING MAX(ts) < ?", (time.time() - older_than,)
+            )]
+            conn.executemany("DELETE FROM capture_events WHERE oturum = ?", [(d,) for d in stale])
+            cur = conn.executemany("DELETE FROM draft_ops WHERE taslak = ?", [(d,) for d in stale])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return cur.rowcount
@@ -0,0 +1,212 @@
+# path: modules/study_cache.py
+"""
+Süreç genelinde paylaşılan etüt önbelleği.
+
+`load_data` her çağrıda depoyu baştan okur ve her kaydın JSON'unu yeniden
+çözer; geçmiş görünümleri bunu her yeniden çalışmada, her kullanıcı için
+yapardı. Burada kayıtlar depo dosyası başına bir kez tutulur ve yalnız
+değişen satırlar yeniden okunur:
+
+- önce dosya imzasına (.db ve -wal dosyalarının mtime / boyutu) bakılır;
+  değişmediyse veritabanı açılmaz,
+- imza değiştiyse depo sürümü (`store_version`) okunur; aynıysa (ör. WAL
+  checkpoint) yalnız imza güncellenir,
+- sürüm değiştiyse yalnız (namespace, key, version, updated_at) sütunları
+  taranır; yeni / değişen satırların payload'ı çözülür, silinenler atılır.
+
+Aynı içerikli kayıtlar (ör. iki operatörün ad alanındaki aynı etüt) tek
+nesneyi paylaşır. Dönen kayıtlar bu yüzden salt okunurdur; değiştirecek
+olan kopyalamalıdır. `stats` isabet / ıska ve çözülen satır sayılarını verir.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.perf import instrument
+from modules.storage import DEFAULT_PATH, SHARED_NAMESPACE, _connect, _meta_int, db_path
+
+# değişen satır oranı bunu aşarsa payload'lar tek taramayla okunur
+_SCAN_RATIO = 0.25
+
+# (namespace, key)
+RowKey = Tuple[str, str]
+
+
+def _signature(db: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+    out = []
+    for name in (db, db + "-wal"):
+        try:
+            st = os.stat(name)
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def _digest(payload: str) -> bytes:
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+class StudyCache:
+    """Tek depo dosyasının kayıtları; `refresh` ile tazelenir (iş parçacığı güvenli)."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._db = db_path(path)
+        self._lock = threading.Lock()
+        self._sig: Optional[tuple] = None
+        self._version: Optional[int] = None
+        # (namespace, key) -> ((version, updated_at), içerik özeti); rowid sırasında
+        self._rows: Dict[RowKey, Tuple[Tuple[int, float], bytes]] = {}
+        # içerik özeti -> [kayıt, kaç satırda kullanıldığı]
+        self._records: Dict[bytes, List[Any]] = {}
+        self._views: Dict[str, Dict[str, Any]] = {}
+        self.hits = self.misses = 0
+        self.parsed = self.shared = self.dropped = 0
+
+    @property
+    def version(self) -> Optional[int]:
+        """Önbelleğin yansıttığı depo sürümü (henüz okunmadıysa None)."""
+        return self._version
+
+    @instrument
+    def refresh(self) -> bool:
+        """Depoyla eşitle; kayıtlar değiştiyse True."""
+        with self._lock:
+            sig = _signature(self._db)
+            if sig == self._sig and sig[0] is not None:
+                self.hits += 1
+                return False
+            with closing(_connect(self.path)) as conn:
+                # tek okuma transaction'ı: sürüm, satır listesi ve payload'lar aynı anlık görüntüden
+                conn.execute("BEGIN")
+                try:
+                    version = _meta_int(conn, "store_version")
+                    changed = version != self._version and self._reload(conn)
+                finally:
+                    conn.execute("COMMIT")
+            # imza okumadan önce alındı: arada yazma olduysa sonraki çağrı yeniden bakar
+            self._sig, self._version = sig, version
+            if changed:
+                self._views.clear()
+                self.misses += 1
+            else:
+                self.hits += 1
+            return changed
+
+    def _reload(self, conn: sqlite3.Connection) -> bool:
+        listing = conn.execute("SELECT namespace, key, version, updated_at FROM studies ORDER BY rowid").fetchall()
+        rows: Dict[RowKey, Tuple[Tuple[int, float], bytes]] = {}
+        wanted: Dict[RowKey, Tuple[int, float]] = {}
+        for ns, key, version, updated_at in listing:
+            token = (version, updated_at)
+            old = self._rows.get((ns, key))
+            if old is not None and old[0] == token:
+                rows[(ns, key)] = old
+            else:
+                wanted[(ns, key)] = token
+        gone = [rk for rk in self._rows if rk not in rows and rk not in wanted]
+        if not wanted and not gone:
+            return False
+
+        if len(wanted) > _SCAN_RATIO * max(len(listing), 1):
+            payloads = ((ns, key, p) for ns, key, p in conn.execute("SELECT namespace, key, payload FROM studies")
+                        if (ns, key) in wanted)
+        else:
+            payloads = (
+                (ns, key, conn.execute("SELECT payload FROM studies WHERE namespace = ? AND key = ?",
+                                       (ns, key)).fetchone()[0])
+                for ns, key in wanted
+            )
+        fresh = {}
+        for ns, key, payload in payloads:
+            digest = _digest(payload)
+            entry = self._records.get(digest)
+            if entry is None:
+                self._records[digest] = [json.loads(payload), 1]
+                self.parsed += 1
+            else:
+                entry[1] += 1
+                self.shared += 1
+            fresh[(ns, key)] = (wanted[(ns, key)], digest)
+
+        # eski sürümlerin payload referanslarını bırak
+        for rk in gone + [rk for rk in wanted if rk in self._rows]:
+            self._release(self._rows[rk][1])
+        self.dropped += len(gone)
+        # satır sırası (rowid) korunur
+        self._rows = {(ns, key): rows.get((ns, key)) or fresh[(ns, key)] for ns, key, _v, _u in listing}
+        return True
+
+    def _release(self, digest: bytes) -> None:
+        entry = self._records[digest]
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._records[digest]
+
+    def studies(self, namespace: str = SHARED_NAMESPACE) -> Dict[str, Any]:
+        """`load_data` ile aynı {anahtar: kayıt} sözlüğü (sözlük yeni, kayıtlar paylaşılan)."""
+        self.refresh()
+        with self._lock:
+            view = self._views.get(namespace)
+            if view is None:
+                view = self._views[namespace] = {
+                    key: self._records[digest][0] for (ns, key), (_t, digest) in self._rows.items() if ns == namespace
+                }
+            return dict(view)
+
+    def items(self) -> List[Tuple[str, str, Any]]:
+        """Tüm ad alanlarındaki (namespace, anahtar, kayıt) üçlüleri, kayıt sırasıyla."""
+        self.refresh()
+        with self._lock:
+            return [(ns, key, self._records[digest][0]) for (ns, key), (_t, digest) in self._rows.items()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "isabet": self.hits,
+                "iska": self.misses,
+                "isabet_orani": self.hits / calls if calls else 0.0,
+                "cozulen": self.parsed,        # JSON'u çözülen payload
+                "paylasilan": self.shared,     # aynı içerik bulunduğu için çözülmeyen
+                "silinen": self.dropped,
+                "kayit": len(self._rows),
+                "benzersiz": len(self._records),
+                "surum": self._version,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sig = self._version = None
+            self._rows.clear()
+            self._records.clear()
+            self._views.clear()
+
+
+_CACHES: Dict[str, StudyCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def study_cache(path: str = DEFAULT_PATH) -> StudyCache:
+    """Depo dosyasının süreç genelindeki önbelleği (aynı .db için tek nesne)."""
+    db = os.path.abspath(db_path(path))
+    with _CACHES_LOCK:
+        cache = _CACHES.get(db)
+        if cache is None:
+            cache = _CACHES[db] = StudyCache(path)
+        return cache
+
+
+def load_data_cached(path: str = DEFAULT_PATH, namespace: str = SHARED_NAMESPACE) -> Dict[str, Any]:
+    """`load_data` gibi, ama paylaşılan önbellekten (kayıtlar salt okunur)."""
+    try:
+        return study_cache(path).studies(namespace)
+    except sqlite3.DatabaseError:
+        # bozuk dosyayı kurtarmak için boş sözlük döndür
+        return {}
@@ -0,0 +1,55 @@
+# path: modules/study_history.py
+"""
+Geçmiş etütler sayfası.
+
+Kayıtlar `study_cache` üzerinden okunur: sayfa her yeniden çalıştığında
+depo yalnız değiştiyse ve yalnız değişen satırlar yeniden çözülür. Tablo
+da depo sürümü başına bir kez kurulur ve tüm oturumlarca paylaşılır.
+"""
+
+import streamlit as st
+
+from modules.migrate import canonical_summary
+from modules.storage import DEFAULT_PATH, _index_fields
+from modules.study_cache import study_cache
+
+_SUMMARY = ["Etüt Süresi (dk)", "Toplam Duruş Süresi (sn)", "Kapasite Kullanımı (%)",
+            "Gerçekleşen Üretim (adet)", "Gerçekleşme Oranı (%)"]
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _frame(path, version):
+    # version yalnız önbellek anahtarıdır: depo değişince tablo yeniden kurulur
+    import pandas as pd
+
+    rows = []
+    for ns, key, record in study_cache(path).items():
+        tarih, makine, operator, vardiya = _index_fields(key, record)
+        ozet = canonical_summary(record.get("ozet")) if isinstance(record, dict) else {}
+        rows.append({"Tarih": tarih, "Makine": makine, "Operatör": operator, "Vardiya": vardiya,
+                     "Ad Alanı": ns, **{c: ozet.get(c) for c in _SUMMARY}})
+    return pd.DataFrame(rows, columns=["Tarih", "Makine", "Operatör", "Vardiya", "Ad Alanı", *_SUMMARY])
+
+
+def render_study_history(path=DEFAULT_PATH):
+    cache = study_cache(path)
+    cache.refresh()
+    df = _frame(path, cache.version)
+    if df.empty:
+        st.info("Henüz kayıtlı etüt yok.")
+        return
+
+    col1, col2 = st.columns(2)
+    machines = col1.multiselect("Makine", sorted(df["Makine"].unique()), key="history_machines")
+    operators = col2.multiselect("Operatör", sorted(df["Operatör"].unique()), key="history_operators")
+    if machines:
+        df = df[df["Makine"].isin(machines)]
+    if operators:
+        df = df[df["Operatör"].isin(operators)]
+
+    st.dataframe(df.sort_values("Tarih", ascending=False), hide_index=True)
+    s = cache.stats()
+    st.caption(
+        f"{len(df)} etüt · önbellek: {s['isabet']} isabet / {s['iska']} ıska, "
+        f"{s['kayit']} kayıt ({s['benzersiz']} benzersiz) · depo sürümü {s['surum']}"
+    )
@@ -1,62 +1,45 @@
 # path: modules/summary.py
-import pandas as pd
-import matplotlib.pyplot as plt
-import streamlit as st
 import datetime
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING
+
+import streamlit as st
+
+from modules.charts import chart_series, pie_from_series
+from modules.perf import instrument
+from modules.stop_log import StopLog
+from modules.summary_core import (
+    InvalidStudyError, _to_stops_df, availability, compute_summary, summary_frame, summary_key,
+)
+from modules.time_window import clock_label, study_window
+
+if TYPE_CHECKING:  # pandas ilk özet tablosunda yüklenir
+    import pandas as pd
+
+# grafik ilk kez çizilene kadar matplotlib yüklenmez; yüklendiğinde
+# etkileşimsiz arka uçla açılsın (sunucuda GUI arka ucu aranmasın)
+os.environ.setdefault("MPLBACKEND", "Agg")
+
 
-def _to_stops_df(error_data):
-    """Eski 'Hata Türü' verilerini 'Duruş Türü' şemasına çevir."""
-    df = pd.DataFrame(error_data) if error_data else pd.DataFrame()
-    if df.empty:
-        return pd.DataFrame(columns=["Duruş Türü","Süre (sn)","Açıklama"])
-    df = df.copy()
-    if "Duruş Türü" not in df.columns and "Hata Türü" in df.columns:
-        df["Duruş Türü"] = df["Hata Türü"]
-    if "Süre (sn)" not in df.columns:
-        df["Süre (sn)"] = 0
-    if "Açıklama" not in df.columns:
-        df["Açıklama"] = ""
-    return df[["Duruş Türü","Süre (sn)","Açıklama"]]
-
-def calculate_summary(error_data, start_time, end_time, produced_beds, unit_time, break_time):
-    df = _to_stops_df(error_data)
-
-    total_etud_minutes = (
-        datetime.datetime.combine(datetime.date.today(), end_time)
-        - datetime.datetime.combine(datetime.date.today(), start_time)
-    ).total_seconds() / 60
-    total_etud_minutes = round(total_etud_minutes - float(break_time or 0), 2)
-
-    if total_etud_minutes <= 0:
-        st.error("Etüt süresi geçersiz. Lütfen başlangıç, bitiş ve mola değerlerini kontrol edin.")
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_summary_df(key, _inputs):
+    # key: girdilerin hash'i; "_" ile başlayan argümanı Streamlit hash'lemez
+    return summary_frame(compute_summary(*_inputs))
+
+
+@instrument
+def calculate_summary(error_data, start_time, end_time, produced_beds, unit_time, break_time=0, breaks=()):
+    inputs = (error_data, start_time, end_time, produced_beds, unit_time, break_time, tuple(breaks))
+    try:
+        return _cached_summary_df(summary_key(*inputs), inputs)
+    except InvalidStudyError as e:
+        st.error(str(e))
         st.stop()
 
-    total_planned_sec   = float(df.loc[df["Duruş Türü"] == "Planlı",   "Süre (sn)"].sum()) if not df.empty else 0.0
-    total_unplanned_sec = float(df.loc[df["Duruş Türü"] == "Plansız", "Süre (sn)"].sum()) if not df.empty else 0.0
-    total_errors_sec    = total_planned_sec + total_unplanned_sec
-
-    # Planlanan üretim = (Etüt Süresi - Planlı duruş) / CT
-    planned_available_minutes = max(total_etud_minutes - (total_planned_sec / 60.0), 0)
-    planned_production = (planned_available_minutes / float(unit_time)) if float(unit_time) > 0 else 0
-
-    # Net çalışma: planlı + plansız düş
-    net_seconds = max(total_etud_minutes * 60 - total_errors_sec, 0)
-    utilization = (net_seconds / (total_etud_minutes * 60)) * 100 if total_etud_minutes > 0 else 0
-    performance = (float(produced_beds) / planned_production * 100) if planned_production > 0 else 0
-
-    summary_df = pd.DataFrame({
-        "Etüt Süresi (dk)": [round(total_etud_minutes, 2)],
-        "Toplam Planlı Süre (sn)": [round(total_planned_sec, 2)],
-        "Toplam Plansız Süre (sn)": [round(total_unplanned_sec, 2)],
-        "Toplam Duruş Süresi (sn)": [round(total_errors_sec, 2)],
-        "Kapasite Kullanımı (%)": [round(utilization, 2)],
-        "Gerçekleşen Üretim (adet)": [int(produced_beds)],
-        "Planlanan Üretim (adet)": [round(planned_production, 2)],
-        "Gerçekleşme Oranı (%)": [round(performance, 2)],
-    })
-    return summary_df
-
-def render_summary_table(summary_df: pd.DataFrame):
+@instrument
+def render_summary_table(summary_df: "pd.DataFrame"):
     planli_dk  = round(float(summary_df.loc[0,'Toplam Planlı Süre (sn)']) / 60, 2)
     plansiz_dk = round(float(summary_df.loc[0,'Toplam Plansız Süre (sn)']) / 60, 2)
     hatali_dk  = round(float(summary_df.loc[0,'Toplam Duruş Süresi (sn)']) / 60, 2)
@@ -76,26 +59,44 @@ def render_summary_table(summary_df: pd.DataFrame):
     st.markdown("### 📋 Detaylı Tablo")
     st.dataframe(df_dk)
 
-def render_summary_charts(error_data, summary_df: pd.DataFrame):
-    df = _to_stops_df(error_data)
-    if not df.empty:
+def _stops_key(error_data):
+    if isinstance(error_data, StopLog):
+        return error_data.fingerprint()
+    raw = json.dumps(list(error_data or []), ensure_ascii=False, default=str, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _chart_data(key, _error_data):
+    # grafik serileri yalnızca duruşlar değişince yeniden hesaplanır
+    return chart_series(_to_stops_df(_error_data))
+
+
+@instrument
+def render_summary_charts(error_data, summary_df: "pd.DataFrame", start_time=None, end_time=None, breaks=()):
+    import pandas as pd
+    chart_data = _chart_data(_stops_key(error_data), error_data)
+    if chart_data is not None:
+        pie_data, planned_bar, unplanned_bar = chart_data
         st.subheader("📊 Duruş Türlerine Göre Dağılım (Pie)")
-        pie_data = df.groupby("Duruş Türü")["Süre (sn)"].sum()
-        fig1, ax1 = plt.subplots()
-        ax1.pie(pie_data, labels=pie_data.index, autopct='%1.1f%%', startangle=90)
-        ax1.axis('equal')
-        st.pyplot(fig1)
+        st.image(pie_from_series(pie_data))
 
         st.subheader("📈 Planlı Duruşlar (dk)")
-        planned_bar = (df[df["Duruş Türü"] == "Planlı"].groupby("Açıklama")["Süre (sn)"].sum() / 60).round(2).sort_values(ascending=False)
         if not planned_bar.empty:
             st.bar_chart(planned_bar)
 
         st.subheader("📉 Plansız Duruşlar (dk)")
-        unplanned_bar = (df[df["Duruş Türü"] == "Plansız"].groupby("Açıklama")["Süre (sn)"].sum() / 60).round(2).sort_values(ascending=False)
         if not unplanned_bar.empty:
             st.bar_chart(unplanned_bar)
 
+    timeline = availability(error_data, start_time, end_time, breaks) if start_time and end_time else None
+    if timeline:
+        st.subheader("⏳ Dakika Bazında Çalışma Oranı (%)")
+        base, end = study_window(start_time, end_time)
+        window = (end - base).total_seconds()
+        index = [clock_label(base + datetime.timedelta(minutes=i), window) for i in range(len(timeline))]
+        st.area_chart(pd.DataFrame({"Çalışma (%)": [round(v * 100, 1) for v in timeline]}, index=index))
+
     st.subheader("🏁 Planlanan vs Gerçekleşen Üretim")
     planned = float(summary_df.loc[0,"Planlanan Üretim (adet)"])
     actual  = float(summary_df.loc[0,"Gerçekleşen Üretim (adet)"])
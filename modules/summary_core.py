@@ -0,0 +1,226 @@
+# path: modules/summary_core.py
+"""
+Özet hesabının Streamlit'ten bağımsız, saf çekirdeği.
+
+`compute_summary` yalnızca girdilerine bağlıdır (bugünün tarihi, st.* çağrısı
+yok); geçersiz etütte `InvalidStudyError` fırlatır. Böylece toplu işlerden,
+işçi süreçlerinden ya da önbellek katmanından güvenle çağrılabilir.
+`cached_summary` aynı hesabı girdilerin özeti (hash) üzerinden sınırlı bir
+LRU önbellekle sarar; arayüz tarafı `summary.calculate_summary` aynı anahtarla
+`st.cache_data` kullanır.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.intervals import availability_timeline, stop_span, study_intervals
+from modules.stop_log import StopLog
+from modules.time_window import window_minutes
+
+if TYPE_CHECKING:  # pandas ilk DataFrame gerektiğinde yüklenir
+    import pandas as pd
+
+SUMMARY_COLUMNS = [
+    "Etüt Süresi (dk)",
+    "Toplam Planlı Süre (sn)",
+    "Toplam Plansız Süre (sn)",
+    "Toplam Duruş Süresi (sn)",
+    "Kapasite Kullanımı (%)",
+    "Gerçekleşen Üretim (adet)",
+    "Planlanan Üretim (adet)",
+    "Gerçekleşme Oranı (%)",
+]
+
+class InvalidStudyError(ValueError):
+    """Etüt süresi (bitiş - başlangıç - mola) sıfır ya da negatif."""
+
+
+# eski ad -> kanonik ad
+_LEGACY_STOP_KEYS = {"Hata Türü": "Duruş Türü", "Hata Adı": "Açıklama"}
+
+
+def _is_canonical(stop: Dict[str, Any]) -> bool:
+    return "Duruş Türü" in stop and ("Açıklama" in stop or "Hata Adı" not in stop)
+
+
+def canonical_stops(error_data):
+    """Eski adlı ("Hata Türü" / "Hata Adı") duruşları kanonik adlara çevir.
+
+    `StopLog` ve zaten kanonik listeler aynen döner; eski adlı duruş varsa
+    liste kopyalanır. Özet ve grafik girişleri bunu kullanır: eski tür adı
+    boş tür sayılıp toplamlardan sessizce düşmez.
+    """
+    if isinstance(error_data, StopLog) or not error_data:
+        return error_data
+    if not isinstance(error_data, (list, tuple)):
+        error_data = list(error_data)
+    if all(_is_canonical(e) for e in error_data):
+        return error_data
+    out = []
+    for e in error_data:
+        if not _is_canonical(e):
+            e = dict(e)
+            for old, new in _LEGACY_STOP_KEYS.items():
+                if old in e:
+                    value = e.pop(old)
+                    if e.get(new) is None:
+                        e[new] = value
+        out.append(e)
+    return out
+
+
+def _to_stops_df(error_data):
+    """Duruşları "Duruş Türü" / "Süre (sn)" / "Açıklama" sütunlu tabloya çevir.
+
+    Girdi `StopLog` ya da sözlük listesidir; eski adlar `canonical_stops`
+    ile çevrilir.
+    """
+    if isinstance(error_data, StopLog):
+        return error_data.to_frame()
+    import pandas as pd
+    error_data = canonical_stops(error_data)
+    df = pd.DataFrame(error_data) if error_data else pd.DataFrame()
+    if df.empty:
+        return pd.DataFrame(columns=["Duruş Türü","Süre (sn)","Açıklama"])
+    if "Duruş Türü" not in df.columns:
+        df["Duruş Türü"] = ""
+    if "Süre (sn)" not in df.columns:
+        df["Süre (sn)"] = 0
+    if "Açıklama" not in df.columns:
+        df["Açıklama"] = ""
+    return df[["Duruş Türü","Süre (sn)","Açıklama"]]
+
+
+def stop_items(error_data: Iterable[Dict[str, Any]]) -> Tuple[Tuple[Any, ...], ...]:
+    """Özete giren kısmı demetler olarak çıkar (hash'lenebilir).
+
+    Yalnız süreli duruş (tür, saniye); aralıklı duruş
+    (tür, saniye, "başlangıç", "bitiş") olur.
+    """
+    if isinstance(error_data, StopLog):
+        return error_data.stop_items()
+    return tuple(
+        (e.get("Duruş Türü", ""), float(e.get("Süre (sn)", 0) or 0)) + (stop_span(e) or ())
+        for e in (canonical_stops(error_data) or [])
+    )
+
+
+def study_minutes(start_time: Any, end_time: Any) -> float:
+    """Başlangıç-bitiş arası dakika (mola düşülmeden).
+
+    Bitiş saati başlangıçtan önceyse gece yarısı geçilmiştir; birkaç
+    günlük etütte uçlar tam zamandır (`time_window`).
+    """
+    return window_minutes(start_time, end_time)
+
+
+def compute_summary(error_data, start_time, end_time, produced_beds, unit_time, break_time=0, breaks=()) -> Dict[str, Any]:
+    """Tek etüdün özetini {sütun: değer} olarak hesapla.
+
+    Değerler `SUMMARY_COLUMNS` sırasındadır; yuvarlamalar eski
+    `calculate_summary` ile aynıdır. Başlangıç/bitiş saatli duruşlar ve
+    `breaks` (("SS:DD:ss", "SS:DD:ss") mola aralıkları) verilirse çakışmalar
+    `intervals` motoruyla bir kez sayılır; yalnız süreli duruşlar eskisi gibi
+    doğrudan toplanır.
+    """
+    return _compute(stop_items(error_data), start_time, end_time, produced_beds, unit_time, break_time, tuple(breaks or ()))
+
+
+def _compute(stops, start_time, end_time, produced_beds, unit_time, break_time, breaks=()) -> Dict[str, Any]:
+    timed = [(kind, span[0], span[1]) for kind, _sec, *span in stops if span]
+    plain = [(kind, sec) for kind, sec, *span in stops if not span]
+
+    total_etud_minutes = study_minutes(start_time, end_time)
+    if timed or breaks:
+        res = study_intervals(start_time, end_time, timed, breaks)
+        if breaks:
+            break_time = res["break_sec"] / 60
+        timed_planned, timed_unplanned = res["planned_sec"], res["unplanned_sec"]
+    else:
+        timed_planned = timed_unplanned = 0.0
+    total_etud_minutes = round(total_etud_minutes - float(break_time or 0), 2)
+
+    if total_etud_minutes <= 0:
+        raise InvalidStudyError("Etüt süresi geçersiz. Lütfen başlangıç, bitiş ve mola değerlerini kontrol edin.")
+
+    total_planned_sec   = float(sum(sec for kind, sec in plain if kind == "Planlı")) + timed_planned
+    total_unplanned_sec = float(sum(sec for kind, sec in plain if kind == "Plansız")) + timed_unplanned
+    return summary_values(total_etud_minutes, total_planned_sec, total_unplanned_sec, produced_beds, unit_time)
+
+
+def summary_values(total_etud_minutes, total_planned_sec, total_unplanned_sec, produced_beds, unit_time) -> Dict[str, Any]:
+    """Özet sütunlarını toplamlardan hesapla (mola düşülmüş etüt süresi > 0 olmalı).
+
+    `compute_summary` ve canlı OEE motoru (`live_oee`) aynı formülü kullanır.
+    """
+    total_errors_sec = total_planned_sec + total_unplanned_sec
+
+    # Planlanan üretim = (Etüt Süresi - Planlı duruş) / CT
+    planned_available_minutes = max(total_etud_minutes - (total_planned_sec / 60.0), 0)
+    planned_production = (planned_available_minutes / float(unit_time)) if float(unit_time) > 0 else 0
+
+    # Net çalışma: planlı + plansız düş
+    net_seconds = max(total_etud_minutes * 60 - total_errors_sec, 0)
+    utilization = (net_seconds / (total_etud_minutes * 60)) * 100 if total_etud_minutes > 0 else 0
+    performance = (float(produced_beds) / planned_production * 100) if planned_production > 0 else 0
+
+    return {
+        "Etüt Süresi (dk)": round(total_etud_minutes, 2),
+        "Toplam Planlı Süre (sn)": round(total_planned_sec, 2),
+        "Toplam Plansız Süre (sn)": round(total_unplanned_sec, 2),
+        "Toplam Duruş Süresi (sn)": round(total_errors_sec, 2),
+        "Kapasite Kullanımı (%)": round(utilization, 2),
+        "Gerçekleşen Üretim (adet)": int(produced_beds),
+        "Planlanan Üretim (adet)": round(planned_production, 2),
+        "Gerçekleşme Oranı (%)": round(performance, 2),
+    }
+
+
+def availability(error_data, start_time, end_time, breaks=()) -> Optional[List[float]]:
+    """Dakika başına çalışma oranı (0-1); aralıklı duruş ya da mola yoksa None.
+
+    Yalnız süreli duruşların zamanı bilinmediğinden zaman çizelgesine girmez.
+    """
+    timed = [(kind, span[0], span[1]) for kind, _sec, *span in stop_items(error_data) if span]
+    if not timed and not breaks:
+        return None
+    return availability_timeline(study_intervals(start_time, end_time, timed, tuple(breaks)))
+
+
+def summary_frame(result: Dict[str, Any]) -> "pd.DataFrame":
+    """Özet sözlüğünü eski tek satırlık DataFrame biçimine çevir."""
+    import pandas as pd
+    return pd.DataFrame({col: [result[col]] for col in SUMMARY_COLUMNS})
+
+
+# ---- önbellek ----
+def summary_inputs(error_data, start_time, end_time, produced_beds, unit_time, break_time=0, breaks=()) -> Tuple[Any, ...]:
+    """Özeti belirleyen girdilerin hash'lenebilir, kanonik hali."""
+    return (
+        stop_items(error_data), start_time, end_time,
+        float(produced_beds or 0), float(unit_time or 0), float(break_time or 0),
+        tuple(tuple(b) for b in breaks or ()),
+    )
+
+
+def summary_key(error_data, start_time, end_time, produced_beds, unit_time, break_time=0, breaks=()) -> str:
+    """Girdilerin kararlı özeti (süreçler arasında da aynı)."""
+    inputs = summary_inputs(error_data, start_time, end_time, produced_beds, unit_time, break_time, breaks)
+    if isinstance(error_data, StopLog):
+        # duruş listesini her rerun'da JSON'a dökmek yerine sütunların özeti
+        inputs = (error_data.fingerprint(),) + inputs[1:]
+    raw = json.dumps(inputs, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _cached(inputs: Tuple[Any, ...]) -> Dict[str, Any]:
+    return _compute(*inputs)
+
+
+def cached_summary(error_data, start_time, end_time, produced_beds, unit_time, break_time=0, breaks=()) -> Dict[str, Any]:
+    """`compute_summary` + sınırlı LRU önbellek (Streamlit dışı kullanım için)."""
+    inputs = summary_inputs(error_data, start_time, end_time, produced_beds, unit_time, break_time, breaks)
+    return dict(_cached(inputs))
@@ -0,0 +1,287 @@
+# path: modules/time_window.py
+"""
+Etüt zaman penceresi: gece yarısını ve birkaç günü aşan etütler.
+
+Etüt başlangıç / bitişi saat (`datetime.time`, "SS:DD:ss") ya da tam
+zaman (`datetime.datetime`, "YYYY-AA-GG SS:DD:ss") olabilir:
+
+- bitiş saati başlangıçtan önce ise etüt gece yarısını geçer, bitiş ertesi
+  gündür (3. vardiya); eşit saatler boş penceredir;
+- birkaç günlük (ya da tam 24 saatlik) etütlerde iki uç tam zaman olarak
+  verilir.
+
+Pencere içindeki saatler (duruş / mola aralıkları) pencere başlangıcına
+göre saniyeye çevrilir (`clock_offset`): gece yarısından sonraki saatler
+ertesi güne düşer. Birden uzun günlük pencerelerde yalnız saat taşıyan
+aralıklar başlangıçtan sonraki ilk denk gelişe yerleşir.
+
+Toplu hesaplar (`window_bounds`, `day_buckets`, `shift_overlap`) pandas /
+NumPy ile vektöreldir; pandas yalnız bunlar çağrılınca yüklenir.
+"""
+
+import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+DAY_SEC = 24 * 3600
+
+# fabrika vardiyaları (başlangıç, bitiş); bitiş başlangıçtan küçükse ertesi gün
+SHIFTS: Dict[str, Tuple[str, str]] = {
+    "1. Vardiya": ("07:00:00", "15:00:00"),
+    "2. Vardiya": ("15:00:00", "23:00:00"),
+    "3. Vardiya": ("23:00:00", "07:00:00"),
+}
+
+# saat taşıyan pencerelerde gün bilinmiyorsa sabit referans gün
+_REF_DATE = datetime.date(2000, 1, 1)
+
+
+# ---- tek etüt ----
+def parse_moment(value: Any) -> Any:
+    """Metni datetime / time'a çevir; çevrilemezse None. Nesneler aynen döner."""
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            if len(value) > 8:
+                return datetime.datetime.fromisoformat(value)
+            return datetime.time.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _day(day: Any) -> datetime.date:
+    if isinstance(day, datetime.datetime):
+        return day.date()
+    if isinstance(day, datetime.date):
+        return day
+    if isinstance(day, str) and day:
+        try:
+            return datetime.date.fromisoformat(day[:10])
+        except ValueError:
+            pass
+    return _REF_DATE
+
+
+def study_window(start: Any, end: Any, day: Any = None) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+    """(başlangıç, bitiş) tam zamanları; uçlardan biri eksikse None.
+
+    Saat olarak verilen uçlar `day` (yoksa sabit bir gün) ile birleşir;
+    saat olarak verilen bitiş başlangıçtan önceyse ertesi güne geçer.
+    """
+    s, e = parse_moment(start), parse_moment(end)
+    if s is None or e is None:
+        return None
+    base = _day(day)
+    if isinstance(s, datetime.time):
+        s = datetime.datetime.combine(base, s)
+    if isinstance(e, datetime.time):
+        e = datetime.datetime.combine(s.date(), e)
+        if e < s:
+            e += datetime.timedelta(days=1)
+    return s, e
+
+
+def window_seconds(start: Any, end: Any, day: Any = None) -> float:
+    """Pencere uzunluğu (sn); uçlar eksikse 0."""
+    window = study_window(start, end, day)
+    return (window[1] - window[0]).total_seconds() if window else 0.0
+
+
+def window_minutes(start: Any, end: Any, day: Any = None) -> float:
+    return window_seconds(start, end, day) / 60
+
+
+def crosses_midnight(start: Any, end: Any, day: Any = None) -> bool:
+    window = study_window(start, end, day)
+    return bool(window) and window[1].date() > window[0].date()
+
+
+def _clock_sec(value: Any) -> Optional[int]:
+    value = parse_moment(value)
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+    if isinstance(value, datetime.time):
+        return value.hour * 3600 + value.minute * 60 + value.second
+    return None
+
+
+def clock_offset(value: Any, origin: datetime.datetime, window_sec: float) -> Optional[float]:
+    """Saatin / zamanın pencere başlangıcına göre saniyesi.
+
+    Tam zaman kesin konumuna yerleşir. Saat, pencereyi ortalayan 24 saatlik
+    aralıktaki denk gelişine yerleşir: kısa pencerede başlangıçtan biraz
+    önceki saat negatif kalır (kırpılır), gece yarısından sonraki saat
+    ertesi güne düşer. 24 saati aşan pencerede başlangıçtan sonraki ilk
+    denk geliş alınır.
+    """
+    moment = parse_moment(value)
+    if isinstance(moment, datetime.datetime):
+        return (moment - origin).total_seconds()
+    sec = _clock_sec(moment)
+    if sec is None:
+        return None
+    raw = (sec - (origin.hour * 3600 + origin.minute * 60 + origin.second)) % DAY_SEC
+    slack = max(DAY_SEC - window_sec, 0) / 2
+    return float(raw - DAY_SEC if raw >= window_sec + slack else raw)
+
+
+def span_offsets(start: Any, end: Any, origin: datetime.datetime, window_sec: float) -> Optional[Tuple[float, float]]:
+    """Aralığın pencereye göre (başlangıç, bitiş) saniyeleri; bitiş saati gece yarısını geçebilir."""
+    s = clock_offset(start, origin, window_sec)
+    if s is None:
+        return None
+    if isinstance(parse_moment(end), datetime.datetime):
+        e = clock_offset(end, origin, window_sec)
+    else:
+        s_clock, e_clock = _clock_sec(start), _clock_sec(end)
+        e = None if s_clock is None or e_clock is None else s + (e_clock - s_clock) % DAY_SEC
+    return None if e is None else (s, e)
+
+
+# ---- toplu (vektörel) ----
+def _moments(values: "pd.Series", days: "pd.Series") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Sütunu datetime64[us]'a çevir; ikinci dizi değerin yalnız saat olduğunu işaretler."""
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dt = pd.to_datetime(values).to_numpy(dtype="datetime64[us]", copy=True)
+        return dt, np.zeros(len(values), dtype=bool)
+    if pd.api.types.is_timedelta64_dtype(values):
+        td = values
+    else:
+        text = values.astype(str)
+        td = pd.Series(pd.to_timedelta(_clock_text_sec(text), unit="s"), index=text.index)
+        rest = td.isna() & (text.str.len() <= 8)
+        if rest.any():   # "8:00", mikrosaniyeli saat vb.
+            parsed = pd.to_timedelta(text[rest], errors="coerce")
+            td[rest] = parsed.where((parsed >= pd.Timedelta(0)) & (parsed < pd.Timedelta(days=1)))
+    is_clock = td.notna().to_numpy()
+    dt = (days + td).to_numpy(dtype="datetime64[us]", copy=True)
+    if not is_clock.all():
+        full = pd.to_datetime(values[~is_clock].astype(str), errors="coerce", format="ISO8601")
+        dt[~is_clock] = full.to_numpy(dtype="datetime64[us]")
+    return dt, is_clock
+
+
+def _clock_text_sec(text: "pd.Series") -> "np.ndarray":
+    """Tam "SS:DD:ss" metinlerini bayt düzeyinde saniyeye çevir; tutmayanlar NaN."""
+    import numpy as np
+
+    out = np.full(len(text), np.nan)
+    fits = (text.str.len() == 8).to_numpy()
+    try:
+        raw = text[fits].to_numpy(dtype="S8")
+    except UnicodeEncodeError:
+        return out
+    b = np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(-1, 8).astype(np.int64) - ord("0")
+    colon = ord(":") - ord("0")
+    digits = b[:, [0, 1, 3, 4, 6, 7]]
+    h, m, sec = b[:, 0] * 10 + b[:, 1], b[:, 3] * 10 + b[:, 4], b[:, 6] * 10 + b[:, 7]
+    ok = ((b[:, 2] == colon) & (b[:, 5] == colon) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+          & (h < 24) & (m < 60) & (sec < 60))
+    out[np.flatnonzero(fits)[ok]] = (h * 3600 + m * 60 + sec)[ok]
+    return out
+
+
+def window_bounds(starts: "pd.Series", ends: "pd.Series", days: Optional["pd.Series"] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """`study_window`'un vektörel karşılığı: (başlangıç, bitiş) datetime64[us] dizileri.
+
+    Eksik / çözülemeyen uçlar NaT olur. `days` yoksa sabit bir gün kullanılır.
+    """
+    import numpy as np
+    import pandas as pd
+
+    n = len(starts)
+    if days is None:
+        base = pd.Series(np.full(n, np.datetime64(_REF_DATE, "us")))
+    else:
+        base = pd.to_datetime(pd.Series(days).astype(str).str[:10], errors="coerce").fillna(pd.Timestamp(_REF_DATE))
+    base = base.reset_index(drop=True)
+    s, _ = _moments(pd.Series(starts).reset_index(drop=True), base)
+    # saat olarak verilen bitiş başlangıcın gününe göre çözülür
+    start_day = pd.Series(s).dt.normalize()
+    e, end_is_clock = _moments(pd.Series(ends).reset_index(drop=True), start_day)
+    wrap = end_is_clock & (e < s)
+    e[wrap] += np.timedelta64(1, "D")
+    return s, e
+
+
+def window_seconds_vec(starts: "pd.Series", ends: "pd.Series", days: Optional["pd.Series"] = None) -> "np.ndarray":
+    """Pencere uzunlukları (sn, float); eksik uçlarda NaN."""
+    import numpy as np
+    s, e = window_bounds(starts, ends, days)
+    return (e - s) / np.timedelta64(1, "s")
+
+
+def day_buckets(starts: "np.ndarray", ends: "np.ndarray") -> "pd.DataFrame":
+    """Pencereleri takvim günlerine böl: (study, gun, saniye) uzun tablosu.
+
+    `study` girdideki sıra numarasıdır; boş / geçersiz pencereler atlanır.
+    """
+    import numpy as np
+    import pandas as pd
+
+    s = np.asarray(starts, dtype="datetime64[us]")
+    e = np.asarray(ends, dtype="datetime64[us]")
+    ok = ~(np.isnat(s) | np.isnat(e)) & (e > s)
+    idx = np.flatnonzero(ok)
+    s, e = s[ok], e[ok]
+    first = s.astype("datetime64[D]")
+    # bitiş tam gece yarısındaysa o gün sayılmaz
+    last = (e - np.timedelta64(1, "us")).astype("datetime64[D]")
+    counts = (last - first).astype(np.int64) + 1
+    rep = np.repeat(np.arange(len(s)), counts)
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    day = first[rep] + step.astype("timedelta64[D]")
+    lo = np.maximum(s[rep], day.astype("datetime64[us]"))
+    hi = np.minimum(e[rep], (day + np.timedelta64(1, "D")).astype("datetime64[us]"))
+    return pd.DataFrame({
+        "study": idx[rep],
+        "gun": day,
+        "saniye": (hi - lo) / np.timedelta64(1, "s"),
+    })
+
+
+def _covered(t: "np.ndarray", a: int, b: int) -> "np.ndarray":
+    # 0 anından t'ye kadar her gün [a, b) saat aralığına düşen toplam saniye (a < b)
+    import numpy as np
+    days, tod = np.divmod(t, DAY_SEC)
+    return days * (b - a) + np.clip(tod - a, 0, b - a)
+
+
+def shift_overlap(
+    starts: "np.ndarray",
+    ends: "np.ndarray",
+    shifts: Optional[Dict[str, Tuple[str, str]]] = None,
+) -> "pd.DataFrame":
+    """Her pencerenin her vardiyaya düşen saniyesi (satır: girdi sırası, sütun: vardiya).
+
+    Günlük tekrar eden [a, b) aralığıyla kesişim, kümülatif kapsama
+    farkıyla (F(bitiş) - F(başlangıç)) döngüsüz hesaplanır; gece yarısını
+    geçen vardiya iki parçaya bölünür.
+    """
+    import numpy as np
+    import pandas as pd
+
+    s = np.asarray(starts, dtype="datetime64[s]")
+    e = np.asarray(ends, dtype="datetime64[s]")
+    bad = np.isnat(s) | np.isnat(e) | (e <= s)
+    si = np.where(bad, 0, s.astype(np.int64))
+    ei = np.where(bad, 0, e.astype(np.int64))
+    out = {}
+    for name, (a_text, b_text) in (shifts or SHIFTS).items():
+        a, b = _clock_sec(a_text), _clock_sec(b_text)
+        parts = [(a, b)] if a < b else [(a, DAY_SEC), (0, b)]
+        out[name] = sum(_covered(ei, x, y) - _covered(si, x, y) for x, y in parts if y > x).astype(float)
+    return pd.DataFrame(out)
+
+
+def clock_label(moment: datetime.datetime, window_sec: float) -> str:
+    """Zaman ekseni etiketi: tek günlük pencerede "SS:DD", uzununda gün de."""
+    return moment.strftime("%H:%M" if window_sec <= DAY_SEC else "%d.%m %H:%M")
@@ -1,31 +1,32 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import os
+
 import streamlit as st
 
+from modules.charts import chart_series, pie_from_series
+from modules.summary_core import _to_stops_df
+
+# pandas / matplotlib ilk grafikte yüklenir; matplotlib etkileşimsiz arka uçla açılsın
+os.environ.setdefault("MPLBACKEND", "Agg")
+
 def render_summary_charts(error_data):
     """Hata verilerini grafiksel olarak görselleştirir."""
     if not error_data:
         st.info("Henüz hata verisi yok.")
         return
 
-    # Hata verilerini DataFrame'e dönüştür
-    df = pd.DataFrame(error_data)
+    # tek gruplama: pasta ve çubuk serileri aynı sonuçtan (modules.charts)
+    series = chart_series(_to_stops_df(error_data), kinds=None, minutes=False)
+    if series is None:
+        st.info("Henüz hata verisi yok.")
+        return
+    pie_data, bar_data = series
 
-    # Hata Türlerine Göre Dağılım (Pie Chart)
+    # Duruş Türlerine Göre Dağılım (Pie Chart) - PNG önbellekli, figür sunucuda kalmaz
     st.subheader("📊 Hata Türlerine Göre Dağılım (Pie Chart)")
-    pie_data = df.groupby("Hata Türü")["Süre (sn)"].sum()
-
-    # Pie chart
-    fig1, ax1 = plt.subplots()
-    ax1.pie(pie_data, labels=pie_data.index, autopct='%1.1f%%', startangle=90)
-    ax1.axis('equal')  # Daire şeklinde göster
-    st.pyplot(fig1)
+    st.image(pie_from_series(pie_data))
 
     # Hatalara Göre Süre Dağılımı (Bar Chart)
     st.subheader("📈 Hatalara Göre Süre Dağılımı (Bar Chart)")
-    bar_data = df.groupby("Açıklama")["Süre (sn)"].sum().sort_values(ascending=False)
-
-    # Bar chart
     st.bar_chart(bar_data)
 
 def render_error_summary_table(error_data):
@@ -34,6 +35,7 @@ def render_error_summary_table(error_data):
         st.info("Henüz hata verisi yok.")
         return
 
+    import pandas as pd
     df = pd.DataFrame(error_data)
     st.subheader("Hata Verilerinin Özeti")
     st.dataframe(df)  # Hata verilerini bir tablo şeklinde gösterir
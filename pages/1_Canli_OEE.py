@@ -0,0 +1,7 @@
+import streamlit as st
+
+from modules.oee_dashboard import render_oee_dashboard
+
+st.set_page_config(page_title="Canlı OEE", layout="wide")
+st.title("📡 Canlı OEE")
+render_oee_dashboard()
@@ -0,0 +1,7 @@
+import streamlit as st
+
+from modules.study_history import render_study_history
+
+st.set_page_config(page_title="Geçmiş Etütler", layout="wide")
+st.title("🗂️ Geçmiş Etütler")
+render_study_history()
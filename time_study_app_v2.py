@@ -1,24 +1,45 @@
 import os
 import streamlit as st
 import datetime
-from PIL import Image
+
+from modules.perf import render_perf_panel, section_timer, start_run
+from modules.autosave import autosave_tick, finish_draft, start_autosave
 
 from modules.layout_v2 import render_etud_info_v2
-from modules.errors import render_error_inputs
+from modules.errors import flush_live_capture, render_error_inputs, render_live_capture
 from modules.summary import calculate_summary, render_summary_table, render_summary_charts
-from modules.storage import save_data, load_data
-from modules.data_manager import export_current_session_to_excel, export_pretty_report
+from modules.intervals import break_interval
+from modules.live_oee import track_study
+from modules.stop_log import StopLog
+from modules.storage import ConcurrentUpdateError, operator_namespace, save_study, study_key
+from modules.data_manager import (
+    export_current_session_to_excel, export_pretty_report, pretty_report_bytes, raw_report_bytes,
+    report_content_key,
+    study_record,
+)
 
 # Sayfa ayarları
 st.set_page_config(page_title="Zaman Etüdü V2", layout="wide")
+start_run()
+start_autosave()
 st.title("🕒 Zaman Etüdü Uygulaması - Form Bilgili Versiyon")
 
+
+@st.cache_resource(show_spinner=False)
+def _load_logo(path="logo.png"):
+    # her rerun'da diskten okunmasın; dosya yoksa None. PIL yalnızca
+    # ilk çalışmada burada yüklenir
+    try:
+        from PIL import Image
+        with Image.open(path) as img:
+            img.load()
+            return img.copy()
+    except Exception:
+        return None
+
+
 # Şirket logosu (opsiyonel)
-logo = None
-try:
-    logo = Image.open("logo.png")
-except Exception:
-    pass
+logo = _load_logo()
 
 col1, col2 = st.columns([6, 1])
 with col2:
@@ -26,13 +47,28 @@ with col2:
         st.image(logo, width=130)
 
 # Başlangıç state
-if "error_data" not in st.session_state:
-    st.session_state["error_data"] = []
+if not isinstance(st.session_state.get("error_data"), StopLog):
+    st.session_state["error_data"] = StopLog.from_records(st.session_state.get("error_data") or [])
+
+# Etüt bilgileri (değişince özet/grafikler de değişir: tam sayfa çalışır)
+with section_timer("Etüt bilgileri"):
+    etud_info = render_etud_info_v2()
+
 
-# Etüt bilgileri
-etud_info = render_etud_info_v2()
+# Taslak: değişiklikler birkaç saniye birikir, sonra yalnızca fark yazılır.
+# Zamanlayıcı yalnızca bu küçük bölümü çalıştırır.
+@st.fragment(run_every=3)
+def autosave_section():
+    saver = autosave_tick()
+    flush_live_capture()
+    if saver is not None and saver.last_flush:
+        st.caption(f"💾 Taslak kaydedildi: {datetime.datetime.fromtimestamp(saver.last_flush):%H:%M:%S} · sayfa yenilense de devam eder")
+
+
+autosave_section()
 if etud_info is None:
     st.warning("Lütfen tüm etüt bilgilerini eksiksiz giriniz.")
+    render_perf_panel()
     st.stop()
 
 (operator, machine, etud_date, vardiya,
@@ -40,49 +76,135 @@ if etud_info is None:
  unit_time, break_time) = etud_info
 
 produced_beds = max(0, final_count - initial_count)
+breaks = break_interval(st.session_state.get("break_start"), break_time)
 if final_count < initial_count:
     st.warning("Etüt Sonrası sayım, Etüt Öncesi'nden küçük görünüyor. Üretim adedi 0 olarak alındı.")
 
+# canlı OEE panosu: hattın penceresi ve sayımı (değişmediyse yayın yapılmaz);
+# eski bir etüt açıksa duruşları hatta yazılmaz
+oee_line = (machine.strip(), vardiya)
+current = track_study(oee_line, start_time, end_time, etud_date, unit_time, break_time, produced_beds)
+st.session_state["oee_line"] = oee_line if current and oee_line[0] else None
+
 # Bilgileri göster
 st.info(f"👤 Operatör: {operator} | 🏭 Makine: {machine} | 📅 Tarih: {etud_date} | 🕒 Vardiya: {vardiya}")
 
-# Hata girişi
+
+# Duruş girişi: alanlara yazmak yalnızca bu bölümü çalıştırır;
+# duruş ekleme/silme st.rerun() ile tüm sayfayı (özeti) yeniler.
+@st.fragment
+def stop_section():
+    with section_timer("Duruş girişi"):
+        render_error_inputs()
+
+
 st.subheader("🔧 Duruş Giriş Alanı")
-render_error_inputs()
+stop_section()
+with section_timer("Canlı kayıt"):
+    render_live_capture()
 
 # Özet
 st.subheader("📊 Özet Tablo ve Üretim Verileri")
-df_summary = calculate_summary(
-    error_data=st.session_state["error_data"],
-    start_time=start_time,
-    end_time=end_time,
-    produced_beds=produced_beds,
-    unit_time=unit_time,
-    break_time=break_time
-)
-render_summary_table(df_summary)
-render_summary_charts(st.session_state["error_data"], df_summary)
+with section_timer("Özet"):
+    df_summary = calculate_summary(
+        error_data=st.session_state["error_data"],
+        start_time=start_time,
+        end_time=end_time,
+        produced_beds=produced_beds,
+        unit_time=unit_time,
+        break_time=break_time,
+        breaks=breaks,
+    )
+    render_summary_table(df_summary)
+with section_timer("Grafikler"):
+    render_summary_charts(st.session_state["error_data"], df_summary, start_time, end_time, breaks)
 
 
-# --- Excel çıktı 1: Ham tablo ---
-if st.button("📤 Excel'e Aktar (Ham Tablo)", key="export_raw"):
-    excel_path = export_current_session_to_excel(etud_info, st.session_state["error_data"])
-    if excel_path:
-        with open(excel_path, "rb") as f:
-            st.download_button("📥 Excel Dosyasını İndir", f, file_name=os.path.basename(excel_path), key="dl_raw")
+# --- Excel çıktıları (bellekte üretilir; aynı içerik için önbellekten gelir) ---
+# Düğmeler yalnızca bu bölümü yeniden çalıştırır; özet ve grafikler yeniden çizilmez.
+# Üretilen baytlar içerik anahtarıyla tutulur; ekrandaki etüt değişince indirme kalkar.
+def _current_report(name, key):
+    report = st.session_state.get(name)
+    if report is not None and report[2] != key:
+        del st.session_state[name]
+        st.caption("Etüt değişti; raporu yeniden oluşturun.")
+        return None
+    return report
 
-# --- Excel çıktı 2: Tek sayfa rapor ---
-if st.button("🧾 Tek Sayfa Raporu Oluştur (Excel)", key="export_pretty"):
-    try:
-        out_path = os.path.join("excel_raporlar", f"etut_raporu_pretty_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-        export_pretty_report(etud_info, st.session_state["error_data"], df_summary, out_path)
-        st.session_state["pretty_report_path"] = out_path
-        st.success("Rapor hazır. Aşağıdan indirebilirsiniz.")
-    except ImportError as e:
-        st.error(str(e))
-
-if "pretty_report_path" in st.session_state:
-    with open(st.session_state["pretty_report_path"], "rb") as f:
-        st.download_button("📥 Raporu İndir (Excel)", f,
-                           file_name=os.path.basename(st.session_state["pretty_report_path"]),
-                           key="dl_pretty")
+
+@st.fragment
+def export_section(etud_info, df_summary):
+    with section_timer("Excel çıktıları"):
+        raw_key = report_content_key("raw", etud_info, st.session_state["error_data"])
+        pretty_key = report_content_key("pretty", etud_info, st.session_state["error_data"], df_summary)
+        persist_reports = st.checkbox("Raporları sunucuya da kaydet (excel_raporlar/)", value=False, key="persist_reports")
+
+        # --- Excel çıktı 1: Ham tablo ---
+        if st.button("📤 Excel'e Aktar (Ham Tablo)", key="export_raw"):
+            file_name = f"etut_raporu_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            st.session_state["raw_report"] = (file_name, raw_report_bytes(etud_info, st.session_state["error_data"]), raw_key)
+            if persist_reports:
+                export_current_session_to_excel(etud_info, st.session_state["error_data"])
+
+        report = _current_report("raw_report", raw_key)
+        if report is not None:
+            file_name, data, _key = report
+            st.download_button("📥 Excel Dosyasını İndir", data, file_name=file_name, key="dl_raw")
+
+        # --- Excel çıktı 2: Tek sayfa rapor ---
+        if st.button("🧾 Tek Sayfa Raporu Oluştur (Excel)", key="export_pretty"):
+            try:
+                file_name = f"etut_raporu_pretty_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+                data = pretty_report_bytes(etud_info, st.session_state["error_data"], df_summary)
+                st.session_state["pretty_report"] = (file_name, data, pretty_key)
+                if persist_reports:
+                    export_pretty_report(etud_info, st.session_state["error_data"], df_summary,
+                                         os.path.join("excel_raporlar", file_name))
+                st.success("Rapor hazır. Aşağıdan indirebilirsiniz.")
+            except ImportError as e:
+                st.error(str(e))
+
+        report = _current_report("pretty_report", pretty_key)
+        if report is not None:
+            file_name, data, _key = report
+            st.download_button("📥 Raporu İndir (Excel)", data, file_name=file_name, key="dl_pretty")
+
+
+# --- Etüt kaydı: operatörün ad alanına, iyimser sürüm kontrolüyle ---
+# Bu oturumda okunan/yazılan sürüm beklenir; kayıt o arada başka bir
+# oturumda değiştiyse üzerine yazmadan önce sorulur.
+@st.fragment
+def save_section(etud_info, df_summary):
+    with section_timer("Kayıt"):
+        summary = {k: (v.item() if hasattr(v, "item") else v) for k, v in df_summary.iloc[0].items()}
+        record = study_record(etud_info, st.session_state["error_data"], summary)
+        namespace, key = operator_namespace(etud_info[0]), study_key(record["tarih"], record["makine"])
+        versions = st.session_state.setdefault("saved_versions", {})
+
+        def save(expected):
+            # düğme geri çağrısı: sonuç bir sonraki çizimde gösterilir
+            try:
+                versions[(namespace, key)] = save_study(key, record, namespace=namespace, expected_version=expected)
+                st.session_state.pop("save_conflict", None)
+                finish_draft()
+                st.session_state["save_notice"] = f"Etüt kaydedildi (sürüm {versions[(namespace, key)]})."
+            except ConcurrentUpdateError as e:
+                st.session_state["save_conflict"] = (namespace, key, e.actual)
+
+        st.button("💾 Etüdü Kaydet", key="save_study", on_click=save, args=(versions.get((namespace, key), 0),))
+        notice = st.session_state.pop("save_notice", None)
+        if notice:
+            st.success(notice)
+
+        conflict = st.session_state.get("save_conflict")
+        if conflict and conflict[:2] == (namespace, key):
+            st.warning(f"Bu etüt ({key}) başka bir oturumda kaydedilmiş/değiştirilmiş (depodaki sürüm {conflict[2]}).")
+            st.button("Depodakinin üzerine yaz", key="save_study_force", on_click=save, args=(conflict[2],))
+
+
+st.subheader("💾 Kayıt")
+save_section(etud_info, df_summary)
+
+export_section(etud_info, df_summary)
+
+render_perf_panel()